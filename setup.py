@@ -35,6 +35,9 @@ setup(
     ],
     python_requires=">=3.8",
     install_requires=requirements,
+    extras_require={
+        "decoders": ["msgpack>=1.0", "zstandard>=0.22"],
+    },
     entry_points={
         "console_scripts": [
             "redis-tui=src.app:main",  # Direct path to app.py in src
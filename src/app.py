@@ -5,20 +5,38 @@ This module provides a terminal user interface for browsing and
 managing Redis data using Textual.
 """
 
-from typing import Optional
+from fnmatch import fnmatchcase
+from typing import Dict, List, Optional, Sequence, Tuple
 import argparse
 import asyncio
 from textual.app import App, ComposeResult
 from textual.containers import Horizontal, Container
-from textual.widgets import Header, Footer, Tree
+from textual.widgets import Header, Footer, Static
 from textual.binding import Binding
+from rich.table import Table
 import logging
 from pathlib import Path
 
 # Update these imports to be relative to src
+from .components.bulk_confirm import BulkConfirm
 from .components.data_display import DataDisplay
-from .data.redis_client import RedisClient
+from .components.file_prompt import FilePrompt
+from .components.key_filter import KEY_TYPES, KeyFilter
+from .components.key_search import KeySearch
+from .components.value_search import ValueSearch
+from .components.key_tree import SORT_MODES, KeyTree, format_bytes
+from .data.analyzer import MemoryAnalyzer
+from .data.bulk import BulkOperation
+from .data.decoders import INLINE_DECODE_LIMIT, DecoderPool
+from .data.key_index import PrefixNode
+from .data.throttle import DEFAULT_TARGET_LATENCY
+from .data.redis_client import (
+    KEY_REMOVED_EVENTS, DEFAULT_BACKGROUND_CONNECTIONS, DEFAULT_CACHE_TTL, DEFAULT_INTERACTIVE_CONNECTIONS,
+    DEFAULT_MAX_DECODE_BYTES, DEFAULT_PAGE_SIZE, DEFAULT_PREVIEW_BYTES, DEFAULT_SCAN_COUNT, RedisClient,
+    escape_glob
+)
 from .data.sample_data import load_sample_data
+from .data.transfer import DEFAULT_PARALLELISM, NamespaceExport, NamespaceImport
 
 # Set up logging
 log_dir = Path.home() / ".redis_tui"
@@ -51,6 +69,13 @@ class RedisTUI(App):
         border-right: solid $primary;
     }
 
+    #scan-status {
+        dock: bottom;
+        height: 1;
+        padding: 0 1;
+        color: $text-muted;
+    }
+
     #right-pane {
         width: 70%;
         height: 100%;
@@ -79,98 +104,690 @@ class RedisTUI(App):
         Binding("d", "toggle_dark", "Toggle dark mode"),
         Binding("r", "refresh", "Refresh"),
         Binding("f", "toggle_focus", "Toggle Focus"),
+        Binding("escape", "cancel_scan", "Cancel scan"),
+        Binding("l", "toggle_live", "Live updates"),
+        Binding("a", "toggle_analysis", "Analyze memory"),
+        Binding("s", "cycle_sort", "Sort"),
+        Binding("slash", "search", "Search"),
+        Binding("p", "filter", "Filter"),
+        Binding("v", "search_values", "Search values"),
+        Binding("x", "bulk_unlink", "Bulk delete"),
+        Binding("e", "bulk_expire", "Bulk TTL"),
+        Binding("o", "export", "Export"),
+        Binding("i", "import", "Import"),
     ]
     
-    def __init__(self, redis_client: RedisClient = None):
+    # Seconds between applying batched keyspace notifications to the tree
+    LIVE_FLUSH_INTERVAL = 1 / 30
+    
+    # Seconds the cursor must rest on a key before its value is fetched
+    HIGHLIGHT_DEBOUNCE = 0.15
+    
+    def __init__(
+        self,
+        redis_client: RedisClient = None,
+        sample_rate: float = 1.0,
+        analysis_delay: float = 0.0,
+        server_counts: bool = False,
+        decoder_plugins: Sequence[str] = (),
+        match: str = "*",
+        key_type: Optional[str] = None,
+        import_parallelism: int = DEFAULT_PARALLELISM,
+        import_replace: bool = False
+    ):
         """Initialize the application.
         
         Args:
             redis_client: Redis client
+            sample_rate: Fraction of keys measured by the memory analyzer
+            analysis_delay: Seconds the analyzer pauses between batches
+            server_counts: Count namespaces on the server and load folders
+                only when they are expanded, instead of scanning every key
+            decoder_plugins: Modules registering extra value decoders
+            match: Glob-style pattern keys must match to be loaded
+            key_type: Redis type keys must have to be loaded, None for any
+            import_parallelism: RESTORE pipelines in flight during an import
+            import_replace: Overwrite existing keys when importing instead
+                of keeping them
         """
         super().__init__()
         self.redis_client = redis_client or RedisClient()
+        self.server_counts = server_counts
+        # Filter applied on the server by every scan and count
+        self.match = match
+        self.key_type = key_type
+        # Summarized folders whose contents are being counted
+        self._counting: set = set()
+        # Bumped on every key selection so superseded fetches are dropped
+        self._selection = 0
+        self.sample_rate = sample_rate
+        self.analysis_delay = analysis_delay
+        self.analyzer: Optional[MemoryAnalyzer] = None
+        self._analyzing = False
+        # Last bulk delete or expiry, kept so a stopped one can be resumed
+        self.bulk: Optional[BulkOperation] = None
+        self._bulk_running = False
+        self.import_parallelism = import_parallelism
+        self.import_replace = import_replace
+        self._transferring = False
+        # Worker process decoding compressed, serialized and large values
+        self.decoders = DecoderPool(plugins=decoder_plugins)
+        self._live = False
+        self._live_timer = None
+        # Key -> whether it exists, from notifications not yet applied
+        self._live_pending: Dict[str, bool] = {}
         
     def compose(self) -> ComposeResult:
         """Create child widgets for the app."""
         yield Header()
-        with Container():
+        with Horizontal():
             with Container(id="left-pane"):
-                yield Tree("Redis Keys", id="redis-tree")
+                tree = KeyTree("Redis Keys", id="redis-tree")
+                yield tree
+                yield KeyFilter(self.match, self.key_type, id="key-filter")
+                yield KeySearch(tree, id="key-search")
+                yield ValueSearch(self.redis_client, tree, id="value-search")
+                yield Static("", id="scan-status")
             with Container(id="right-pane"):
                 yield DataDisplay()
         yield Footer()
         
     async def on_mount(self) -> None:
         """Handle app mount event."""
+        try:
+            await self.redis_client.start_cache_invalidation()
+        except Exception as e:
+            logger.error(f"Could not start cache invalidation: {e}", exc_info=True)
         await self.refresh_tree()
         
     async def refresh_tree(self) -> None:
-        """Refresh the Redis key tree."""
-        tree = self.query_one("#redis-tree", Tree)
-        tree.clear()
-        
-        keys = await self.redis_client.get_all_keys()
-        for namespace, namespace_keys in keys.items():
-            namespace_node = tree.root.add(namespace, expand=True)
-            # Group by subnamespace
-            subgroups = {}
-            for key in sorted(namespace_keys):
-                parts = key.split(':')[1:]  # Skip the namespace
-                if len(parts) > 1:
-                    subgroup = parts[0]
-                    if subgroup not in subgroups:
-                        subgroups[subgroup] = namespace_node.add(subgroup, expand=True)
-                    leaf = subgroups[subgroup].add(parts[-1])
-                    leaf.allow_expand = False  # Mark as leaf node
+        """Refresh the Redis key tree.
+        
+        Keys are discovered with SCAN in a background worker and patched
+        into the tree's prefix index batch by batch: new keys are inserted
+        as they arrive and keys the scan did not see are removed once it
+        completes. Expansion, cursor and selection are left untouched.
+        """
+        tree = self.query_one("#redis-tree", KeyTree)
+        self.workers.cancel_group(self, "scan")
+        if self.server_counts:
+            self.workers.cancel_group(self, "namespaces")
+            self._counting.clear()
+            tree.clear_keys()
+            self.run_worker(self._count_into_tree(tree, tree.index.root), group="scan", exclusive=True)
+            return
+        tree.begin_refresh()
+        self.run_worker(self._scan_into_tree(tree), group="scan", exclusive=True)
+        
+    async def _scan_into_tree(self, tree: KeyTree) -> None:
+        """Stream SCAN batches into the tree, reporting progress."""
+        status = self.query_one("#scan-status", Static)
+        total = await self.redis_client.get_key_count()
+        found = 0
+        added = 0
+        status.update("Scanning keys... (esc to cancel)")
+        filtered = self.match != "*" or self.key_type is not None
+        try:
+            async for batch in self.redis_client.scan_keys(match=self.match, key_type=self.key_type):
+                added += tree.add_keys(batch)
+                found += len(batch)
+                if filtered:
+                    progress = f"{found:,} keys{self._filter_label()}"
                 else:
-                    leaf = namespace_node.add(parts[0])
-                    leaf.allow_expand = False  # Mark as leaf node
-        
-    async def on_tree_node_selected(self, event: Tree.NodeSelected) -> None:
-        """Handle selection of tree nodes."""
-        node = event.node
-        logger.debug(f"Selected node: {node.label}, expandable: {node.allow_expand}")
-        
-        # Skip if it's a parent node without a value
-        if not node.allow_expand:  # This is a leaf node
-            # Build the full key by walking up the tree
-            key_parts = []
-            current = node
-            while current.parent and current.parent.label != "Redis Keys":
-                key_parts.insert(0, str(current.label))
-                current = current.parent
-            
-            if key_parts:
-                full_key = ":".join(key_parts)
-                logger.debug(f"Constructed full key: {full_key}")
-                data = await self.redis_client.get_key(full_key)
-                logger.debug(f"Retrieved data: {data}")
-                if data:
-                    display = self.query_one(DataDisplay)
-                    display.update_content(full_key, data)
-                    logger.debug("Updated display")
+                    percent = min(100, found * 100 // total) if total else 100
+                    progress = f"{found:,}/~{total:,} keys ({percent}%)"
+                status.update(
+                    f"Scanning... {progress} "
+                    f"at {self.redis_client.throttle.describe()} - esc to cancel"
+                )
+        except asyncio.CancelledError:
+            status.update(f"Scan cancelled after {found:,} keys")
+            raise
+        except Exception as e:
+            logger.error(f"Error scanning keys: {e}", exc_info=True)
+            status.update(f"Scan failed after {found:,} keys: {e}")
+            return
+        removed = tree.finish_refresh()
+        status.update(f"{len(tree.index):,} keys{self._filter_label()} (+{added:,} -{removed:,})")
+        logger.debug(f"Scan complete: {found} keys, {added} added, {removed} removed")
+        
+    async def _count_into_tree(self, tree: KeyTree, node: PrefixNode) -> None:
+        """Fill a folder with namespace counts gathered on the server.
+        
+        The count script is called repeatedly with the cursor it returns,
+        so each call stays short and only summaries cross the network.
+        """
+        status = self.query_one("#scan-status", Static)
+        separator = tree.index.separator
+        prefix = tree.index.prefix(node)
+        under = prefix + separator if node.parent is not None else ""
+        if self.match == "*":
+            # The folder prefix can go into MATCH itself
+            match, under = f"{escape_glob(under)}*", ""
+        else:
+            match = self.match
+        depth = len(node.path) + 1
+        self._counting.add(node)
+        status.update(f"Counting {prefix or 'namespaces'} on the server... (esc to cancel)")
+        try:
+            cursor = 0
+            while True:
+                counts = await self.redis_client.count_namespaces(
+                    separator=separator, depth=depth, match=match, cursor=cursor,
+                    key_type=self.key_type, under=under
+                )
+                tree.add_namespace_counts(node, counts.prefixes, counts.keys)
+                status.update(
+                    f"Counting {prefix or 'namespaces'} on the server "
+                    f"at {self.redis_client.throttle.describe()} - esc to cancel"
+                )
+                cursor = counts.cursor
+                if counts.done:
+                    break
+        except asyncio.CancelledError:
+            status.update(f"Counting {prefix or 'namespaces'} cancelled")
+            raise
+        except Exception as e:
+            logger.error(f"Error counting namespaces: {e}", exc_info=True)
+            status.update(f"Counting {prefix or 'namespaces'} failed: {e}")
+            return
+        finally:
+            self._counting.discard(node)
+        tree.finish_namespace_counts(node)
+        status.update(f"{len(tree.index):,} keys{self._filter_label()}")
+        
+    def _filter_label(self) -> str:
+        """Describe the key filter in effect for the status line."""
+        label = ""
+        if self.match != "*":
+            label += f" matching {self.match}"
+        if self.key_type is not None:
+            label += f" of type {self.key_type}"
+        return label
+        
+    def action_filter(self) -> None:
+        """Show the pattern and type filter controls."""
+        self.query_one(KeyFilter).open()
+        
+    async def on_key_filter_changed(self, message: KeyFilter.Changed) -> None:
+        """Reload the tree with only the keys the server reports as matching."""
+        self.match = message.match
+        self.key_type = message.key_type
+        self.query_one("#redis-tree", KeyTree).clear_keys()
+        await self.refresh_tree()
+        
+    def on_key_filter_closed(self, message: KeyFilter.Closed) -> None:
+        """Return focus to the tree when the filter controls are dismissed."""
+        self.query_one("#redis-tree", KeyTree).focus()
+        
+    def on_key_tree_namespace_requested(self, message: KeyTree.NamespaceRequested) -> None:
+        """Load the next level of a folder known only from server-side counts."""
+        if message.node in self._counting:
+            return
+        tree = self.query_one("#redis-tree", KeyTree)
+        self.run_worker(self._count_into_tree(tree, message.node), group="namespaces")
+        
+    def action_cancel_scan(self) -> None:
+        """Cancel an in-progress key scan."""
+        self.workers.cancel_group(self, "scan")
+        
+    def on_key_tree_metadata_requested(self, message: KeyTree.MetadataRequested) -> None:
+        """Fetch type, TTL and size badges for newly displayed keys."""
+        self.run_worker(self._load_metadata(message.nodes), group="metadata")
+        
+    async def _load_metadata(self, nodes: list) -> None:
+        """Fetch metadata for a batch of keys in one round-trip."""
+        keys = [node.key for node in nodes if node.key is not None]
+        try:
+            metadata = await self.redis_client.get_metadata(keys)
+        except Exception as e:
+            logger.error(f"Error loading key metadata: {e}", exc_info=True)
+            return
+        for node in nodes:
+            node_metadata = metadata.get(node.key)
+            if node_metadata is not None:
+                node.metadata = node_metadata
+                node.key_type = node_metadata.key_type
+        self.query_one("#redis-tree", KeyTree).update_metadata(nodes)
+        
+    async def action_toggle_live(self) -> None:
+        """Toggle live tree updates from keyspace notifications."""
+        if self._live:
+            self.redis_client.remove_keyspace_listener(self._on_keyspace_event)
+            self._live_timer.stop()
+            self._live_timer = None
+            self._live = False
+            self._live_pending.clear()
+            self.sub_title = ""
+            return
+        
+        enabled = await self.redis_client.keyspace_notifications_enabled()
+        if enabled is False:
+            self.notify(
+                "Keyspace notifications are disabled on the server "
+                "(notify-keyspace-events needs K and A)",
+                severity="warning"
+            )
+            return
+        self.redis_client.add_keyspace_listener(self._on_keyspace_event)
+        self._live_timer = self.set_interval(self.LIVE_FLUSH_INTERVAL, self._flush_live_updates)
+        self._live = True
+        self.sub_title = "Live"
+        
+    def _on_keyspace_event(self, key: str, event: str) -> None:
+        """Record a keyspace notification to apply on the next flush."""
+        self._live_pending[key] = event not in KEY_REMOVED_EVENTS
+        
+    def _flush_live_updates(self) -> None:
+        """Apply notifications collected since the last frame to the tree."""
+        if not self._live_pending:
+            return
+        pending = self._live_pending
+        self._live_pending = {}
+        tree = self.query_one("#redis-tree", KeyTree)
+        existing = [key for key, exists in pending.items() if exists]
+        tree.remove_keys(key for key, exists in pending.items() if not exists)
+        tree.invalidate_metadata(existing)
+        if self.match != "*":
+            existing = [key for key in existing if fnmatchcase(key, self.match)]
+        if self.key_type is None:
+            tree.add_keys(existing)
+            return
+        new = [key for key in existing if key not in tree.index]
+        if new:
+            self.run_worker(self._add_typed_keys(tree, new), group="live")
+        
+    async def _add_typed_keys(self, tree: KeyTree, keys: List[str]) -> None:
+        """Add keys from notifications that have the filtered type."""
+        try:
+            keys = await self.redis_client.filter_by_type(keys, self.key_type)
+        except Exception as e:
+            logger.error(f"Error checking key types: {e}", exc_info=True)
+            return
+        tree.add_keys(keys)
+        
+    def action_toggle_analysis(self) -> None:
+        """Start or stop the namespace memory analysis."""
+        if self._analyzing:
+            self.workers.cancel_group(self, "analysis")
+            return
+        tree = self.query_one("#redis-tree", KeyTree)
+        self.analyzer = MemoryAnalyzer(
+            self.redis_client,
+            separator=tree.index.separator,
+            sample_rate=self.sample_rate,
+            delay=self.analysis_delay,
+            match=self.match,
+            key_type=self.key_type
+        )
+        tree.stats = self.analyzer.stats
+        self.run_worker(self._run_analysis(self.analyzer, tree), group="analysis", exclusive=True)
+        
+    async def _run_analysis(self, analyzer: MemoryAnalyzer, tree: KeyTree) -> None:
+        """Run the memory analyzer, repainting folder sizes after each batch."""
+        status = self.query_one("#scan-status", Static)
+        self._analyzing = True
+        status.update("Analyzing memory... (a to stop)")
+        try:
+            async for scanned in analyzer.run():
+                total = analyzer.stats.get("")
+                memory = format_bytes(int(total.memory)) if total else "0 B"
+                status.update(
+                    f"Analyzing... {scanned:,} keys, {memory} "
+                    f"at {self.redis_client.throttle.describe()} - a to stop"
+                )
+                tree.refresh_stats()
+        except asyncio.CancelledError:
+            status.update(f"Analysis stopped after {analyzer.scanned:,} keys")
+            raise
+        except Exception as e:
+            logger.error(f"Error analyzing memory: {e}", exc_info=True)
+            status.update(f"Analysis failed after {analyzer.scanned:,} keys: {e}")
+            return
+        finally:
+            self._analyzing = False
+        total = analyzer.stats.get("")
+        memory = format_bytes(int(total.memory)) if total else "0 B"
+        estimate = "~" if analyzer.sample_rate < 1.0 else ""
+        status.update(f"{analyzer.scanned:,} keys use {estimate}{memory}")
+        if tree.sort_mode != "name":
+            tree.set_sort(tree.sort_mode)
+        else:
+            tree.refresh_stats()
+        
+    async def action_bulk_unlink(self) -> None:
+        """Delete the keys below the folder under the cursor."""
+        await self._confirm_bulk("unlink")
+        
+    async def action_bulk_expire(self) -> None:
+        """Set a TTL on the keys below the folder under the cursor."""
+        await self._confirm_bulk("expire")
+        
+    async def _folder_target(self, tree: KeyTree) -> Optional[Tuple[str, str, str, int]]:
+        """Find the keys a folder operation covers, within the filter in effect.
+        
+        That is the folder under the cursor, or the folder holding the key
+        under the cursor; a key at the top level is covered on its own.
+        Every key is covered only when the cursor is on the root itself, so
+        a whole-database operation is always chosen, never a fallback.
+        
+        Returns:
+            The SCAN MATCH pattern, the literal prefix keys must also start
+            with ("" when the pattern expresses it), a description for
+            prompts and the estimated number of keys, or None when the
+            cursor is not on a key or folder
+        """
+        node = tree.cursor_node
+        target = node.data if node is not None else None
+        if not isinstance(target, PrefixNode):
+            return None
+        if not node.allow_expand:
+            if target.parent is None or target.parent.parent is None:
+                return escape_glob(target.key), "", f"named {target.key}", 1
+            target = target.parent
+        if target.parent is None:
+            if self.match == "*" and self.key_type is None:
+                estimate = await self.redis_client.get_key_count()
+            else:
+                estimate = target.count
+            return self.match, "", "in the database", estimate
+        prefix = tree.index.prefix(target)
+        under = prefix + tree.index.separator
+        if self.match == "*":
+            return f"{escape_glob(under)}*", "", f"under {prefix}", target.count
+        return self.match, under, f"under {prefix}", target.count
+        
+    def _no_target(self) -> None:
+        """Explain why a folder operation did not start."""
+        self.notify("Move the cursor to a folder, a key, or the root for every key", severity="warning")
+        
+    async def _confirm_bulk(self, action: str) -> None:
+        """Stop the running bulk operation, or confirm and start or resume one.
+        
+        If the last operation on the same keys was stopped, it resumes
+        from its SCAN cursor.
+        """
+        if self._bulk_running:
+            self.workers.cancel_group(self, "bulk")
+            return
+        tree = self.query_one("#redis-tree", KeyTree)
+        target = await self._folder_target(tree)
+        if target is None:
+            self._no_target()
+            return
+        match, under, scope, estimate = target
+        
+        bulk = self.bulk
+        resume = (
+            bulk is not None and not bulk.finished
+            and (bulk.action, bulk.match, bulk.key_type, bulk.under) == (action, match, self.key_type, under)
+        )
+        if action == "unlink":
+            message = f"Delete ~{estimate:,} keys {scope}{self._filter_label()}?"
+        else:
+            message = f"Set a TTL on ~{estimate:,} keys {scope}{self._filter_label()}?"
+        if resume:
+            message += f"\nResumes the stopped run, {bulk.applied:,} keys already done."
+        
+        def confirmed(ttl: Optional[int]) -> None:
+            if ttl is None:
+                return
+            if resume:
+                operation = bulk
+                total = bulk.applied + estimate
+            else:
+                operation = BulkOperation(
+                    self.redis_client, action, match=match, key_type=self.key_type, under=under,
+                    ttl=ttl or None
+                )
+                total = estimate
+            self.bulk = operation
+            self.run_worker(self._run_bulk(operation, tree, total), group="bulk", exclusive=True)
+        
+        self.push_screen(
+            BulkConfirm(
+                message,
+                "Delete" if action == "unlink" else "Set TTL",
+                ask_ttl=action == "expire" and not resume
+            ),
+            confirmed
+        )
+        
+    async def _run_bulk(self, bulk: BulkOperation, tree: KeyTree, estimate: int) -> None:
+        """Run a bulk operation, keeping the tree and status line up to date."""
+        status = self.query_one("#scan-status", Static)
+        key = "x" if bulk.action == "unlink" else "e"
+        progress = "Deleting" if bulk.action == "unlink" else "Setting TTLs"
+        self._bulk_running = True
+        status.update(f"{progress}... ({key} to stop)")
+        try:
+            async for batch in bulk.run():
+                if bulk.action == "unlink":
+                    tree.remove_keys(batch)
                 else:
-                    # Try with the original key from Redis
-                    keys = await self.redis_client.get_all_keys()
-                    for namespace, keys_list in keys.items():
-                        if any(k.endswith(full_key) for k in keys_list):
-                            for k in keys_list:
-                                if k.endswith(full_key):
-                                    data = await self.redis_client.get_key(k)
-                                    if data:
-                                        display = self.query_one(DataDisplay)
-                                        display.update_content(k, data)
-                                        logger.debug(f"Updated display with full key: {k}")
-                                        break
-                    if not data:
-                        logger.warning(f"No data found for key: {full_key}")
+                    tree.invalidate_metadata(batch)
+                status.update(
+                    f"{progress}... {bulk.applied:,}/~{estimate:,} keys at {bulk.rate:,.0f} keys/s, "
+                    f"COUNT {self.redis_client.throttle.count:,} - {key} to stop"
+                )
+        except asyncio.CancelledError:
+            status.update(f"{progress} stopped after {bulk.applied:,} keys - {key} to resume")
+            raise
+        except Exception as e:
+            logger.error(f"Error in bulk {bulk.action}: {e}", exc_info=True)
+            status.update(f"{progress} failed after {bulk.applied:,} keys: {e} - {key} to resume")
+            return
+        finally:
+            self._bulk_running = False
+        done = "Deleted" if bulk.action == "unlink" else f"Set a {bulk.ttl:,}s TTL on"
+        status.update(f"{done} {bulk.applied:,} keys in {bulk.elapsed:.1f}s ({bulk.rate:,.0f} keys/s)")
+        if bulk.action == "unlink" and self.server_counts:
+            await self.refresh_tree()
+        
+    async def action_export(self) -> None:
+        """Stop the running transfer, or export the folder under the cursor to a file."""
+        if self._transferring:
+            self.workers.cancel_group(self, "transfer")
+            return
+        tree = self.query_one("#redis-tree", KeyTree)
+        target = await self._folder_target(tree)
+        if target is None:
+            self._no_target()
+            return
+        match, under, scope, estimate = target
+        
+        def chosen(path: Optional[str]) -> None:
+            if path is None:
+                return
+            export = NamespaceExport(self.redis_client, path, match=match, key_type=self.key_type, under=under)
+            self.run_worker(self._run_transfer(export), group="transfer", exclusive=True)
+        
+        self.push_screen(
+            FilePrompt(f"Export ~{estimate:,} keys {scope}{self._filter_label()} to:", "redis-export.rtd.gz"),
+            chosen
+        )
+        
+    def action_import(self) -> None:
+        """Stop the running transfer, or restore an export file into the server."""
+        if self._transferring:
+            self.workers.cancel_group(self, "transfer")
+            return
+        
+        def chosen(path: Optional[str]) -> None:
+            if path is None:
+                return
+            restore = NamespaceImport(
+                self.redis_client, path, replace=self.import_replace, parallelism=self.import_parallelism
+            )
+            self.run_worker(self._run_transfer(restore), group="transfer", exclusive=True)
+        
+        existing = "replaced" if self.import_replace else "kept"
+        self.push_screen(FilePrompt(f"Import keys from (existing keys are {existing}):"), chosen)
+        
+    async def _run_transfer(self, transfer) -> None:
+        """Run an export or import, reporting throughput on the status line."""
+        status = self.query_one("#scan-status", Static)
+        exporting = isinstance(transfer, NamespaceExport)
+        key = "o" if exporting else "i"
+        progress = "Exporting" if exporting else "Importing"
+        self._transferring = True
+        status.update(f"{progress} {transfer.path}... ({key} to stop)")
+        try:
+            async for _ in transfer.run():
+                status.update(
+                    f"{progress}... {transfer.keys:,} keys, {format_bytes(transfer.bytes)} "
+                    f"at {transfer.describe()} - {key} to stop"
+                )
+        except asyncio.CancelledError:
+            status.update(f"{progress} stopped after {transfer.keys:,} keys")
+            raise
+        except Exception as e:
+            logger.error(f"Error {progress.lower()} {transfer.path}: {e}", exc_info=True)
+            status.update(f"{progress} failed after {transfer.keys:,} keys: {e}")
+            return
+        finally:
+            self._transferring = False
+        if exporting:
+            status.update(
+                f"Exported {transfer.keys:,} keys, {format_bytes(transfer.bytes)} to {transfer.path} "
+                f"in {transfer.elapsed:.1f}s ({transfer.describe()})"
+            )
+            return
+        text = (
+            f"Restored {transfer.restored:,} of {transfer.keys:,} keys "
+            f"({transfer.skipped:,} already existed) in {transfer.elapsed:.1f}s ({transfer.describe()})"
+        )
+        if transfer.truncated:
+            text += ", file ends early"
+        # The rescan below takes over the status line
+        self.notify(text, severity="warning" if transfer.truncated else "information")
+        await self.refresh_tree()
+        
+    def action_cycle_sort(self) -> None:
+        """Switch the tree to the next sort order."""
+        tree = self.query_one("#redis-tree", KeyTree)
+        mode = SORT_MODES[(SORT_MODES.index(tree.sort_mode) + 1) % len(SORT_MODES)]
+        tree.set_sort(mode)
+        self.notify(f"Sorted by {mode}")
+        
+    def on_key_tree_prefix_selected(self, message: KeyTree.PrefixSelected) -> None:
+        """Show the biggest keys under a folder once it has been analyzed."""
+        if self.analyzer is None:
+            return
+        stats = self.analyzer.stats.get(message.prefix)
+        if stats is None:
+            return
+        table = Table(expand=True)
+        table.add_column("Key", overflow="fold")
+        table.add_column("Memory", justify="right")
+        table.add_column("Length", justify="right")
+        for memory, key, length in stats.biggest():
+            table.add_row(key, format_bytes(memory), f"{length:,}")
+        estimate = "~" if self.analyzer.sample_rate < 1.0 else ""
+        prefix = message.prefix or "(all keys)"
+        self.query_one(DataDisplay).show_report(
+            "Memory",
+            f"Prefix: {prefix}\nKeys: {estimate}{int(stats.keys):,}  "
+            f"Memory: {estimate}{format_bytes(int(stats.memory))}",
+            table
+        )
+        
+    def action_search(self) -> None:
+        """Replace the key tree with the key search."""
+        self.query_one("#redis-tree", KeyTree).display = False
+        self.query_one(ValueSearch).display = False
+        self.query_one(KeySearch).open()
+        
+    def action_search_values(self) -> None:
+        """Replace the key tree with a search of the values below the folder under the cursor."""
+        tree = self.query_one("#redis-tree", KeyTree)
+        match = self.match
+        node = tree.cursor_node
+        folder = node.data if node is not None and node.allow_expand else None
+        if isinstance(folder, PrefixNode) and folder.parent is not None:
+            match = f"{escape_glob(tree.index.prefix(folder) + tree.index.separator)}*"
+        tree.display = False
+        self.query_one(KeySearch).display = False
+        self.query_one(ValueSearch).open(match, self.key_type)
+        
+    def on_key_search_closed(self, message: KeySearch.Closed) -> None:
+        """Bring the key tree back when the search is dismissed."""
+        tree = self.query_one("#redis-tree", KeyTree)
+        tree.display = True
+        tree.focus()
+        
+    def on_value_search_closed(self, message: ValueSearch.Closed) -> None:
+        """Bring the key tree back when the value search is dismissed."""
+        self.on_key_search_closed(message)
+        
+    def on_value_search_key_selected(self, message: ValueSearch.KeySelected) -> None:
+        """Display the value of the selected hit."""
+        self._select_key(message.key, message.node, delay=0)
+        
+    def on_value_search_key_highlighted(self, message: ValueSearch.KeyHighlighted) -> None:
+        """Preview the hit under the cursor once navigation pauses."""
+        self._select_key(message.key, message.node, delay=self.HIGHLIGHT_DEBOUNCE)
+        
+    def on_key_search_key_selected(self, message: KeySearch.KeySelected) -> None:
+        """Display the value of the selected search result."""
+        self._select_key(message.key, message.node, delay=0)
+        
+    def on_key_search_key_highlighted(self, message: KeySearch.KeyHighlighted) -> None:
+        """Preview the search result under the cursor once navigation pauses."""
+        self._select_key(message.key, message.node, delay=self.HIGHLIGHT_DEBOUNCE)
+        
+    def on_key_tree_key_selected(self, message: KeyTree.KeySelected) -> None:
+        """Display the value of the selected key."""
+        self._select_key(message.key, message.node, delay=0)
+        
+    def on_key_tree_key_highlighted(self, message: KeyTree.KeyHighlighted) -> None:
+        """Preview the key under the cursor once navigation pauses."""
+        self._select_key(message.key, message.node, delay=self.HIGHLIGHT_DEBOUNCE)
+        
+    def _select_key(self, key: str, node: PrefixNode, delay: float) -> None:
+        """Fetch and show a key, superseding any fetch still in flight."""
+        self._selection += 1
+        self.run_worker(
+            self._show_key(key, node, self._selection, delay),
+            group="selection",
+            exclusive=True
+        )
+        
+    async def _show_key(self, key: str, node: PrefixNode, selection: int, delay: float) -> None:
+        """Debounce, fetch and display a key unless a newer selection was made."""
+        if delay:
+            await asyncio.sleep(delay)
+        logger.debug(f"Selected key: {key}, cached type: {node.key_type}")
+        
+        value = await self.redis_client.get_key(key, key_type=node.key_type)
+        if selection != self._selection:
+            return
+        if value is None:
+            logger.warning(f"No data found for key: {key}")
+            return
+        node.key_type = value.key_type
+        
+        decoded = None
+        if value.key_type == "string" and not value.cursor and (
+            value.encoding or len(value.value) > INLINE_DECODE_LIMIT
+        ):
+            decoded = await self.decoders.decode(value.value)
+            if selection != self._selection:
+                return
+        display = self.query_one(DataDisplay)
+        display.update_content(
+            value,
+            lambda cursor: self.redis_client.get_page(key, value.key_type, cursor),
+            decoded=decoded
+        )
+        logger.debug("Updated display")
         
     def action_toggle_focus(self) -> None:
         """Toggle focus between tree and data display."""
-        tree = self.query_one("#redis-tree", Tree)
+        tree = self.query_one("#redis-tree", KeyTree)
         display = self.query_one(DataDisplay)
         if tree.has_focus:
-            display.focus()
+            display.focus_content()
         else:
             tree.focus()
         
@@ -185,6 +802,7 @@ class RedisTUI(App):
         
     async def on_unmount(self) -> None:
         """Handle app unmount event."""
+        self.decoders.close()
         await self.redis_client.close()
 
 async def run_app(args):
@@ -193,15 +811,49 @@ async def run_app(args):
         host=args.host,
         port=args.port,
         db=args.db,
-        password=args.password
+        password=args.password,
+        scan_count=args.scan_count,
+        page_size=args.page_size,
+        cache_entries=args.cache_entries,
+        cache_bytes=args.cache_mb * 1024 * 1024,
+        cache_ttl=args.cache_ttl,
+        scan_latency=args.scan_latency_ms / 1000 or None,
+        scan_rate=args.scan_rate or None,
+        cluster=args.cluster,
+        read_from_replicas=args.read_from_replicas,
+        replica=args.replica,
+        sentinels=args.sentinel,
+        service_name=args.service_name,
+        interactive_connections=args.interactive_connections,
+        background_connections=args.background_connections,
+        preview_bytes=args.preview_kb * 1024,
+        binary=args.binary,
+        max_decode_bytes=args.decode_mb * 1024 * 1024
     )
     
     if args.samples:
         await load_sample_data(client)
     
-    app = RedisTUI(redis_client=client)
+    app = RedisTUI(
+        redis_client=client,
+        sample_rate=args.sample_rate,
+        analysis_delay=args.analysis_delay,
+        server_counts=args.server_counts,
+        decoder_plugins=args.decoder_plugin or (),
+        match=args.match,
+        key_type=args.type,
+        import_parallelism=args.import_parallelism,
+        import_replace=args.import_replace
+    )
     await app.run_async()
 
+def parse_address(value: str) -> Tuple[str, int]:
+    """Parse a ``host:port`` command line argument."""
+    host, _, port = value.rpartition(":")
+    if not host or not port.isdigit():
+        raise argparse.ArgumentTypeError(f"Expected HOST:PORT, got {value!r}")
+    return host, int(port)
+
 def main():
     """Entry point for the application."""
     parser = argparse.ArgumentParser(description="Redis Terminal User Interface")
@@ -209,7 +861,57 @@ def main():
     parser.add_argument("--port", type=int, default=6379, help="Redis port")
     parser.add_argument("--db", type=int, default=0, help="Redis database number")
     parser.add_argument("--password", help="Redis password")
+    parser.add_argument("--cluster", action="store_true",
+                        help="Connect to a Redis Cluster and scan all shards concurrently")
+    parser.add_argument("--read-from-replicas", action="store_true",
+                        help="With --cluster or --sentinel, scan and read from replicas instead of primaries")
+    parser.add_argument("--replica", type=parse_address, metavar="HOST:PORT",
+                        help="Replica that serves all reads; writes still go to --host")
+    parser.add_argument("--sentinel", type=parse_address, action="append", metavar="HOST:PORT",
+                        help="Sentinel used to discover the primary, may be repeated")
+    parser.add_argument("--service-name", default="mymaster",
+                        help="Name of the primary monitored by Sentinel")
+    parser.add_argument("--interactive-connections", type=int, default=DEFAULT_INTERACTIVE_CONNECTIONS,
+                        help="Connections reserved for fetching the values you select")
+    parser.add_argument("--background-connections", type=int, default=DEFAULT_BACKGROUND_CONNECTIONS,
+                        help="Connections, and concurrent commands per server, for scans and analysis")
+    parser.add_argument("--match", default="*",
+                        help="Only load keys matching this glob pattern, filtered by the server")
+    parser.add_argument("--type", choices=KEY_TYPES[1:],
+                        help="Only load keys of this type, filtered by the server")
     parser.add_argument("--samples", action="store_true", help="Load sample data")
+    parser.add_argument("--scan-count", type=int, default=DEFAULT_SCAN_COUNT,
+                        help="Initial COUNT hint for each SCAN call during key discovery")
+    parser.add_argument("--scan-latency-ms", type=float, default=DEFAULT_TARGET_LATENCY * 1000,
+                        help="Server time per SCAN call that COUNT adapts to, 0 to keep COUNT fixed")
+    parser.add_argument("--scan-rate", type=float, default=0,
+                        help="Maximum keys per second visited by background scans, 0 for no limit")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE,
+                        help="Number of elements loaded per page of a list, hash, set or sorted set")
+    parser.add_argument("--preview-kb", type=int, default=DEFAULT_PREVIEW_BYTES // 1024,
+                        help="Kilobytes of a string loaded at first, and per chunk after that")
+    parser.add_argument("--binary", action="store_true",
+                        help="Show string values as a hex dump instead of decoding them as UTF-8")
+    parser.add_argument("--decode-mb", type=int, default=DEFAULT_MAX_DECODE_BYTES // (1024 * 1024),
+                        help="Largest compressed or serialized string fetched whole and decoded, in megabytes")
+    parser.add_argument("--decoder-plugin", action="append", metavar="MODULE",
+                        help="Module registering extra value decoders, may be repeated")
+    parser.add_argument("--cache-entries", type=int, default=1000,
+                        help="Maximum number of keys kept in the value cache, 0 to disable")
+    parser.add_argument("--cache-mb", type=int, default=64,
+                        help="Maximum size of the value cache in megabytes")
+    parser.add_argument("--cache-ttl", type=float, default=DEFAULT_CACHE_TTL,
+                        help="Seconds cached values live when keyspace notifications are off")
+    parser.add_argument("--sample-rate", type=float, default=1.0,
+                        help="Fraction of keys the memory analyzer measures")
+    parser.add_argument("--analysis-delay", type=float, default=0.0,
+                        help="Seconds the memory analyzer pauses between SCAN batches")
+    parser.add_argument("--import-parallelism", type=int, default=DEFAULT_PARALLELISM,
+                        help="RESTORE pipelines in flight when importing an export file")
+    parser.add_argument("--import-replace", action="store_true",
+                        help="Overwrite existing keys when importing instead of keeping them")
+    parser.add_argument("--server-counts", action="store_true",
+                        help="Count namespaces with a server-side script and load folders on expand")
     
     args = parser.parse_args()
     
@@ -3,6 +3,17 @@
 This package contains Textual widgets and components used in the Redis TUI.
 """
 
+from .bulk_confirm import BulkConfirm
+from .collection_view import CollectionView
 from .data_display import DataDisplay
+from .file_prompt import FilePrompt
+from .hex_view import HexView
+from .key_filter import KeyFilter
+from .key_search import KeySearch
+from .key_tree import KeyTree
+from .value_search import ValueSearch
 
-__all__ = ["DataDisplay"]
+__all__ = [
+    "BulkConfirm", "CollectionView", "DataDisplay", "FilePrompt", "HexView", "KeyFilter", "KeySearch",
+    "KeyTree", "ValueSearch"
+]
@@ -0,0 +1,111 @@
+"""
+Confirmation dialog for bulk operations.
+
+This module provides a modal screen that states what a bulk delete or
+expiry is about to do, and how many keys it is expected to touch, before
+anything is sent to the server. For expiry it also asks for the TTL.
+"""
+
+from typing import Optional
+from textual.app import ComposeResult
+from textual.binding import Binding
+from textual.containers import Horizontal, Vertical
+from textual.screen import ModalScreen
+from textual.widgets import Button, Input, Label
+
+class BulkConfirm(ModalScreen[Optional[int]]):
+    """Modal confirmation of a bulk operation.
+
+    Dismissed with the entered TTL, 0 when no TTL is asked for, or None
+    when cancelled.
+    """
+
+    DEFAULT_CSS = """
+    BulkConfirm {
+        align: center middle;
+    }
+
+    BulkConfirm > Vertical {
+        width: 60;
+        height: auto;
+        padding: 1 2;
+        border: thick $warning;
+        background: $surface;
+    }
+
+    BulkConfirm Input {
+        margin-top: 1;
+    }
+
+    BulkConfirm Horizontal {
+        height: auto;
+        margin-top: 1;
+        align-horizontal: right;
+    }
+
+    BulkConfirm Button {
+        margin-left: 1;
+    }
+    """
+
+    BINDINGS = [
+        Binding("escape", "cancel", "Cancel"),
+    ]
+
+    def __init__(self, message: str, confirm: str, ask_ttl: bool = False) -> None:
+        """Initialize the dialog.
+
+        Args:
+            message: Description of the operation and its estimated size
+            confirm: Label of the confirm button
+            ask_ttl: Ask for the TTL, in seconds, to set
+        """
+        super().__init__()
+        self.message = message
+        self.confirm = confirm
+        self.ask_ttl = ask_ttl
+
+    def compose(self) -> ComposeResult:
+        """Compose the message, TTL box and buttons."""
+        with Vertical():
+            yield Label(self.message)
+            if self.ask_ttl:
+                yield Input(placeholder="TTL in seconds", type="integer")
+            with Horizontal():
+                yield Button("Cancel", id="cancel")
+                yield Button(self.confirm, variant="error", id="confirm")
+
+    def on_mount(self) -> None:
+        """Focus the TTL box, or the cancel button so Enter is harmless."""
+        if self.ask_ttl:
+            self.query_one(Input).focus()
+        else:
+            self.query_one("#cancel", Button).focus()
+
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        """Confirm when Enter is pressed in the TTL box."""
+        event.stop()
+        self._confirm()
+
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        """Confirm or cancel."""
+        event.stop()
+        if event.button.id == "confirm":
+            self._confirm()
+        else:
+            self.dismiss(None)
+
+    def _confirm(self) -> None:
+        """Dismiss with the TTL, once a valid one has been entered."""
+        if not self.ask_ttl:
+            self.dismiss(0)
+            return
+        ttl = self.query_one(Input).value
+        if not ttl.isdigit() or int(ttl) <= 0:
+            self.notify("Enter a TTL of at least one second", severity="warning")
+            return
+        self.dismiss(int(ttl))
+
+    def action_cancel(self) -> None:
+        """Close without doing anything."""
+        self.dismiss(None)
@@ -0,0 +1,202 @@
+"""
+A virtualized row view for Redis collection values.
+
+This module provides a Textual scroll view that renders hash, list, set and
+sorted set values one row per line. Only the rows on screen are rendered,
+and further pages are requested from the Redis client as the user scrolls
+towards the end of what has been loaded. At most a bounded window of rows
+is kept; lists and sorted sets, whose cursors are indexes, fetch the rows
+at a far scroll position directly instead of walking every page to it.
+"""
+
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from rich.segment import Segment
+from rich.style import Style
+from textual.geometry import Size
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+import logging
+
+from ..data.redis_client import ValuePage
+
+logger = logging.getLogger(__name__)
+
+# Coroutine function fetching the page that starts at a cursor
+PageFetcher = Callable[[int], Awaitable[ValuePage]]
+
+# Start fetching the next page once the viewport is this close to the end
+PREFETCH_ROWS = 100
+
+# Most rows kept loaded; the earliest loaded rows are dropped first
+MAX_LOADED_ROWS = 5000
+
+# Types whose page cursor is the index of the page's first element
+INDEXED_TYPES = frozenset({"list", "zset"})
+
+# Widest the label column (field, index or score) is allowed to grow
+MAX_LABEL_WIDTH = 32
+
+class CollectionView(ScrollView, can_focus=True):
+    """Scrollable, lazily loaded rows of a collection value."""
+
+    DEFAULT_CSS = """
+    CollectionView {
+        height: 1fr;
+    }
+    """
+
+    def __init__(self, **kwargs) -> None:
+        """Initialize an empty view."""
+        super().__init__(**kwargs)
+        self.key_type = ""
+        # Loaded window of rows, the first being row ``_first``
+        self._rows: List[Tuple[str, str]] = []
+        self._first = 0
+        self._total = 0
+        # Cursor of the page following the window, 0 once at the end
+        self._cursor = 0
+        # Row index -> cursor of the page starting there, for going back
+        # to rows dropped from the window of a hash or set
+        self._checkpoints: Dict[int, int] = {}
+        self._fetch_page: Optional[PageFetcher] = None
+        self._loading = False
+        # Bumped on every load so late pages from a previous key are dropped
+        self._generation = 0
+        self._label_width = 0
+
+    @property
+    def row_count(self) -> int:
+        """Number of rows currently loaded."""
+        return len(self._rows)
+
+    @property
+    def first_row(self) -> int:
+        """Index of the first loaded row."""
+        return self._first
+
+    def load(self, key_type: str, page: ValuePage, fetch_page: PageFetcher) -> None:
+        """Show a new collection value.
+
+        Args:
+            key_type: Redis type of the value
+            page: First page of the value, with its total element count
+            fetch_page: Coroutine function returning the page at a cursor
+        """
+        self._generation += 1
+        self.workers.cancel_group(self, "rows")
+        self.key_type = key_type
+        self._rows = []
+        self._first = 0
+        self._checkpoints = {0: 0}
+        self._label_width = 0
+        self._loading = False
+        self._fetch_page = fetch_page
+        self._total = page.total or 0
+        self._append(page, 0)
+        self.scroll_to(0, 0, animate=False)
+
+    def _append(self, page: ValuePage, start: int) -> None:
+        """Add a page of rows starting at row ``start`` and resize the virtual canvas.
+
+        A page that does not continue the window replaces it. The earliest
+        rows are dropped once the window grows past MAX_LOADED_ROWS.
+        """
+        if start != self._first + len(self._rows):
+            self._rows = []
+            self._first = start
+        for position, item in enumerate(page.items, start):
+            label, value = self._format_row(position, item)
+            self._label_width = min(MAX_LABEL_WIDTH, max(self._label_width, len(label)))
+            self._rows.append((label, value))
+        end = self._first + len(self._rows)
+        self._cursor = page.cursor
+        if page.cursor and self.key_type not in INDEXED_TYPES:
+            self._checkpoints[end] = page.cursor
+        if page.done or end > self._total:
+            # The value changed since it was counted; trust what was read.
+            self._total = end
+        overflow = len(self._rows) - MAX_LOADED_ROWS
+        if overflow > 0:
+            del self._rows[:overflow]
+            self._first += overflow
+        self.virtual_size = Size(0, self._total)
+        self.refresh()
+
+    def _format_row(self, position: int, item) -> Tuple[str, str]:
+        """Split a collection element into its label and value columns."""
+        if self.key_type == "hash":
+            field, value = item
+            return str(field), str(value)
+        elif self.key_type == "zset":
+            member, score = item
+            return f"{score:g}", str(member)
+        elif self.key_type == "list":
+            return str(position), str(item)
+        return "", str(item)
+
+    def render_line(self, y: int) -> Strip:
+        """Render one visible row."""
+        _, scroll_y = self.scroll_offset
+        row_index = scroll_y + y
+        width = self.size.width
+        base_style = self.rich_style
+        if row_index >= self._total:
+            return Strip.blank(width, base_style)
+        end = self._first + len(self._rows)
+        if row_index < self._first or row_index >= end - PREFETCH_ROWS:
+            self._request_rows(row_index)
+        if not self._first <= row_index < end:
+            return Strip([Segment("...", base_style + Style(dim=True))]).adjust_cell_length(width, base_style)
+
+        label, value = self._rows[row_index - self._first]
+        value = value.replace("\n", "\\n")
+        segments = []
+        if self._label_width:
+            if len(label) > self._label_width:
+                label = label[:self._label_width - 1] + "…"
+            segments.append(Segment(label.ljust(self._label_width), base_style + Style(bold=True)))
+            segments.append(Segment(" │ ", base_style + Style(dim=True)))
+        segments.append(Segment(value, base_style))
+        return Strip(segments).crop(0, width).adjust_cell_length(width, base_style)
+
+    def _request_rows(self, row_index: int) -> None:
+        """Start fetching the page needed to show a row, unless one is in flight.
+
+        Rows just past the window continue it from its cursor. Lists and
+        sorted sets jump straight to rows further away; hashes and sets
+        walk forward page by page, and go back to the closest checkpoint
+        before a row dropped from the window.
+        """
+        if self._loading or self._fetch_page is None:
+            return
+        end = self._first + len(self._rows)
+        if self._first <= row_index < end + PREFETCH_ROWS or (
+            row_index >= end and self.key_type not in INDEXED_TYPES
+        ):
+            if self._cursor == 0:
+                return
+            start, cursor = end, self._cursor
+        elif self.key_type in INDEXED_TYPES:
+            start = cursor = max(0, row_index - PREFETCH_ROWS // 2)
+        else:
+            start = max(row for row in self._checkpoints if row <= row_index)
+            cursor = self._checkpoints[start]
+        self._loading = True
+        self.run_worker(self._load_more(self._generation, start, cursor), group="rows")
+
+    async def _load_more(self, generation: int, start: int, cursor: int) -> None:
+        """Fetch the page at a cursor and add it if the value is still shown."""
+        try:
+            page = await self._fetch_page(cursor)
+        except Exception as e:
+            logger.error(f"Error loading rows: {e}", exc_info=True)
+            if generation == self._generation:
+                self._cursor = 0
+                self._total = self._first + len(self._rows)
+                self.virtual_size = Size(0, self._total)
+            return
+        finally:
+            if generation == self._generation:
+                self._loading = False
+        if generation == self._generation:
+            self._append(page, start)
@@ -5,7 +5,7 @@ This module provides a Textual widget for displaying different Redis data types
 in a formatted and interactive way.
 """
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 import json
 from rich.syntax import Syntax
 from rich.text import Text
@@ -16,10 +16,19 @@ from textual.message import Message
 from textual.containers import Container, Vertical, ScrollableContainer
 from rich.console import Group, RenderableType, Console
 from textual.widget import Widget
+from textual.binding import Binding
 import logging
 
+from .collection_view import CollectionView, PageFetcher
+from .hex_view import HexView
+from ..data.decoders import INLINE_DECODE_LIMIT, DecodedValue
+from ..data.redis_client import COLLECTION_TYPES, KeyValue, ValuePage
+
 logger = logging.getLogger(__name__)
 
+# Decoded JSON longer than this is shown as plain text, without highlighting
+HIGHLIGHT_LIMIT = 1024 * 1024
+
 class SplitDisplay(Container):
     """A container that displays content in a split view."""
     
@@ -58,7 +67,7 @@ class SplitDisplay(Container):
         self.top_panel.update(top_content)
         self.bottom_panel.update(bottom_content)
 
-class DataDisplay(Static):
+class DataDisplay(Vertical):
     """Display Redis data."""
     
     DEFAULT_CSS = """
@@ -68,51 +77,178 @@ class DataDisplay(Static):
         height: 100%;
         border: solid $primary;
         padding: 1;
-        overflow-y: auto;
         width: 100%;
     }
+    
+    DataDisplay #value-header {
+        height: auto;
+    }
+    
+    DataDisplay #value-scroll {
+        height: 1fr;
+    }
+    
+    DataDisplay CollectionView, DataDisplay HexView {
+        display: none;
+    }
     """
     
+    BINDINGS = [
+        Binding("m", "load_more", "More"),
+    ]
+    
     def __init__(self):
         """Initialize the display."""
-        super().__init__("")
+        super().__init__()
         self.console = Console()
+        # Chunks of a partially loaded string and the byte offset after them
+        self._string_chunks: List[str] = []
+        self._string_cursor = 0
+        self._string_size = 0
+        self._string_fetch: Optional[PageFetcher] = None
+        # Bumped on every update so late chunks of a previous key are dropped
+        self._generation = 0
+        
+    def compose(self):
+        """Compose the header, text body and collection row views."""
+        yield Static(id="value-header")
+        with ScrollableContainer(id="value-scroll"):
+            yield Static(id="value-body")
+        yield CollectionView()
+        yield HexView()
     
     def on_mount(self) -> None:
         """Handle mount event."""
-        self.update(Panel("Welcome to Redis TUI\nSelect a key to view its data"))
+        self.query_one("#value-header", Static).update(
+            Panel("Welcome to Redis TUI\nSelect a key to view its data")
+        )
+        
+    def focus_content(self) -> None:
+        """Focus whichever view is showing the current value."""
+        for view in (self.query_one(CollectionView), self.query_one(HexView)):
+            if view.display:
+                view.focus()
+                return
+        self.query_one("#value-scroll").focus()
+            
+    def _show_view(self, view: str) -> None:
+        """Switch between the ``"text"`` body, ``"rows"`` view and ``"hex"`` view."""
+        self.query_one("#value-scroll").display = view == "text"
+        self.query_one(CollectionView).display = view == "rows"
+        self.query_one(HexView).display = view == "hex"
     
-    def update_content(self, key: str, data: str) -> None:
-        """Update display content."""
+    def update_content(
+        self,
+        value: KeyValue,
+        fetch_page: Optional[PageFetcher] = None,
+        decoded: Optional[DecodedValue] = None
+    ) -> None:
+        """Update display content.
+        
+        Args:
+            value: Key value with its type, size and TTL
+            fetch_page: Coroutine function returning the collection page at a
+                cursor, used to load rows beyond the first page
+            decoded: Readable form of a string value, decoded off the event loop
+        """
+        self._generation += 1
+        self._string_chunks = []
+        self._string_cursor = 0
         try:
-            # Create a list to hold renderable objects
-            rendered = []
+            self.query_one("#value-header", Static).update(self._format_header(value))
             
-            # Add key header
-            rendered.append(Panel(f"Key: {key}", title="Redis Key"))
-            
-            # Try to parse and format as JSON
-            try:
-                parsed = json.loads(data) if isinstance(data, str) else data
-                json_str = json.dumps(parsed, indent=2)
-                syntax = Syntax(json_str, "json", theme="monokai", word_wrap=True)
-                rendered.append(Panel(syntax, title="Data"))
-            except:
-                # Fallback to raw display
-                rendered.append(Panel(str(data), title="Raw Data"))
+            if value.key_type in COLLECTION_TYPES:
+                self.query_one(CollectionView).load(value.key_type, value.first_page(), fetch_page)
+                self._show_view("rows")
+            elif decoded is not None:
+                self._show_decoded(decoded)
+            elif isinstance(value.value, bytes):
+                self.query_one(HexView).load(value.first_page(), fetch_page)
+                self._show_view("hex")
+            elif value.key_type == "string" and value.cursor:
+                self._string_chunks = [value.value]
+                self._string_cursor = value.cursor
+                self._string_size = value.size
+                self._string_fetch = fetch_page
+                self._show_chunks()
+                self._show_view("text")
+            else:
+                body = Panel(self._format_data(value.value, value.key_type), title="Data")
+                self.query_one("#value-body", Static).update(body)
+                self._show_view("text")
+            logger.debug(f"Display updated for {value.key}")
             
-            # Join all renderables with newlines
-            output = "\n".join(str(r) for r in rendered)
+        except Exception as e:
+            logger.error(f"Error updating display: {e}", exc_info=True)
+            self.query_one("#value-body", Static).update(Panel(f"Error displaying data: {e}"))
+            self._show_view("text")
             
-            # Update the widget
-            self.update(output)
-            logger.debug("Display updated successfully")
+    def _show_decoded(self, decoded: DecodedValue) -> None:
+        """Show a decoded string, as a hex dump if it is not text."""
+        if isinstance(decoded.value, bytes):
+            page = ValuePage("string", [decoded.value], 0, total=len(decoded.value))
+            self.query_one(HexView).load(page, None)
+            self._show_view("hex")
+            return
+        title = " → ".join(["Data", *decoded.encodings])
+        if decoded.truncated:
+            title += " (truncated)"
+        if decoded.is_json and len(decoded.value) <= HIGHLIGHT_LIMIT:
+            content = Syntax(decoded.value, "json", theme="monokai", word_wrap=True)
+        else:
+            content = Text(decoded.value)
+        self.query_one("#value-body", Static).update(Panel(content, title=title))
+        self._show_view("text")
+        
+    def _show_chunks(self) -> None:
+        """Show the loaded part of a large string."""
+        if self._string_cursor:
+            title = f"Data (first {self._string_cursor:,} of {self._string_size:,} bytes, m for more)"
+        else:
+            title = "Data"
+        body = Panel(Text("".join(self._string_chunks)), title=title)
+        self.query_one("#value-body", Static).update(body)
+        
+    def action_load_more(self) -> None:
+        """Load the next chunk of a partially shown string."""
+        if self._string_cursor and self._string_fetch is not None:
+            self.run_worker(self._load_chunk(self._generation), group="chunks", exclusive=True)
             
+    async def _load_chunk(self, generation: int) -> None:
+        """Fetch the next chunk and append it if the string is still shown."""
+        try:
+            page = await self._string_fetch(self._string_cursor)
         except Exception as e:
-            logger.error(f"Error updating display: {e}", exc_info=True)
-            self.update(Panel(f"Error displaying data: {e}"))
+            logger.error(f"Error loading string chunk: {e}", exc_info=True)
+            return
+        if generation != self._generation:
+            return
+        self._string_chunks.extend(page.items)
+        self._string_cursor = page.cursor
+        self._show_chunks()
+        
+    def show_report(self, title: str, header: str, body: RenderableType) -> None:
+        """Show a renderable that is not a key value, such as an analysis report.
+        
+        Args:
+            title: Title of the header panel
+            header: Text of the header panel
+            body: Renderable shown below the header
+        """
+        self.query_one("#value-header", Static).update(Panel(header, title=title))
+        self.query_one("#value-body", Static).update(body)
+        self._show_view("text")
+            
+    def _format_header(self, value: KeyValue) -> Panel:
+        """Format the key name and metadata panel."""
+        unit = "bytes" if value.key_type == "string" else "elements"
+        ttl = "no expiry" if value.ttl < 0 else f"{value.ttl:,}s"
+        text = f"Key: {value.key}\nType: {value.key_type}  Size: {value.size:,} {unit}  TTL: {ttl}"
+        if value.encoding:
+            text += f"  Encoding: {value.encoding}"
+        return Panel(text, title="Redis Key")
 
-    def _format_data(self, value: Any, data_type: str) -> str:
+    def _format_data(self, value: Any, data_type: str) -> RenderableType:
         """Format Redis data based on its type.
         
         Args:
@@ -120,17 +256,20 @@ class DataDisplay(Static):
             data_type: The Redis data type
             
         Returns:
-            Formatted string representation of the data
+            Renderable representation of the data
         """
         if data_type == "string":
+            if not isinstance(value, str) or len(value) > INLINE_DECODE_LIMIT:
+                return Text(str(value))
             try:
                 # Try to parse as JSON for pretty printing
                 data = json.loads(value)
-                return Syntax(json.dumps(data, indent=2), "json", theme="monokai")
+                return Syntax(json.dumps(data, indent=2), "json", theme="monokai", word_wrap=True)
             except (json.JSONDecodeError, TypeError):
-                return str(value)
+                return Text(str(value))
         elif data_type == "hash":
-            return "\n".join(f"{k}: {v}" for k, v in value.items())
+            items = value.items() if isinstance(value, dict) else value
+            return "\n".join(f"{k}: {v}" for k, v in items)
         elif data_type in ("list", "set"):
             return "\n".join(str(item) for item in value)
         elif data_type == "zset":
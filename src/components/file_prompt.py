@@ -0,0 +1,66 @@
+"""
+File path prompt for exports and imports.
+
+This module provides a modal screen asking for the path of an export file,
+with a line stating what is about to be written or read.
+"""
+
+from typing import Optional
+from textual.app import ComposeResult
+from textual.binding import Binding
+from textual.containers import Vertical
+from textual.screen import ModalScreen
+from textual.widgets import Input, Label
+
+class FilePrompt(ModalScreen[Optional[str]]):
+    """Modal prompt for a file path, dismissed with the path or None."""
+
+    DEFAULT_CSS = """
+    FilePrompt {
+        align: center middle;
+    }
+
+    FilePrompt > Vertical {
+        width: 70;
+        height: auto;
+        padding: 1 2;
+        border: thick $primary;
+        background: $surface;
+    }
+
+    FilePrompt Input {
+        margin-top: 1;
+    }
+    """
+
+    BINDINGS = [
+        Binding("escape", "cancel", "Cancel"),
+    ]
+
+    def __init__(self, message: str, path: str = "") -> None:
+        """Initialize the prompt.
+
+        Args:
+            message: What the file is used for
+            path: Path the box starts with
+        """
+        super().__init__()
+        self.message = message
+        self.path = path
+
+    def compose(self) -> ComposeResult:
+        """Compose the message and path box."""
+        with Vertical():
+            yield Label(self.message)
+            yield Input(value=self.path, placeholder="Path, .gz to compress")
+
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        """Dismiss with the entered path, if any."""
+        event.stop()
+        path = event.value.strip()
+        if path:
+            self.dismiss(path)
+
+    def action_cancel(self) -> None:
+        """Close without a path."""
+        self.dismiss(None)
@@ -0,0 +1,129 @@
+"""
+A virtualized hex/ASCII view for binary string values.
+
+This module provides a Textual scroll view that shows bytes as offset, hex
+and ASCII columns. Only the rows on screen are formatted, each from a
+memoryview slice of the loaded buffer, and further chunks of the value are
+requested from the Redis client as the user scrolls towards the end.
+"""
+
+from typing import Optional
+from rich.segment import Segment
+from rich.style import Style
+from textual.geometry import Size
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+import logging
+
+from .collection_view import PREFETCH_ROWS, PageFetcher
+from ..data.redis_client import ValuePage
+
+logger = logging.getLogger(__name__)
+
+# Bytes shown per row
+BYTES_PER_ROW = 16
+
+# Printable ASCII stays as is, every other byte is shown as a dot
+_ASCII = bytes(byte if 32 <= byte < 127 else ord(".") for byte in range(256))
+
+class HexView(ScrollView, can_focus=True):
+    """Scrollable, lazily loaded hex dump of a binary value."""
+
+    DEFAULT_CSS = """
+    HexView {
+        height: 1fr;
+    }
+    """
+
+    def __init__(self, **kwargs) -> None:
+        """Initialize an empty view."""
+        super().__init__(**kwargs)
+        self._buffer = bytearray()
+        self._total = 0
+        self._cursor = 0
+        self._fetch_page: Optional[PageFetcher] = None
+        self._loading = False
+        # Bumped on every load so late chunks from a previous key are dropped
+        self._generation = 0
+
+    @property
+    def loaded(self) -> int:
+        """Number of bytes loaded so far."""
+        return len(self._buffer)
+
+    def load(self, page: ValuePage, fetch_page: Optional[PageFetcher]) -> None:
+        """Show a new binary value.
+
+        Args:
+            page: First chunk of the value, with its total length
+            fetch_page: Coroutine function returning the chunk at a byte offset
+        """
+        self._generation += 1
+        self.workers.cancel_group(self, "chunks")
+        self._buffer = bytearray()
+        self._loading = False
+        self._fetch_page = fetch_page
+        self._total = page.total or 0
+        self._append(page)
+        self.scroll_to(0, 0, animate=False)
+
+    def _append(self, page: ValuePage) -> None:
+        """Add a chunk of bytes and resize the virtual canvas."""
+        for chunk in page.items:
+            self._buffer += chunk
+        self._cursor = page.cursor
+        if page.done or len(self._buffer) > self._total:
+            self._total = len(self._buffer)
+        rows = -(-self._total // BYTES_PER_ROW)
+        self.virtual_size = Size(0, rows)
+        self.refresh()
+
+    def render_line(self, y: int) -> Strip:
+        """Render one visible row of offset, hex and ASCII columns."""
+        _, scroll_y = self.scroll_offset
+        start = (scroll_y + y) * BYTES_PER_ROW
+        width = self.size.width
+        base_style = self.rich_style
+        if start >= self._total:
+            return Strip.blank(width, base_style)
+        if start >= len(self._buffer) - PREFETCH_ROWS * BYTES_PER_ROW:
+            self._request_chunk()
+        if start >= len(self._buffer):
+            return Strip([Segment("...", base_style + Style(dim=True))]).adjust_cell_length(width, base_style)
+
+        with memoryview(self._buffer) as view:
+            row = view[start:start + BYTES_PER_ROW]
+            hex_column = row.hex(" ")
+            ascii_column = row.tobytes().translate(_ASCII).decode("ascii")
+        segments = [
+            Segment(f"{start:08x}", base_style + Style(dim=True)),
+            Segment("  "),
+            Segment(hex_column.ljust(BYTES_PER_ROW * 3 - 1), base_style),
+            Segment("  │ ", base_style + Style(dim=True)),
+            Segment(ascii_column, base_style + Style(bold=True)),
+        ]
+        return Strip(segments).crop(0, width).adjust_cell_length(width, base_style)
+
+    def _request_chunk(self) -> None:
+        """Start fetching the next chunk unless one is in flight or none remain."""
+        if self._loading or self._cursor == 0 or self._fetch_page is None:
+            return
+        self._loading = True
+        self.run_worker(self._load_more(self._generation), group="chunks")
+
+    async def _load_more(self, generation: int) -> None:
+        """Fetch the next chunk and append it if the value is still shown."""
+        try:
+            page = await self._fetch_page(self._cursor)
+        except Exception as e:
+            logger.error(f"Error loading bytes: {e}", exc_info=True)
+            if generation == self._generation:
+                self._cursor = 0
+                self._total = len(self._buffer)
+                self.virtual_size = Size(0, -(-self._total // BYTES_PER_ROW))
+            return
+        finally:
+            if generation == self._generation:
+                self._loading = False
+        if generation == self._generation:
+            self._append(page)
@@ -0,0 +1,105 @@
+"""
+Pattern and type filter controls for the key tree.
+
+This module provides a Textual widget holding a glob pattern box and a
+Redis type picker. Applying a filter does not hide anything locally: the
+app rescans with SCAN MATCH and SCAN TYPE, so only matching keys are ever
+sent by the server.
+"""
+
+from typing import Optional
+from textual.binding import Binding
+from textual.containers import Horizontal
+from textual.message import Message
+from textual.widgets import Input, Select
+
+# Types offered by the type picker, "" standing for any type
+KEY_TYPES = ("", "string", "hash", "list", "set", "zset", "stream")
+
+class KeyFilter(Horizontal):
+    """Glob pattern box and type picker for server-side key filtering."""
+
+    DEFAULT_CSS = """
+    KeyFilter {
+        display: none;
+        dock: top;
+        height: auto;
+    }
+
+    KeyFilter Input {
+        width: 1fr;
+    }
+
+    KeyFilter Select {
+        width: 16;
+    }
+    """
+
+    BINDINGS = [
+        Binding("escape", "close", "Close filter"),
+    ]
+
+    class Changed(Message):
+        """Posted when a new filter is applied."""
+
+        def __init__(self, match: str, key_type: Optional[str]) -> None:
+            """Initialize the message.
+
+            Args:
+                match: Glob-style pattern keys must match
+                key_type: Redis type keys must have, None for any
+            """
+            super().__init__()
+            self.match = match
+            self.key_type = key_type
+
+    class Closed(Message):
+        """Posted when the filter controls are dismissed."""
+
+    def __init__(self, match: str = "*", key_type: Optional[str] = None, **kwargs) -> None:
+        """Initialize the controls.
+
+        Args:
+            match: Initial glob pattern
+            key_type: Initial Redis type, None for any
+        """
+        super().__init__(**kwargs)
+        self.match = match
+        self.key_type = key_type
+
+    def compose(self):
+        """Compose the pattern box and type picker."""
+        yield Input(value="" if self.match == "*" else self.match, placeholder="Pattern, e.g. user:*")
+        yield Select(
+            [(key_type or "any type", key_type) for key_type in KEY_TYPES],
+            allow_blank=False,
+            value=self.key_type or "",
+        )
+
+    def open(self) -> None:
+        """Show the controls and focus the pattern box."""
+        self.display = True
+        self.query_one(Input).focus()
+
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        """Apply the pattern when Enter is pressed."""
+        event.stop()
+        self._apply(event.value.strip() or "*", self.key_type)
+
+    def on_select_changed(self, event: Select.Changed) -> None:
+        """Apply a newly picked type."""
+        event.stop()
+        self._apply(self.query_one(Input).value.strip() or "*", event.value or None)
+
+    def _apply(self, match: str, key_type: Optional[str]) -> None:
+        """Post the filter if it differs from the one in effect."""
+        if (match, key_type) == (self.match, self.key_type):
+            return
+        self.match = match
+        self.key_type = key_type
+        self.post_message(self.Changed(match, key_type))
+
+    def action_close(self) -> None:
+        """Hide the controls, keeping the filter in effect."""
+        self.display = False
+        self.post_message(self.Closed())
@@ -0,0 +1,139 @@
+"""
+A search box over the keys in the key tree.
+
+This module provides a Textual widget that looks up keys in the key tree's
+trigram index as you type and lists the best matches flat, so a key can be
+found without knowing which folder it lives in.
+"""
+
+from typing import Type
+from rich.style import Style
+from rich.text import Text
+from textual.binding import Binding
+from textual.containers import Vertical
+from textual.message import Message
+from textual.widgets import Input, OptionList, Static
+from textual.widgets.option_list import Option
+
+from .key_tree import KeyTree
+from ..data.search_index import DEFAULT_SEARCH_LIMIT
+
+class KeySearch(Vertical):
+    """Search box and ranked result list for the keys in a KeyTree."""
+
+    DEFAULT_CSS = """
+    KeySearch {
+        display: none;
+        height: 1fr;
+    }
+
+    KeySearch OptionList {
+        height: 1fr;
+        border: none;
+    }
+
+    KeySearch .search-status {
+        height: 1;
+        padding: 0 1;
+        color: $text-muted;
+    }
+    """
+
+    BINDINGS = [
+        Binding("escape", "close", "Close search"),
+        Binding("down", "focus_results", "Results", show=False),
+    ]
+
+    class KeySelected(KeyTree.KeySelected):
+        """Posted when a search result is selected."""
+
+    class KeyHighlighted(KeyTree.KeyHighlighted):
+        """Posted when the cursor moves onto a search result."""
+
+    class Closed(Message):
+        """Posted when the search is dismissed."""
+
+    def __init__(self, tree: KeyTree, limit: int = DEFAULT_SEARCH_LIMIT, **kwargs) -> None:
+        """Initialize the search.
+
+        Args:
+            tree: Key tree whose keys are searched
+            limit: Maximum number of results listed
+        """
+        super().__init__(**kwargs)
+        self.key_tree = tree
+        self.limit = limit
+
+    def compose(self):
+        """Compose the search box, result list and status line."""
+        yield Input(placeholder="Search keys")
+        yield OptionList()
+        yield Static("", classes="search-status")
+
+    def open(self) -> None:
+        """Show the search, building the tree's search index on first use."""
+        self.key_tree.enable_search()
+        self.display = True
+        search_box = self.query_one(Input)
+        search_box.focus()
+        self.search(search_box.value)
+
+    def search(self, query: str) -> None:
+        """List the keys best matching a query."""
+        results = self.key_tree.search_index.search(query, self.limit) if query else []
+        folded = query.lower()
+        options = []
+        for key in results:
+            label = Text(key)
+            position = key.lower().find(folded)
+            if position >= 0:
+                label.stylize(Style(bold=True, color="yellow"), position, position + len(folded))
+            options.append(Option(label, id=key))
+        results_list = self.query_one(OptionList)
+        results_list.clear_options()
+        results_list.add_options(options)
+        indexed = len(self.key_tree.search_index)
+        status = f"{len(results):,} matches in {indexed:,} keys" if query else f"{indexed:,} keys indexed"
+        self.query_one(".search-status", Static).update(status)
+
+    def on_input_changed(self, event: Input.Changed) -> None:
+        """Search again as the query changes."""
+        event.stop()
+        self.search(event.value)
+
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        """Select the best match when Enter is pressed in the search box."""
+        event.stop()
+        results_list = self.query_one(OptionList)
+        if results_list.option_count:
+            results_list.highlighted = 0
+            results_list.focus()
+            self._post_key(results_list.get_option_at_index(0), self.KeySelected)
+
+    def on_option_list_option_highlighted(self, event: OptionList.OptionHighlighted) -> None:
+        """Preview the result under the cursor."""
+        event.stop()
+        self._post_key(event.option, self.KeyHighlighted)
+
+    def on_option_list_option_selected(self, event: OptionList.OptionSelected) -> None:
+        """Show the selected result."""
+        event.stop()
+        self._post_key(event.option, self.KeySelected)
+
+    def _post_key(self, option: Option, message: Type[KeyTree.KeySelected]) -> None:
+        """Post a key message for a result that is still in the tree."""
+        node = self.key_tree.index.find(option.id)
+        if node is not None:
+            self.post_message(message(option.id, node))
+
+    def action_focus_results(self) -> None:
+        """Move from the search box into the result list."""
+        results = self.query_one(OptionList)
+        if results.highlighted is None and results.option_count:
+            results.highlighted = 0
+        results.focus()
+
+    def action_close(self) -> None:
+        """Hide the search."""
+        self.display = False
+        self.post_message(self.Closed())
@@ -0,0 +1,616 @@
+"""
+A lazily populated tree of Redis keys.
+
+This module provides a Textual tree widget backed by a KeyIndex. Child
+nodes are only created when their parent is expanded, and large fan-outs
+are paged, so widget count follows what is on screen rather than the
+size of the keyspace.
+"""
+
+from bisect import bisect_left
+from fnmatch import fnmatchcase
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import asyncio
+from rich.style import Style
+from rich.text import Text
+from textual.message import Message
+from textual.widgets import Tree
+from textual.widgets._tree import TreeNode
+import logging
+
+from ..data.key_index import KeyIndex, PrefixNode
+from ..data.search_index import TrigramIndex
+
+logger = logging.getLogger(__name__)
+
+# Sort key of a displayed entry. It always ends with the segment name and
+# 0 for folders or 1 for leaves; other sort modes put a metric in front.
+EntryKey = Tuple
+
+# Orderings the tree can be sorted by
+SORT_MODES = ("name", "memory", "keys")
+
+DEFAULT_PAGE_SIZE = 500
+
+# Keys indexed for search between yields to the event loop
+SEARCH_BATCH_SIZE = 5000
+
+# Badge text and colour shown before leaves of each Redis type
+TYPE_BADGES = {
+    "string": ("STR ", "green"),
+    "hash": ("HASH", "magenta"),
+    "list": ("LIST", "cyan"),
+    "set": ("SET ", "yellow"),
+    "zset": ("ZSET", "blue"),
+    "stream": ("STRM", "red"),
+}
+
+def format_bytes(size: int) -> str:
+    """Format a byte count for display, e.g. ``1.5 KB``."""
+    value = float(size)
+    for unit in ("B", "KB", "MB", "GB"):
+        if value < 1024 or unit == "GB":
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+
+class _MoreEntries:
+    """Marker data for the "show next" paging node."""
+
+_MORE = _MoreEntries()
+
+class KeyTree(Tree):
+    """Tree view of Redis keys grouped by separator-delimited prefix."""
+
+    class KeySelected(Message):
+        """Posted when a leaf holding a Redis key is selected."""
+
+        def __init__(self, key: str, node: PrefixNode) -> None:
+            """Initialize the message.
+
+            Args:
+                key: Full Redis key of the selected leaf
+                node: Index node holding the key and its cached type
+            """
+            super().__init__()
+            self.key = key
+            self.node = node
+
+    class KeyHighlighted(KeySelected):
+        """Posted when the cursor moves onto a leaf holding a Redis key."""
+
+    class PrefixSelected(Message):
+        """Posted when a folder is selected."""
+
+        def __init__(self, prefix: str, node: PrefixNode) -> None:
+            """Initialize the message.
+
+            Args:
+                prefix: Key prefix the folder represents
+                node: Index node of the folder
+            """
+            super().__init__()
+            self.prefix = prefix
+            self.node = node
+
+    class NamespaceRequested(Message):
+        """Posted when a folder known only from server-side counts is expanded."""
+
+        def __init__(self, prefix: str, node: PrefixNode) -> None:
+            """Initialize the message.
+
+            Args:
+                prefix: Key prefix the folder represents
+                node: Index node with pending summarized keys
+            """
+            super().__init__()
+            self.prefix = prefix
+            self.node = node
+
+    class MetadataRequested(Message):
+        """Posted when leaves without metadata become visible."""
+
+        def __init__(self, nodes: List[PrefixNode]) -> None:
+            """Initialize the message.
+
+            Args:
+                nodes: Index nodes of the newly displayed keys
+            """
+            super().__init__()
+            self.nodes = nodes
+
+    def __init__(
+        self,
+        label: str = "Redis Keys",
+        index: Optional[KeyIndex] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        **kwargs
+    ) -> None:
+        """Initialize the key tree.
+
+        Args:
+            label: Root node label
+            index: Prefix index to display, a new empty one by default
+            page_size: Maximum number of children built per page
+        """
+        super().__init__(label, **kwargs)
+        self.index = index or KeyIndex()
+        self.page_size = page_size
+        self.sort_mode = "name"
+        # Memory analysis results by prefix, shown next to folders when set
+        self.stats: Optional[Dict[str, Any]] = None
+        # Prefix nodes whose children are currently built, and their tree node
+        self._built: Dict[PrefixNode, TreeNode] = {}
+        # Sorted entry keys shown under each built prefix node
+        self._shown: Dict[PrefixNode, List[EntryKey]] = {}
+        # Number of entries each built prefix node may show before paging
+        self._limit: Dict[PrefixNode, int] = {}
+        self._more: Dict[PrefixNode, TreeNode] = {}
+        # Tree node for each displayed (prefix node, is_folder) entry
+        self._entries: Dict[Tuple[PrefixNode, bool], TreeNode] = {}
+        # Leaves displayed since metadata was last requested
+        self._needs_metadata: List[PrefixNode] = []
+        # Trigram index over key names, built once search is first used
+        self.search_index: Optional[TrigramIndex] = None
+        self._attach_root()
+
+    def _attach_root(self) -> None:
+        """Bind the root tree node to the root of the index."""
+        self.root.data = self.index.root
+        self._built[self.index.root] = self.root
+        self._shown[self.index.root] = []
+        self._limit[self.index.root] = 0
+        self._populate(self.root, self.index.root)
+        self.root.expand()
+
+    def clear_keys(self) -> None:
+        """Remove all keys from the index and the tree."""
+        self.index.clear()
+        if self.search_index is not None:
+            self.search_index.clear()
+        self._reset_nodes()
+
+    def _reset_nodes(self) -> None:
+        """Drop every built tree node and rebuild the root page."""
+        self.clear()
+        self._built.clear()
+        self._shown.clear()
+        self._limit.clear()
+        self._more.clear()
+        self._entries.clear()
+        self._needs_metadata.clear()
+        self._attach_root()
+
+    async def update_keys(self, keys: Iterable[str], pattern: Optional[str] = None) -> None:
+        """Replace the displayed keys.
+
+        Args:
+            keys: Redis keys
+            pattern: Optional glob pattern keys must match to be shown
+        """
+        self.clear_keys()
+        if pattern:
+            keys = (key for key in keys if fnmatchcase(key, pattern))
+        self.add_keys(keys)
+
+    def begin_refresh(self) -> None:
+        """Start a refresh pass; keys not re-added before finish_refresh are removed."""
+        self.index.begin_sweep()
+
+    def finish_refresh(self) -> int:
+        """Remove keys that were not seen since begin_refresh.
+
+        Metadata of displayed leaves is re-requested, since their values may
+        have changed as well.
+
+        Returns:
+            Number of keys removed
+        """
+        removed = self.remove_keys(self.index.stale_keys())
+        for (node, is_folder) in self._entries:
+            if not is_folder:
+                node.metadata = None
+                self._needs_metadata.append(node)
+        self._request_metadata()
+        return removed
+
+    def add_keys(self, keys: Iterable[str]) -> int:
+        """Add keys to the index, inserting nodes only where they are visible.
+
+        Args:
+            keys: Redis keys
+
+        Returns:
+            Number of keys that were not already indexed
+        """
+        added = self.index.add_many(keys)
+        self._index_for_search(added)
+        self._sync(added)
+        return len(added)
+
+    def remove_keys(self, keys: Iterable[str]) -> int:
+        """Remove keys from the index and any nodes displaying them.
+
+        Args:
+            keys: Redis keys
+
+        Returns:
+            Number of keys that were indexed
+        """
+        removed = []
+        for key in keys:
+            node = self.index.remove(key)
+            if node is not None:
+                removed.append(node)
+                if self.search_index is not None:
+                    self.search_index.remove(key)
+        self._sync(removed)
+        return len(removed)
+
+    def add_namespace_counts(
+        self,
+        parent: PrefixNode,
+        prefixes: Dict[str, int],
+        keys: Iterable[str]
+    ) -> None:
+        """Add server-side namespace counts for the contents of a folder.
+
+        Everything added is taken off the parent's pending count, so folder
+        sizes stay stable while a summarized folder is being loaded.
+
+        Args:
+            parent: Folder the counts were gathered for
+            prefixes: Prefix one level below the parent -> number of keys
+            keys: Keys directly in the parent
+        """
+        changed = [self.index.add_summary(prefix, count) for prefix, count in prefixes.items()]
+        added = self.index.add_many(keys)
+        self._index_for_search(added)
+        self.index.settle(parent, sum(prefixes.values()) + len(added))
+        self._sync(changed + added + [parent])
+
+    def finish_namespace_counts(self, parent: PrefixNode) -> None:
+        """Drop whatever a folder's summary counted but loading did not find."""
+        if self.index.settle(parent):
+            self._sync([parent])
+
+    def enable_search(self) -> TrigramIndex:
+        """Start maintaining the search index, indexing known keys in the background.
+
+        Returns:
+            The search index; it fills up over the following event loop turns
+        """
+        if self.search_index is None:
+            self.search_index = TrigramIndex()
+            self.run_worker(self._build_search_index(), group="search-index", exclusive=True)
+        return self.search_index
+
+    async def _build_search_index(self) -> None:
+        """Index the keys present when search was enabled, batch by batch.
+
+        The prefix index is walked with an explicit stack, yielding to the
+        event loop every SEARCH_BATCH_SIZE nodes. Keys added meanwhile are
+        indexed by add_keys, and nodes removed meanwhile have no key left.
+        """
+        root = self.index.root
+        stack = [root]
+        batch = []
+        visited = 0
+        while stack:
+            node = stack.pop()
+            if node.key is not None:
+                batch.append(node.key)
+            stack.extend(node.children.values())
+            visited += 1
+            if visited % SEARCH_BATCH_SIZE == 0:
+                self.search_index.add_many(batch)
+                batch.clear()
+                await asyncio.sleep(0)
+                if self.index.root is not root:
+                    # clear_keys ran; what is left belongs to the old keys
+                    return
+        self.search_index.add_many(batch)
+        logger.debug(f"Search index built over {len(self.search_index):,} keys")
+
+    def _index_for_search(self, nodes: Iterable[PrefixNode]) -> None:
+        """Add newly indexed keys to the search index, if search is in use."""
+        if self.search_index is not None:
+            self.search_index.add_many(node.key for node in nodes)
+
+    def invalidate_metadata(self, keys: Iterable[str]) -> None:
+        """Drop metadata of changed keys, re-requesting it for visible leaves."""
+        for key in keys:
+            node = self.index.find(key)
+            if node is None or node.metadata is None:
+                continue
+            node.metadata = None
+            if (node, False) in self._entries:
+                self._needs_metadata.append(node)
+        self._request_metadata()
+
+    def set_sort(self, mode: str) -> None:
+        """Sort children by name, analyzed memory or key count.
+
+        Built folders are rebuilt in the new order and stay expanded.
+        """
+        if mode not in SORT_MODES:
+            raise ValueError(f"Unknown sort mode: {mode}")
+        self.sort_mode = mode
+        expanded = sorted(
+            (node for node in self._built if node is not self.index.root),
+            key=lambda node: len(node.lineage)
+        )
+        self._reset_nodes()
+        for node in expanded:
+            entry = self._entries.get((node, True))
+            if entry is not None:
+                entry.expand()
+                self._build_folder(entry, node)
+
+    def refresh_stats(self) -> None:
+        """Repaint folders after the analysis stats have changed."""
+        for (node, is_folder), entry in self._entries.items():
+            if is_folder:
+                entry.refresh()
+        self.root.refresh()
+
+    def update_metadata(self, nodes: Iterable[PrefixNode]) -> None:
+        """Repaint leaves whose metadata has been filled in."""
+        for node in nodes:
+            entry = self._entries.get((node, False))
+            if entry is not None:
+                entry.refresh()
+
+    def render_label(self, node: TreeNode, base_style: Style, style: Style) -> Text:
+        """Render a node label with key counts for folders and badges for keys."""
+        text = super().render_label(node, base_style, style)
+        data = node.data
+        if not isinstance(data, PrefixNode):
+            return text
+        if node.allow_expand:
+            text.append(f" ({data.count:,})", style=Style(dim=True))
+            stats = self._stats_for(data)
+            if stats is not None:
+                total = self.stats.get("")
+                share = stats.memory * 100 / total.memory if total and total.memory else 0
+                text.append(
+                    f"  {format_bytes(int(stats.memory))} {share:.1f}%",
+                    style=Style(color="cyan")
+                )
+            return text
+        metadata = data.metadata
+        if metadata is None:
+            return text
+        badge, color = TYPE_BADGES.get(metadata.key_type, (metadata.key_type[:4].upper(), "white"))
+        text = Text.assemble((badge, Style(color=color, bold=True)), " ", text)
+        if metadata.ttl >= 0:
+            text.append(f"  ⏱ {metadata.ttl:,}s", style=Style(color="yellow", dim=True))
+        if metadata.memory is not None:
+            text.append(f"  {format_bytes(metadata.memory)}", style=Style(dim=True))
+        return text
+
+    def _stats_for(self, node: PrefixNode) -> Optional[Any]:
+        """Get analysis stats for a folder, if an analysis has covered it."""
+        if self.stats is None:
+            return None
+        return self.stats.get(self.index.prefix(node))
+
+    def _entry_key(self, node: PrefixNode, is_folder: bool) -> EntryKey:
+        """Get the sort key of a folder or leaf entry in the current sort mode."""
+        kind = 0 if is_folder else 1
+        if self.sort_mode == "memory":
+            if is_folder:
+                stats = self._stats_for(node)
+                memory = stats.memory if stats is not None else 0
+            else:
+                memory = node.metadata.memory if node.metadata and node.metadata.memory else 0
+            return (-memory, node.name, kind)
+        elif self.sort_mode == "keys":
+            return (-(node.count if is_folder else 1), node.name, kind)
+        return (node.name, kind)
+
+    def on_tree_node_expanded(self, event: Tree.NodeExpanded) -> None:
+        """Build the first page of children when a folder is expanded."""
+        node = event.node
+        data = node.data
+        if isinstance(data, PrefixNode) and data not in self._built:
+            self._build_folder(node, data)
+        if isinstance(data, PrefixNode) and data.pending:
+            self.post_message(self.NamespaceRequested(self.index.prefix(data), data))
+
+    def _build_folder(self, node: TreeNode, data: PrefixNode) -> None:
+        """Start tracking a folder's children and build their first page."""
+        self._built[data] = node
+        self._shown[data] = []
+        self._limit[data] = 0
+        self._populate(node, data)
+
+    def on_tree_node_collapsed(self, event: Tree.NodeCollapsed) -> None:
+        """Release the children of a collapsed folder."""
+        node = event.node
+        data = node.data
+        if isinstance(data, PrefixNode) and data is not self.index.root:
+            for child in node.children:
+                self._forget(child)
+            node.remove_children()
+            self._unbuild(data)
+
+    def on_tree_node_highlighted(self, event: Tree.NodeHighlighted) -> None:
+        """Report leaves the cursor moves onto, for previewing their value."""
+        data = event.node.data
+        if isinstance(data, PrefixNode) and not event.node.allow_expand and data.key is not None:
+            self.post_message(self.KeyHighlighted(data.key, data))
+
+    def on_tree_node_selected(self, event: Tree.NodeSelected) -> None:
+        """Report selected keys and load the next page for "show next" nodes."""
+        node = event.node
+        data = node.data
+        if isinstance(data, PrefixNode) and not node.allow_expand:
+            if data.key is not None:
+                self.post_message(self.KeySelected(data.key, data))
+        elif isinstance(data, PrefixNode):
+            self.post_message(self.PrefixSelected(self.index.prefix(data), data))
+        elif data is _MORE:
+            event.stop()
+            parent = node.parent
+            self._more.pop(parent.data, None)
+            node.remove()
+            self._populate(parent, parent.data)
+
+    def _sorted_entries(self, prefix_node: PrefixNode) -> List[Tuple[EntryKey, PrefixNode]]:
+        """Get the folder and leaf entries of a folder's children in display order."""
+        return sorted(
+            (self._entry_key(child, kind == 0), child)
+            for child in prefix_node.children.values()
+            for kind in (0, 1)
+            if (child.is_folder if kind == 0 else child.key is not None)
+        ) if prefix_node.children else []
+
+    def _populate(self, tree_node: TreeNode, prefix_node: PrefixNode) -> None:
+        """Build the next page of children for a built folder."""
+        entries = self._sorted_entries(prefix_node)
+        shown = self._shown[prefix_node]
+        limit = self._limit[prefix_node] = self._limit[prefix_node] + self.page_size
+        for entry_key, child in entries[len(shown):limit]:
+            shown.append(entry_key)
+            self._add_entry(tree_node, child, entry_key[-1] == 0)
+        if len(entries) > limit:
+            self._add_more(tree_node, prefix_node)
+        self._request_metadata()
+
+    def _add_entry(
+        self,
+        tree_node: TreeNode,
+        prefix_node: PrefixNode,
+        is_folder: bool,
+        before: Optional[int] = None
+    ) -> None:
+        """Create the tree node for a folder or leaf entry."""
+        if is_folder:
+            entry = tree_node.add(prefix_node.name, data=prefix_node, before=before)
+        else:
+            entry = tree_node.add_leaf(prefix_node.name, data=prefix_node, before=before)
+        self._entries[(prefix_node, is_folder)] = entry
+        if not is_folder and prefix_node.metadata is None:
+            self._needs_metadata.append(prefix_node)
+
+    def _request_metadata(self) -> None:
+        """Ask for metadata of leaves displayed since the last request."""
+        if self._needs_metadata:
+            self.post_message(self.MetadataRequested(self._needs_metadata))
+            self._needs_metadata = []
+
+    def _add_more(self, tree_node: TreeNode, prefix_node: PrefixNode) -> None:
+        """Add the paging node to a folder if it does not have one yet."""
+        if prefix_node not in self._more:
+            self._more[prefix_node] = tree_node.add_leaf(
+                Text(f"... show next {self.page_size}", style="italic"), data=_MORE
+            )
+
+    def _sync(self, changed: List[PrefixNode]) -> None:
+        """Bring built tree nodes in line with the index after a change.
+
+        Args:
+            changed: Index nodes whose key or summarized count changed
+        """
+        seen = set()
+        for prefix_node in changed:
+            for node in reversed(prefix_node.lineage[1:]):
+                if node in seen:
+                    continue
+                seen.add(node)
+                attached = node.count > 0
+                for is_folder, wanted in (
+                    (True, attached and node.is_folder),
+                    (False, attached and node.key is not None),
+                ):
+                    entry = self._entries.get((node, is_folder))
+                    if entry is not None and not wanted:
+                        self._remove_entry(node, is_folder, entry)
+                    elif entry is None and wanted and node.parent in self._built:
+                        self._insert_entry(node, is_folder)
+                folder = self._entries.get((node, True))
+                if folder is not None:
+                    folder.refresh()
+        if changed:
+            self.root.refresh()
+        self._request_metadata()
+
+    def _insert_entry(self, prefix_node: PrefixNode, is_folder: bool) -> None:
+        """Insert a new entry into its built parent, respecting paging."""
+        parent = prefix_node.parent
+        tree_node = self._built[parent]
+        shown = self._shown[parent]
+        limit = self._limit[parent]
+        entry_key = self._entry_key(prefix_node, is_folder)
+        position = bisect_left(shown, entry_key)
+        if position == len(shown) and (len(shown) >= limit or parent in self._more):
+            # Sorts after the loaded pages; it will appear when paged in.
+            # Appending it while a paging node exists would put it after
+            # that node and out of step with the next page.
+            self._add_more(tree_node, parent)
+            return
+        before = position if position < len(shown) else None
+        shown.insert(position, entry_key)
+        self._add_entry(tree_node, prefix_node, is_folder, before=before)
+        if len(shown) > limit:
+            # Push the last loaded entry back behind the paging node.
+            *_, name, kind = shown.pop()
+            overflow = parent.children[name]
+            entry = self._entries.pop((overflow, kind == 0))
+            self._forget(entry)
+            entry.remove()
+            self._add_more(tree_node, parent)
+
+    def _remove_entry(self, prefix_node: PrefixNode, is_folder: bool, entry: TreeNode) -> None:
+        """Remove a displayed entry and everything built beneath it."""
+        self._forget(entry)
+        entry.remove()
+        shown = self._shown.get(prefix_node.parent)
+        if shown is not None:
+            # Metric sort keys may have changed since insertion, so match
+            # on the trailing name and kind rather than bisecting.
+            tail = (prefix_node.name, 0 if is_folder else 1)
+            for position in range(len(shown) - 1, -1, -1):
+                if shown[position][-2:] == tail:
+                    del shown[position]
+                    break
+            if prefix_node.parent in self._more:
+                self._pull_next(prefix_node.parent)
+
+    def _pull_next(self, prefix_node: PrefixNode) -> None:
+        """Move the first entry behind a folder's paging node onto its loaded page.
+
+        Keeps the loaded entries equal to the leading entries of the folder
+        so the next page continues right after them.
+        """
+        tree_node = self._built[prefix_node]
+        shown = self._shown[prefix_node]
+        entries = self._sorted_entries(prefix_node)
+        for entry_key, child in entries[len(shown):]:
+            is_folder = entry_key[-1] == 0
+            if (child, is_folder) in self._entries:
+                continue
+            shown.append(entry_key)
+            self._add_entry(tree_node, child, is_folder, before=self._more[prefix_node])
+            break
+        if len(entries) <= len(shown):
+            self._more.pop(prefix_node).remove()
+
+    def _forget(self, tree_node: TreeNode) -> None:
+        """Drop bookkeeping for a tree node and its descendants."""
+        stack = [tree_node]
+        while stack:
+            current = stack.pop()
+            data = current.data
+            if isinstance(data, PrefixNode):
+                self._entries.pop((data, current.allow_expand), None)
+                if self._built.get(data) is current:
+                    self._unbuild(data)
+            stack.extend(current.children)
+
+    def _unbuild(self, prefix_node: PrefixNode) -> None:
+        """Mark a folder's children as no longer built."""
+        self._built.pop(prefix_node, None)
+        self._shown.pop(prefix_node, None)
+        self._limit.pop(prefix_node, None)
+        self._more.pop(prefix_node, None)
@@ -0,0 +1,178 @@
+"""
+A search of key values, streaming hits into a list.
+
+This module provides a Textual widget that runs a ContentSearch over a
+namespace in a background worker and lists each key whose value contains
+the searched text, with an excerpt, as soon as it is found.
+"""
+
+from typing import Optional, Type
+from rich.style import Style
+from rich.text import Text
+from textual.binding import Binding
+from textual.containers import Vertical
+from textual.message import Message
+from textual.widgets import Input, OptionList, Static
+from textual.widgets.option_list import Option
+import asyncio
+import logging
+
+from .key_tree import KeyTree
+from ..data.content_search import ContentHit, ContentSearch
+from ..data.key_index import PrefixNode
+from ..data.redis_client import RedisClient
+
+logger = logging.getLogger(__name__)
+
+class ValueSearch(Vertical):
+    """Search box and streaming hit list for a value-content search."""
+
+    DEFAULT_CSS = """
+    ValueSearch {
+        display: none;
+        height: 1fr;
+    }
+
+    ValueSearch OptionList {
+        height: 1fr;
+        border: none;
+    }
+
+    ValueSearch .search-status {
+        height: auto;
+        padding: 0 1;
+        color: $text-muted;
+    }
+    """
+
+    BINDINGS = [
+        Binding("escape", "stop_or_close", "Stop / close"),
+        Binding("down", "focus_results", "Results", show=False),
+    ]
+
+    class KeySelected(KeyTree.KeySelected):
+        """Posted when a hit is selected."""
+
+    class KeyHighlighted(KeyTree.KeyHighlighted):
+        """Posted when the cursor moves onto a hit."""
+
+    class Closed(Message):
+        """Posted when the search is dismissed."""
+
+    def __init__(self, client: RedisClient, key_tree: KeyTree, **kwargs) -> None:
+        """Initialize the search.
+
+        Args:
+            client: Redis client the search runs against
+            key_tree: Key tree holding the index nodes of hits, when loaded
+        """
+        super().__init__(**kwargs)
+        self.client = client
+        self.key_tree = key_tree
+        self.match = "*"
+        self.key_type: Optional[str] = None
+        self.content_search: Optional[ContentSearch] = None
+        self._searching = False
+
+    def compose(self):
+        """Compose the search box, hit list and status line."""
+        yield Input(placeholder="Find values containing... (Enter to search)")
+        yield OptionList()
+        yield Static("", classes="search-status")
+
+    def open(self, match: str = "*", key_type: Optional[str] = None) -> None:
+        """Show the search over the keys matching a pattern and type.
+
+        Args:
+            match: Glob pattern of the namespace to walk
+            key_type: Redis type to restrict the walk to, None for any
+        """
+        if not self._searching:
+            self.match = match
+            self.key_type = key_type
+            self._set_status(f"Search values of keys matching {match}")
+        self.display = True
+        self.query_one(Input).focus()
+
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        """Start a new search for the entered text."""
+        event.stop()
+        needle = event.value
+        if not needle:
+            return
+        self.query_one(OptionList).clear_options()
+        self.content_search = ContentSearch(self.client, needle, match=self.match, key_type=self.key_type)
+        self.run_worker(self._run(self.content_search), group="value-search", exclusive=True)
+
+    async def _run(self, search: ContentSearch) -> None:
+        """Run a search, appending hits to the list as they arrive."""
+        results = self.query_one(OptionList)
+        self._searching = True
+        progress = "Searching"
+        try:
+            self._set_status(self._describe(search, progress))
+            async for hits in search.run():
+                results.add_options(self._option(hit) for hit in hits)
+                self._set_status(self._describe(search, progress))
+            progress = "Done"
+        except asyncio.CancelledError:
+            progress = "Stopped"
+            raise
+        except Exception as e:
+            logger.error(f"Error searching values: {e}", exc_info=True)
+            progress = f"Failed ({e})"
+        finally:
+            # A superseded search must not report over its replacement
+            if search is self.content_search:
+                self._searching = False
+                self._set_status(self._describe(search, progress))
+
+    def _describe(self, search: ContentSearch, progress: str) -> str:
+        """Summarize a search's progress for the status line."""
+        text = (
+            f"{progress}: {search.hits:,} hits in {search.checked:,}/{search.scanned:,} keys "
+            f"matching {search.match}"
+        )
+        if progress == "Searching":
+            text += f" at {self.client.throttle.describe()} - esc to stop"
+        return text
+
+    def _option(self, hit: ContentHit) -> Option:
+        """Build the list entry for a hit."""
+        label = Text(hit.key, style=Style(bold=True))
+        label.append("  " + " ".join(hit.excerpt.split()), style=Style(dim=True))
+        return Option(label, id=hit.key)
+
+    def _set_status(self, text: str) -> None:
+        """Update the status line."""
+        self.query_one(".search-status", Static).update(text)
+
+    def on_option_list_option_highlighted(self, event: OptionList.OptionHighlighted) -> None:
+        """Preview the hit under the cursor."""
+        event.stop()
+        self._post_key(event.option, self.KeyHighlighted)
+
+    def on_option_list_option_selected(self, event: OptionList.OptionSelected) -> None:
+        """Show the selected hit."""
+        event.stop()
+        self._post_key(event.option, self.KeySelected)
+
+    def _post_key(self, option: Option, message: Type[KeyTree.KeySelected]) -> None:
+        """Post a key message for a hit, whether or not it is loaded in the tree."""
+        node = self.key_tree.index.find(option.id) or PrefixNode(option.id)
+        self.post_message(message(option.id, node))
+
+    def action_focus_results(self) -> None:
+        """Move from the search box into the hit list."""
+        results = self.query_one(OptionList)
+        if results.highlighted is None and results.option_count:
+            results.highlighted = 0
+        results.focus()
+
+    def action_stop_or_close(self) -> None:
+        """Stop a running search, or hide the search if none is running."""
+        if self._searching:
+            self.workers.cancel_group(self, "value-search")
+            return
+        self.display = False
+        self.post_message(self.Closed())
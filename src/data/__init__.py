@@ -1,5 +1,18 @@
 """Data handling utilities."""
+from .analyzer import MemoryAnalyzer, PrefixStats
+from .bulk import BulkOperation
+from .content_search import ContentHit, ContentSearch
+from .decoders import Decoder, DecodedValue, DecoderPool, decode_value, register_decoder
+from .key_index import KeyIndex, PrefixNode
 from .redis_client import RedisClient
 from .sample_data import load_sample_data, SAMPLE_DATA
+from .search_index import TrigramIndex
+from .throttle import ScanThrottle
+from .transfer import NamespaceExport, NamespaceImport
 
-__all__ = ["RedisClient", "load_sample_data", "SAMPLE_DATA"]
+__all__ = [
+    "MemoryAnalyzer", "PrefixStats", "BulkOperation", "ContentHit", "ContentSearch",
+    "Decoder", "DecodedValue", "DecoderPool", "decode_value", "register_decoder",
+    "KeyIndex", "PrefixNode", "RedisClient", "load_sample_data", "SAMPLE_DATA", "ScanThrottle",
+    "TrigramIndex", "NamespaceExport", "NamespaceImport"
+]
@@ -0,0 +1,119 @@
+"""
+Namespace memory analysis.
+
+This module walks the keyspace with SCAN, pipelines MEMORY USAGE and length
+commands for each batch, and aggregates bytes, key counts and the biggest
+keys for every prefix, answering "which namespace is using our memory".
+"""
+
+from dataclasses import dataclass, field
+from heapq import heappush, heapreplace
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+import asyncio
+import logging
+import random
+
+from .key_index import DEFAULT_SEPARATOR
+from .redis_client import KeySize, RedisClient
+
+logger = logging.getLogger(__name__)
+
+# Number of biggest keys remembered per prefix
+DEFAULT_TOP_N = 10
+
+@dataclass
+class PrefixStats:
+    """Aggregated memory usage of the keys below a prefix.
+
+    When sampling, ``memory`` and ``keys`` are estimates scaled up by the
+    inverse of the sample rate.
+    """
+
+    memory: float = 0
+    keys: float = 0
+    # Min-heap of (bytes, key, length) for the biggest sampled keys
+    top: List[Tuple[int, str, int]] = field(default_factory=list)
+
+    def record(self, key: str, memory: int, length: int, weight: float, top_n: int) -> None:
+        """Add one sampled key to the aggregate."""
+        self.memory += memory * weight
+        self.keys += weight
+        if len(self.top) < top_n:
+            heappush(self.top, (memory, key, length))
+        elif memory > self.top[0][0]:
+            heapreplace(self.top, (memory, key, length))
+
+    def biggest(self) -> List[Tuple[int, str, int]]:
+        """Get the biggest keys, largest first."""
+        return sorted(self.top, reverse=True)
+
+class MemoryAnalyzer:
+    """Background walk of the keyspace aggregating memory by prefix."""
+
+    def __init__(
+        self,
+        client: RedisClient,
+        separator: str = DEFAULT_SEPARATOR,
+        sample_rate: float = 1.0,
+        top_n: int = DEFAULT_TOP_N,
+        delay: float = 0.0,
+        match: str = "*",
+        key_type: Optional[str] = None
+    ) -> None:
+        """Initialize the analyzer.
+
+        Args:
+            client: Redis client
+            separator: Key segment separator used to derive prefixes
+            sample_rate: Fraction of keys to measure, 1.0 walks every key
+            top_n: Number of biggest keys remembered per prefix
+            delay: Seconds to pause between batches to limit server load
+            match: Glob pattern restricting the walk
+            key_type: Redis type restricting the walk, None for any
+        """
+        self.client = client
+        self.separator = separator
+        self.sample_rate = min(1.0, max(sample_rate, 1e-6))
+        self.top_n = top_n
+        self.delay = delay
+        self.match = match
+        self.key_type = key_type
+        # Prefix ("" for the whole keyspace) -> aggregated stats
+        self.stats: Dict[str, PrefixStats] = {}
+        self.scanned = 0
+        self.sampled = 0
+
+    async def run(self) -> AsyncIterator[int]:
+        """Walk the keyspace, updating ``stats`` after every batch.
+
+        Yields:
+            Number of keys scanned so far, once per SCAN batch
+        """
+        self.stats.clear()
+        self.scanned = 0
+        self.sampled = 0
+        async for batch in self.client.scan_keys(match=self.match, key_type=self.key_type):
+            self.scanned += len(batch)
+            if self.sample_rate < 1.0:
+                batch = [key for key in batch if random.random() < self.sample_rate]
+            if batch:
+                sizes = await self.client.get_key_sizes(batch)
+                for key, size in sizes.items():
+                    self._record(key, size)
+                self.sampled += len(sizes)
+            yield self.scanned
+            if self.delay:
+                await asyncio.sleep(self.delay)
+        logger.debug(f"Analysis complete: {self.scanned} keys scanned, {self.sampled} measured")
+
+    def _record(self, key: str, size: KeySize) -> None:
+        """Add a measured key to the stats of every prefix above it."""
+        weight = 1 / self.sample_rate
+        memory = size.memory or 0
+        segments = key.split(self.separator)
+        for depth in range(len(segments)):
+            prefix = self.separator.join(segments[:depth])
+            stats = self.stats.get(prefix)
+            if stats is None:
+                stats = self.stats[prefix] = PrefixStats()
+            stats.record(key, memory, size.length, weight, self.top_n)
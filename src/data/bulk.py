@@ -0,0 +1,111 @@
+"""
+Bulk deletion and expiry of keys by pattern.
+
+This module walks the keys matching a pattern with SCAN and applies UNLINK
+or EXPIRE to each batch in one pipelined round-trip, paced by the client's
+scan throttle. The SCAN cursor is kept between runs, so an operation that
+was stopped resumes where it left off instead of starting over.
+"""
+
+from typing import AsyncIterator, List, Optional
+import logging
+import time
+
+from .redis_client import RedisClient
+
+logger = logging.getLogger(__name__)
+
+# Actions a bulk operation can apply
+BULK_ACTIONS = ("unlink", "expire")
+
+class BulkOperation:
+    """Resumable pipelined UNLINK or EXPIRE of every key matching a pattern."""
+
+    def __init__(
+        self,
+        client: RedisClient,
+        action: str,
+        match: str = "*",
+        key_type: Optional[str] = None,
+        under: str = "",
+        ttl: Optional[int] = None,
+        count: Optional[int] = None
+    ) -> None:
+        """Initialize the operation.
+
+        Args:
+            client: Redis client
+            action: "unlink" to delete keys, "expire" to set their TTL
+            match: Glob pattern restricting the walk
+            key_type: Redis type restricting the walk, None for any
+            under: Only act on keys starting with this literal prefix, for
+                when ``match`` cannot express it
+            ttl: TTL in seconds set by "expire"
+            count: Fixed COUNT hint per SCAN call, adaptive by default
+
+        Raises:
+            ValueError: If the action is unknown or "expire" has no
+                positive TTL
+        """
+        if action not in BULK_ACTIONS:
+            raise ValueError(f"Unknown bulk action {action!r}")
+        if action == "expire" and (ttl is None or ttl <= 0):
+            raise ValueError("expire needs a positive TTL")
+        self.client = client
+        self.action = action
+        self.match = match
+        self.key_type = key_type
+        self.under = under
+        self.ttl = ttl
+        self.count = count
+        # SCAN cursor the next run resumes from
+        self.cursor = 0
+        self.finished = False
+        # Keys matched so far, and how many of them the action applied to
+        self.matched = 0
+        self.applied = 0
+        # Seconds spent running, summed over every run
+        self.elapsed = 0.0
+
+    @property
+    def rate(self) -> float:
+        """Keys acted on per second while running."""
+        return self.applied / self.elapsed if self.elapsed else 0.0
+
+    async def run(self) -> AsyncIterator[List[str]]:
+        """Apply the action batch by batch, from where the last run stopped.
+
+        The cursor only advances once a batch has been applied, so a run
+        cancelled mid-batch repeats that batch when resumed; both actions
+        are idempotent.
+
+        Yields:
+            Each batch of keys the action was applied to
+        """
+        throttle = self.client.throttle
+        while not self.finished:
+            started = time.monotonic()
+            try:
+                cursor, batch = await self.client.scan_slice(
+                    self.cursor, self.match, self.count, self.key_type
+                )
+                if self.under:
+                    batch = [key for key in batch if key.startswith(self.under)]
+                applied = 0
+                if batch:
+                    await throttle.wait(len(batch))
+                    sent = time.monotonic()
+                    if self.action == "unlink":
+                        applied = await self.client.unlink_keys(batch)
+                    else:
+                        applied = await self.client.expire_keys(batch, self.ttl)
+                    throttle.record(time.monotonic() - sent, len(batch))
+            finally:
+                self.elapsed += time.monotonic() - started
+            self.cursor = cursor
+            self.finished = cursor == 0
+            self.matched += len(batch)
+            self.applied += applied
+            if batch:
+                yield batch
+        logger.debug(f"Bulk {self.action} of {self.match} done: {self.applied} of {self.matched} keys")
@@ -0,0 +1,159 @@
+"""
+Streaming search of key values for a substring.
+
+This module walks a namespace with SCAN and checks every value on the
+server in bounded slices, through RedisClient.search_values, so a value
+can be found when its key is not known. Batches are checked concurrently
+up to a limit, paced by the client's scan throttle, and hits are yielded
+as soon as they are found.
+"""
+
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, List, Optional, Set
+import asyncio
+import logging
+import time
+
+from .redis_client import RedisClient
+
+logger = logging.getLogger(__name__)
+
+# Number of SCAN batches checked at the same time
+DEFAULT_CONCURRENCY = 2
+
+# Search stops after this many hits
+DEFAULT_MAX_HITS = 1000
+
+# Elements of a collection looked at per key and round-trip
+DEFAULT_BUDGET = 100
+
+@dataclass
+class ContentHit:
+    """A key whose value contains the searched text."""
+
+    key: str
+    key_type: str
+    # Text around the first match, prefixed by the field or index it is in
+    excerpt: str
+
+class ContentSearch:
+    """Cancellable walk of a namespace looking for a substring in values."""
+
+    def __init__(
+        self,
+        client: RedisClient,
+        needle: str,
+        match: str = "*",
+        key_type: Optional[str] = None,
+        ignore_case: bool = True,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        max_hits: int = DEFAULT_MAX_HITS,
+        budget: int = DEFAULT_BUDGET
+    ) -> None:
+        """Initialize the search.
+
+        Args:
+            client: Redis client
+            needle: Text to look for
+            match: Glob pattern restricting the walk
+            key_type: Redis type restricting the walk, None for any
+            ignore_case: Ignore ASCII case when matching
+            concurrency: Number of SCAN batches checked at the same time
+            max_hits: Number of hits after which the search stops
+            budget: Elements of a collection looked at per key and round-trip
+        """
+        self.client = client
+        self.needle = needle
+        self.match = match
+        self.key_type = key_type
+        self.ignore_case = ignore_case
+        self.concurrency = max(1, concurrency)
+        self.max_hits = max_hits
+        self.budget = budget
+        self.scanned = 0
+        self.checked = 0
+        self.hits = 0
+
+    async def run(self) -> AsyncIterator[List[ContentHit]]:
+        """Walk the namespace, yielding hits as batches finish.
+
+        Closing the iterator, or cancelling the task consuming it, stops
+        the walk and every check in flight.
+
+        Yields:
+            Non-empty lists of hits
+        """
+        self.scanned = 0
+        self.checked = 0
+        self.hits = 0
+        queue: asyncio.Queue = asyncio.Queue()
+        slots = asyncio.Semaphore(self.concurrency)
+        checks: Set[asyncio.Task] = set()
+        # SCAN may return a key more than once while the keyspace rehashes;
+        # only reported keys are remembered, bounded by max_hits
+        reported: Set[str] = set()
+
+        async def check(batch: List[str]) -> None:
+            try:
+                await queue.put(await self._check_batch(batch))
+            except Exception as e:
+                await queue.put(e)
+            finally:
+                slots.release()
+
+        async def feed() -> None:
+            try:
+                async for batch in self.client.scan_keys(match=self.match, key_type=self.key_type):
+                    self.scanned += len(batch)
+                    await slots.acquire()
+                    task = asyncio.create_task(check(batch))
+                    checks.add(task)
+                    task.add_done_callback(checks.discard)
+                await asyncio.gather(*checks)
+            except Exception as e:
+                await queue.put(e)
+            finally:
+                await queue.put(None)
+
+        feeder = asyncio.create_task(feed())
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                item = [hit for hit in item if hit.key not in reported]
+                if item:
+                    reported.update(hit.key for hit in item)
+                    self.hits += len(item)
+                    yield item
+                if self.hits >= self.max_hits:
+                    break
+        finally:
+            feeder.cancel()
+            for task in list(checks):
+                task.cancel()
+        logger.debug(f"Value search done: {self.scanned} keys scanned, {self.hits} hits")
+
+    async def _check_batch(self, keys: List[str]) -> List[ContentHit]:
+        """Check a batch of keys until each has a hit or is exhausted."""
+        throttle = self.client.throttle
+        cursors: Dict[str, int] = dict.fromkeys(keys, 0)
+        hits = []
+        while cursors:
+            await throttle.wait(len(cursors))
+            started = time.monotonic()
+            results = await self.client.search_values(
+                cursors, self.needle, ignore_case=self.ignore_case, budget=self.budget
+            )
+            throttle.record(time.monotonic() - started, len(cursors))
+            remaining = {}
+            for key, (cursor, key_type, excerpt) in results.items():
+                if excerpt is not None:
+                    hits.append(ContentHit(key, key_type, excerpt))
+                elif cursor:
+                    remaining[key] = cursor
+            cursors = remaining
+        self.checked += len(keys)
+        return hits
@@ -0,0 +1,285 @@
+"""
+Decoders for compressed and serialized values.
+
+This module provides a registry of decoders that recognize a value by its
+leading bytes (gzip, zlib, zstd, msgpack, pickle) and turn it into readable
+text, peeling nested layers such as gzip-compressed JSON. Decoding runs in
+a worker process through DecoderPool, so large payloads never block the
+Textual event loop. Pickles are disassembled, never unpickled.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Optional, Sequence, Union
+import asyncio
+import importlib
+import io
+import json
+import logging
+import multiprocessing
+import multiprocessing.pool
+import multiprocessing.resource_tracker
+import os
+import pickletools
+import threading
+import zlib
+
+logger = logging.getLogger(__name__)
+
+# Largest output a decoder may produce; anything beyond it is cut off
+DEFAULT_MAX_OUTPUT = 64 * 1024 * 1024
+
+# Values up to this size are formatted inline rather than in the pool
+INLINE_DECODE_LIMIT = 64 * 1024
+
+# Most encoding layers peeled off one value, e.g. zstd(msgpack)
+MAX_LAYERS = 4
+
+# Bytes a decoder's sniffer gets to look at
+SNIFF_BYTES = 16
+
+@dataclass
+class Decoder:
+    """A recognizable encoding and how to undo it.
+
+    ``decode`` receives the encoded bytes and the output limit. It returns
+    bytes when another layer may follow, text to show as is, or any other
+    object to show as JSON; it raises ValueError if the data turns out not
+    to be in its encoding.
+    """
+
+    name: str
+    matches: Callable[[bytes], bool]
+    decode: Callable[[bytes, int], Any]
+
+@dataclass
+class DecodedValue:
+    """Readable form of a value and the encodings removed to get it."""
+
+    # Text to display, or bytes if the innermost layer is not text
+    value: Union[str, bytes]
+    encodings: List[str] = field(default_factory=list)
+    is_json: bool = False
+    # Whether output was cut off at the size limit
+    truncated: bool = False
+
+DECODERS: List[Decoder] = []
+
+def register_decoder(decoder: Decoder) -> None:
+    """Add a decoder, replacing any registered under the same name.
+
+    Decoding runs in worker processes, so plugins should register their
+    decoders when imported and be passed to DecoderPool as ``plugins``.
+    """
+    DECODERS[:] = [existing for existing in DECODERS if existing.name != decoder.name]
+    DECODERS.append(decoder)
+
+def sniff(head: bytes) -> Optional[Decoder]:
+    """Get the first registered decoder recognizing a value's leading bytes."""
+    for decoder in DECODERS:
+        if decoder.matches(head[:SNIFF_BYTES]):
+            return decoder
+    return None
+
+def _inflate(data: bytes, limit: int, wbits: int) -> bytes:
+    """Decompress gzip or zlib data, stopping at the output limit."""
+    try:
+        inflater = zlib.decompressobj(wbits=wbits)
+        return inflater.decompress(data, limit)
+    except zlib.error as e:
+        raise ValueError(str(e)) from e
+
+def _disassemble_pickle(data: bytes, limit: int) -> str:
+    """List a pickle's opcodes without executing it."""
+    output = io.StringIO()
+    try:
+        pickletools.dis(data, out=output)
+    except Exception as e:
+        output.write(f"\n<disassembly stopped: {e}>")
+    return output.getvalue()[:limit]
+
+register_decoder(Decoder("gzip", lambda head: head[:2] == b"\x1f\x8b", lambda data, limit: _inflate(data, limit, 31)))
+register_decoder(Decoder(
+    "zlib",
+    lambda head: len(head) >= 2 and head[0] == 0x78 and (head[0] << 8 | head[1]) % 31 == 0,
+    lambda data, limit: _inflate(data, limit, 15)
+))
+register_decoder(Decoder(
+    "pickle",
+    lambda head: len(head) >= 2 and head[0] == 0x80 and 2 <= head[1] <= 5,
+    _disassemble_pickle
+))
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+if zstandard is not None:
+    def _decompress_zstd(data: bytes, limit: int) -> bytes:
+        try:
+            with zstandard.ZstdDecompressor().stream_reader(io.BytesIO(data)) as reader:
+                return reader.read(limit)
+        except zstandard.ZstdError as e:
+            raise ValueError(str(e)) from e
+
+    register_decoder(Decoder("zstd", lambda head: head[:4] == b"\x28\xb5\x2f\xfd", _decompress_zstd))
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+if msgpack is not None:
+    def _unpack_msgpack(data: bytes, limit: int) -> Any:
+        try:
+            return msgpack.unpackb(data, raw=False, strict_map_key=False, max_bin_len=limit, max_str_len=limit)
+        except Exception as e:
+            raise ValueError(str(e)) from e
+
+    # msgpack has no magic number; only maps and arrays are tried, whose
+    # leading bytes cannot start a UTF-8 string.
+    register_decoder(Decoder(
+        "msgpack",
+        lambda head: bool(head) and (0x80 <= head[0] <= 0x9f or head[0] in (0xdc, 0xdd, 0xde, 0xdf)),
+        _unpack_msgpack
+    ))
+
+def decode_value(data: Union[str, bytes], max_output: int = DEFAULT_MAX_OUTPUT) -> DecodedValue:
+    """Peel encoding layers off a value and format the result.
+
+    Pure and picklable, so it can run in a worker process.
+
+    Args:
+        data: Raw value
+        max_output: Largest output any single layer may produce
+
+    Returns:
+        The decoded value; text that is valid JSON is pretty-printed
+    """
+    result = DecodedValue(value=data)
+    decoded: Any = data
+    for _ in range(MAX_LAYERS):
+        if not isinstance(decoded, bytes):
+            break
+        decoder = sniff(decoded)
+        if decoder is None:
+            break
+        try:
+            output = decoder.decode(decoded, max_output)
+        except ValueError as e:
+            logger.debug(f"Value looked like {decoder.name} but did not decode: {e}")
+            break
+        result.encodings.append(decoder.name)
+        if isinstance(output, bytes) and len(output) >= max_output:
+            result.truncated = True
+        decoded = output
+
+    if isinstance(decoded, bytes):
+        try:
+            decoded = decoded.decode("utf-8")
+        except UnicodeDecodeError:
+            result.value = decoded
+            return result
+    if isinstance(decoded, str):
+        try:
+            decoded = json.loads(decoded)
+        except ValueError:
+            result.value = decoded
+            return result
+    result.value = json.dumps(decoded, indent=2, ensure_ascii=False, default=repr)
+    result.is_json = True
+    return result
+
+def _load_plugins(plugins: Sequence[str]) -> None:
+    """Import modules that register extra decoders."""
+    for plugin in plugins:
+        importlib.import_module(plugin)
+
+class DecoderPool:
+    """Runs decode_value in a worker process, off the event loop.
+
+    Workers start on first use and are kept warm between decodes. A decode
+    cancelled while still running terminates its worker, so a superseded
+    payload stops using CPU at once, and a replacement is started right
+    away so the next decode does not wait for it.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 1,
+        max_output: int = DEFAULT_MAX_OUTPUT,
+        plugins: Sequence[str] = ()
+    ) -> None:
+        """Initialize the pool; the worker processes start on first use.
+
+        Args:
+            max_workers: Number of worker processes
+            max_output: Largest output any single layer may produce
+            plugins: Modules registering extra decoders, imported here and
+                in every worker
+        """
+        self.max_workers = max_workers
+        self.max_output = max_output
+        self.plugins = tuple(plugins)
+        _load_plugins(self.plugins)
+        if os.name == "posix":
+            # Worker processes need the resource tracker, which cannot start
+            # once Textual has replaced sys.stderr with a capture object
+            multiprocessing.resource_tracker.ensure_running()
+        self._pool: Optional[multiprocessing.pool.Pool] = None
+
+    def _start(self) -> multiprocessing.pool.Pool:
+        """Start a set of worker processes."""
+        return multiprocessing.get_context("spawn").Pool(
+            self.max_workers,
+            initializer=_load_plugins,
+            initargs=(self.plugins,)
+        )
+
+    async def decode(self, data: Union[str, bytes]) -> DecodedValue:
+        """Decode a value in the pool.
+
+        Args:
+            data: Raw value
+
+        Returns:
+            The decoded value
+        """
+        if self._pool is None:
+            self._pool = self._start()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def settle(outcome: Any, failed: bool = False) -> None:
+            if not future.done():
+                if failed:
+                    future.set_exception(outcome)
+                else:
+                    future.set_result(outcome)
+
+        self._pool.apply_async(
+            decode_value,
+            (data, self.max_output),
+            callback=lambda result: loop.call_soon_threadsafe(settle, result),
+            error_callback=lambda error: loop.call_soon_threadsafe(settle, error, True)
+        )
+        try:
+            return await future
+        except asyncio.CancelledError:
+            # The worker is still busy with a value nobody wants any more
+            self._terminate()
+            self._pool = self._start()
+            raise
+
+    def _terminate(self) -> None:
+        """Kill the worker processes, reaping them in a thread."""
+        if self._pool is not None:
+            pool = self._pool
+            self._pool = None
+            threading.Thread(target=pool.terminate, daemon=True).start()
+
+    def close(self) -> None:
+        """Stop the worker processes without waiting for running decodes."""
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool = None
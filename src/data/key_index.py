@@ -0,0 +1,257 @@
+"""
+In-memory prefix index over Redis key names.
+
+This module provides a trie over separator-delimited key segments. Every
+node tracks how many keys live at or below it, so the key tree can show
+namespace sizes and build children on demand without holding a widget
+per key.
+"""
+
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+DEFAULT_SEPARATOR = ":"
+
+class PrefixNode:
+    """A single key segment in the prefix index."""
+
+    __slots__ = (
+        "name", "parent", "children", "key", "key_type", "metadata", "count", "generation", "pending"
+    )
+
+    def __init__(self, name: str, parent: Optional["PrefixNode"] = None) -> None:
+        """Initialize a prefix node.
+
+        Args:
+            name: Key segment this node represents
+            parent: Parent node, None for the root
+        """
+        self.name = name
+        self.parent = parent
+        self.children: Dict[str, PrefixNode] = {}
+        self.key: Optional[str] = None
+        # Redis type of the key, cached once it is known
+        self.key_type: Optional[str] = None
+        # KeyMetadata for the key, once fetched for display
+        self.metadata: Optional[Any] = None
+        self.count = 0
+        # Keys counted below this node by a summary but not indexed yet
+        self.pending = 0
+        # Sweep generation in which the key was last added or re-added
+        self.generation = 0
+
+    @property
+    def is_key(self) -> bool:
+        """Whether a Redis key ends at this node."""
+        return self.key is not None
+
+    @property
+    def is_folder(self) -> bool:
+        """Whether keys live below this node, indexed or only summarized."""
+        return bool(self.children) or self.pending > 0
+
+    @property
+    def path(self) -> List[str]:
+        """Segments from the root down to this node."""
+        segments = []
+        node = self
+        while node.parent is not None:
+            segments.append(node.name)
+            node = node.parent
+        segments.reverse()
+        return segments
+
+    @property
+    def lineage(self) -> List["PrefixNode"]:
+        """Nodes from the root down to and including this node."""
+        nodes = []
+        node = self
+        while node is not None:
+            nodes.append(node)
+            node = node.parent
+        nodes.reverse()
+        return nodes
+
+    def __repr__(self) -> str:
+        return f"PrefixNode({self.name!r}, count={self.count})"
+
+class KeyIndex:
+    """Trie of Redis keys split on a separator, with per-node key counts."""
+
+    def __init__(self, separator: str = DEFAULT_SEPARATOR) -> None:
+        """Initialize an empty index.
+
+        Args:
+            separator: Segment separator used to split key names
+        """
+        self.separator = separator
+        self.root = PrefixNode("")
+        self.generation = 0
+
+    def __len__(self) -> int:
+        return self.root.count
+
+    def __contains__(self, key: str) -> bool:
+        return self.find(key) is not None
+
+    def add(self, key: str) -> Optional[PrefixNode]:
+        """Add a key to the index.
+
+        Args:
+            key: Redis key
+
+        Returns:
+            The node holding the key, or None if it was already indexed
+        """
+        node = self.root
+        for segment in key.split(self.separator):
+            child = node.children.get(segment)
+            if child is None:
+                child = node.children[segment] = PrefixNode(segment, node)
+            node = child
+        node.generation = self.generation
+        if node.key is not None:
+            return None
+        node.key = key
+        current = node
+        while current is not None:
+            current.count += 1
+            current = current.parent
+        return node
+
+    def add_many(self, keys: Iterable[str]) -> List[PrefixNode]:
+        """Add keys to the index, returning the nodes of newly added keys."""
+        added = []
+        for key in keys:
+            node = self.add(key)
+            if node is not None:
+                added.append(node)
+        return added
+
+    def add_summary(self, prefix: str, count: int) -> PrefixNode:
+        """Count keys below a prefix without indexing them individually.
+
+        The counts propagate up like real keys, so folders show their size
+        before their contents are loaded.
+
+        Args:
+            prefix: Key prefix, without trailing separator
+            count: Number of keys below the prefix
+
+        Returns:
+            The node for the prefix
+        """
+        node = self.root
+        for segment in prefix.split(self.separator):
+            child = node.children.get(segment)
+            if child is None:
+                child = node.children[segment] = PrefixNode(segment, node)
+            node = child
+        node.pending += count
+        current = node
+        while current is not None:
+            current.count += count
+            current = current.parent
+        return node
+
+    def settle(self, node: PrefixNode, count: Optional[int] = None) -> int:
+        """Take summarized keys off a node as its contents are loaded.
+
+        Nodes left without keys are pruned as in ``remove``.
+
+        Args:
+            node: Node with pending summarized keys
+            count: Number of keys now indexed or summarized further down,
+                None to drop all of the node's pending keys
+
+        Returns:
+            Number of pending keys taken off
+        """
+        settled = node.pending if count is None else min(count, node.pending)
+        if not settled:
+            return 0
+        node.pending -= settled
+        current = node
+        while current is not None:
+            current.count -= settled
+            if current.count == 0 and current.parent is not None:
+                current.parent.children.pop(current.name, None)
+            current = current.parent
+        return settled
+
+    def remove(self, key: str) -> Optional[PrefixNode]:
+        """Remove a key from the index.
+
+        Nodes left without keys are pruned; a pruned node keeps its
+        ``parent`` link but has a count of zero.
+
+        Args:
+            key: Redis key
+
+        Returns:
+            The node that held the key, or None if it was not indexed
+        """
+        node = self.find(key)
+        if node is None:
+            return None
+        node.key = None
+        node.key_type = None
+        node.metadata = None
+        current = node
+        while current is not None:
+            current.count -= 1
+            if current.count == 0 and current.parent is not None:
+                del current.parent.children[current.name]
+            current = current.parent
+        return node
+
+    def begin_sweep(self) -> None:
+        """Start a mark-and-sweep pass.
+
+        Every key added (or re-added) after this call is marked as seen;
+        ``stale_keys`` then returns the keys that were not.
+        """
+        self.generation += 1
+
+    def stale_keys(self) -> List[str]:
+        """Get keys not added since the last ``begin_sweep``."""
+        stale = []
+        stack = [self.root]
+        while stack:
+            current = stack.pop()
+            if current.key is not None and current.generation != self.generation:
+                stale.append(current.key)
+            stack.extend(current.children.values())
+        return stale
+
+    def find(self, key: str) -> Optional[PrefixNode]:
+        """Get the node holding a key, or None if it is not indexed."""
+        node = self.node(key.split(self.separator))
+        if node is None or node.key is None:
+            return None
+        return node
+
+    def node(self, path: Sequence[str]) -> Optional[PrefixNode]:
+        """Get the node at a segment path, or None if it does not exist."""
+        node = self.root
+        for segment in path:
+            node = node.children.get(segment)
+            if node is None:
+                return None
+        return node
+
+    def prefix(self, node: PrefixNode) -> str:
+        """Get the key prefix a node represents, without trailing separator."""
+        return self.separator.join(node.path)
+
+    def keys(self, node: Optional[PrefixNode] = None) -> Iterator[str]:
+        """Iterate over all keys at or below a node (the root by default)."""
+        stack = [node or self.root]
+        while stack:
+            current = stack.pop()
+            if current.key is not None:
+                yield current.key
+            stack.extend(current.children.values())
+
+    def clear(self) -> None:
+        """Remove all keys from the index."""
+        self.root = PrefixNode("")
@@ -5,13 +5,317 @@ This module provides a wrapper around the Redis client with
 async support and error handling.
 """
 
-from typing import Any, Dict, List, Optional, Tuple
+from dataclasses import dataclass, replace
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
 import redis.asyncio as redis
+from redis.asyncio.sentinel import Sentinel
+from redis.client import NEVER_DECODE
+from redis.exceptions import NoScriptError, ResponseError
+import asyncio
+import hashlib
 import json
 import logging
+import string
+import time
+
+from .decoders import sniff
+from .throttle import DEFAULT_TARGET_LATENCY, ScanThrottle
+from .value_cache import ValueCache
 
 logger = logging.getLogger(__name__)
 
+# Default COUNT hint for SCAN. Large enough to keep round-trips low, small
+# enough that a single SCAN call never stalls the server.
+DEFAULT_SCAN_COUNT = 1000
+
+# Default lifetime of cached entries when keyspace notifications are not
+# available to invalidate them.
+DEFAULT_CACHE_TTL = 2.0
+
+# Keyspace notification flags needed to see every write: K (keyspace
+# channel) plus A, or every individual event class A stands for.
+KEYSPACE_FLAGS = "g$lshzxe"
+
+# Keyspace events after which the key no longer exists in this database.
+# Every other event (set, hset, expire, rename_to, ...) implies it does.
+KEY_REMOVED_EVENTS = frozenset({"del", "expired", "evicted", "rename_from", "move_from"})
+
+# Callback receiving (key, event) for each keyspace notification
+KeyspaceListener = Callable[[str, str], None]
+
+# Default number of elements fetched per page of a collection value.
+DEFAULT_PAGE_SIZE = 500
+
+# Commands returning the element count of each collection type.
+LENGTH_COMMANDS = {
+    "list": "LLEN",
+    "hash": "HLEN",
+    "set": "SCARD",
+    "zset": "ZCARD",
+}
+
+COLLECTION_TYPES = frozenset(LENGTH_COMMANDS)
+
+# Strings longer than this are read in GETRANGE chunks of this many bytes
+# instead of with a single GET.
+DEFAULT_PREVIEW_BYTES = 64 * 1024
+
+# Largest compressed or serialized string fetched whole to be decoded
+DEFAULT_MAX_DECODE_BYTES = 64 * 1024 * 1024
+
+@dataclass
+class ValuePage:
+    """A window of elements from a collection value, or a chunk of a string.
+    
+    Items are members for lists and sets, ``(field, value)`` pairs for
+    hashes and ``(member, score)`` pairs for sorted sets. A string chunk
+    is a single item of text, with the cursor being a byte offset.
+    """
+    
+    key_type: str
+    items: List[Any]
+    # Cursor to pass to get_page for the next window, 0 once exhausted
+    cursor: int
+    # Total element count, only filled in for the first page
+    total: Optional[int] = None
+    
+    @property
+    def done(self) -> bool:
+        """Whether this is the last page."""
+        return self.cursor == 0
+        
+    def to_json(self) -> str:
+        """Format the page as indented JSON."""
+        if self.key_type in ("hash", "zset"):
+            return json.dumps(dict(self.items), indent=2)
+        return json.dumps(self.items, indent=2)
+
+@dataclass
+class KeyMetadata:
+    """Type, expiry and storage details of a key."""
+    
+    key_type: str
+    # Seconds until expiry, -1 if the key does not expire
+    ttl: int
+    # Internal encoding from OBJECT ENCODING, None if unavailable
+    encoding: Optional[str] = None
+    # Bytes reported by MEMORY USAGE, None if unavailable
+    memory: Optional[int] = None
+
+@dataclass
+class KeySize:
+    """Memory footprint and length of a key."""
+    
+    key_type: str
+    # Bytes reported by MEMORY USAGE, None if unavailable
+    memory: Optional[int]
+    # Element count for collections, bytes for strings
+    length: int
+
+@dataclass
+class KeyValue:
+    """A key's raw value together with its type, size and TTL.
+    
+    Strings hold their first chunk, which is the whole value unless it is
+    longer than the client's preview size. Collections hold the items of
+    their first page. In both cases ``cursor`` points at what follows.
+    """
+    
+    key: str
+    key_type: str
+    value: Any
+    # Length in bytes for strings, element count for collections
+    size: int
+    # Seconds until expiry, -1 if the key does not expire
+    ttl: int
+    cursor: int = 0
+    # Name of the decoder recognizing a string's leading bytes, in which
+    # case ``value`` holds the whole raw value for decoding
+    encoding: Optional[str] = None
+    
+    def first_page(self) -> ValuePage:
+        """Get the loaded items of a collection value as a page."""
+        items = [self.value] if self.key_type == "string" else self.value
+        return ValuePage(
+            key_type=self.key_type, items=items, cursor=self.cursor, total=self.size
+        )
+
+# Server-side namespace counting. Runs SCAN until roughly ARGV[2] keys have
+# been walked, whether or not they matched, and returns {cursor, {prefix, count, ...}, {key, ...}}: keys
+# with more than ARGV[4] segments are counted under their prefix of that
+# many segments, shorter keys are returned by name.
+NAMESPACE_COUNT_SCRIPT = """
+local cursor = ARGV[1]
+local budget = tonumber(ARGV[2])
+local separator = ARGV[3]
+local depth = tonumber(ARGV[4])
+local match = ARGV[5]
+local key_type = ARGV[6]
+local under = ARGV[7]
+local counts = {}
+local keys = {}
+local visited = 0
+repeat
+    local reply = redis.call('SCAN', cursor, 'MATCH', match, 'COUNT', budget)
+    cursor = reply[1]
+    for _, key in ipairs(reply[2]) do
+        if string.sub(key, 1, #under) == under
+            and (key_type == '' or redis.call('TYPE', key).ok == key_type) then
+            local position = 0
+            for _ = 1, depth do
+                position = string.find(key, separator, position + 1, true)
+                if not position then break end
+            end
+            if position then
+                local prefix = string.sub(key, 1, position - 1)
+                counts[prefix] = (counts[prefix] or 0) + 1
+            else
+                keys[#keys + 1] = key
+            end
+        end
+    end
+    -- COUNT bounds the work of a call, not its matches, so a sparse MATCH
+    -- must not keep the script walking the whole keyspace
+    visited = visited + math.max(#reply[2], budget)
+until cursor == '0' or visited >= budget
+local flat = {}
+for prefix, count in pairs(counts) do
+    flat[#flat + 1] = prefix
+    flat[#flat + 1] = count
+end
+return {cursor, flat, keys}
+"""
+
+# Checks one bounded slice of a value for a substring, so a single call
+# never blocks the server for long. KEYS[1] is the key; ARGV is the needle,
+# the glob-escaped needle for SSCAN/ZSCAN MATCH, the cursor (a byte offset
+# for strings, an index for lists), elements per call, bytes per string
+# window and whether to ignore ASCII case. Returns {next cursor or 0, type,
+# excerpt of the first hit or false}.
+VALUE_SEARCH_SCRIPT = """
+local key = KEYS[1]
+local needle = ARGV[1]
+local pattern = ARGV[2]
+local cursor = ARGV[3]
+local budget = tonumber(ARGV[4])
+local window = tonumber(ARGV[5])
+local fold = ARGV[6] == '1'
+local key_type = redis.call('TYPE', key).ok
+local function find(text, label)
+    local haystack = fold and string.lower(text) or text
+    local at = string.find(haystack, needle, 1, true)
+    if not at then return nil end
+    local first = math.max(1, at - 40)
+    return label .. string.sub(text, first, at + #needle + 40)
+end
+local hit = nil
+if key_type == 'string' then
+    local offset = tonumber(cursor)
+    hit = find(redis.call('GETRANGE', key, offset, offset + window + #needle - 2), '')
+    cursor = offset + window
+    if cursor >= redis.call('STRLEN', key) then cursor = 0 end
+elseif key_type == 'list' then
+    local offset = tonumber(cursor)
+    local items = redis.call('LRANGE', key, offset, offset + budget - 1)
+    for index, item in ipairs(items) do
+        hit = find(item, '[' .. (offset + index - 1) .. '] ')
+        if hit then break end
+    end
+    cursor = #items < budget and 0 or offset + budget
+elseif key_type == 'hash' then
+    local reply = redis.call('HSCAN', key, cursor, 'COUNT', budget)
+    cursor = reply[1]
+    for index = 1, #reply[2], 2 do
+        local field, value = reply[2][index], reply[2][index + 1]
+        hit = find(field, '') or find(value, field .. ' = ')
+        if hit then break end
+    end
+elseif key_type == 'set' or key_type == 'zset' then
+    local command = key_type == 'set' and 'SSCAN' or 'ZSCAN'
+    local step = key_type == 'set' and 1 or 2
+    local reply
+    if fold then
+        reply = redis.call(command, key, cursor, 'COUNT', budget)
+    else
+        reply = redis.call(command, key, cursor, 'MATCH', pattern, 'COUNT', budget)
+    end
+    cursor = reply[1]
+    for index = 1, #reply[2], step do
+        hit = find(reply[2][index], '')
+        if hit then break end
+    end
+else
+    cursor = 0
+end
+return {tostring(cursor), key_type, hit or false}
+"""
+
+VALUE_SEARCH_SHA = hashlib.sha1(VALUE_SEARCH_SCRIPT.encode()).hexdigest()
+
+# Folds the needle the way the script's string.lower folds values: A-Z only
+ASCII_LOWERCASE = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+@dataclass
+class NamespaceSlice:
+    """Namespace counts from one bounded slice of a server-side SCAN."""
+    
+    # Cursor to pass to count_namespaces for the next slice, 0 once done
+    cursor: int
+    # Prefix at the requested depth -> number of keys below it
+    prefixes: Dict[str, int]
+    # Keys with no more segments than the requested depth
+    keys: List[str]
+    
+    @property
+    def done(self) -> bool:
+        """Whether this is the last slice."""
+        return self.cursor == 0
+
+def escape_glob(text: str) -> str:
+    """Escape glob metacharacters so text matches literally in SCAN MATCH."""
+    return "".join("\\" + char if char in "*?[]\\" else char for char in text)
+
+# Cluster namespace cursors pack the shard index above the shard's own
+# 64-bit SCAN cursor, so a single integer resumes a walk over every shard.
+SHARD_CURSOR_SPAN = 1 << 64
+
+# Connection pool sizes of the interactive and background lanes
+DEFAULT_INTERACTIVE_CONNECTIONS = 4
+DEFAULT_BACKGROUND_CONNECTIONS = 2
+
+# Approximate bytes held by one cached KeyMetadata
+METADATA_SIZE = 200
+
+def _remaining_ttl(ttl: int, age: float) -> int:
+    """Count a cached TTL down by the age of the cache entry."""
+    if ttl < 0:
+        return ttl
+    return max(0, ttl - int(age))
+
+def _decode_chunk(data: bytes, final: bool) -> Tuple[str, int]:
+    """Decode a chunk of a UTF-8 string read with GETRANGE.
+    
+    A multi-byte character cut off at the end of a non-final chunk is left
+    for the next chunk; invalid bytes are replaced.
+    
+    Returns:
+        The text and the number of bytes it was decoded from
+    """
+    try:
+        return data.decode("utf-8"), len(data)
+    except UnicodeDecodeError as e:
+        if not final and e.reason == "unexpected end of data" and e.start > 0:
+            return data[:e.start].decode("utf-8", errors="replace"), e.start
+        return data.decode("utf-8", errors="replace"), len(data)
+
+def _estimate_size(value: Any) -> int:
+    """Approximate the memory held by a raw value, in bytes."""
+    if isinstance(value, (str, bytes)):
+        return len(value) + 50
+    if isinstance(value, (list, tuple)):
+        return sum(_estimate_size(item) for item in value) + 8 * len(value) + 50
+    return 50
+
 class RedisClient:
     """Wrapper for Redis client operations."""
     
@@ -20,7 +324,24 @@ class RedisClient:
         host: str = "localhost",
         port: int = 6379,
         db: int = 0,
-        password: Optional[str] = None
+        password: Optional[str] = None,
+        scan_count: int = DEFAULT_SCAN_COUNT,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        cache_entries: int = 0,
+        cache_bytes: int = 64 * 1024 * 1024,
+        cache_ttl: float = DEFAULT_CACHE_TTL,
+        scan_latency: Optional[float] = DEFAULT_TARGET_LATENCY,
+        scan_rate: Optional[float] = None,
+        cluster: bool = False,
+        read_from_replicas: bool = False,
+        replica: Optional[Tuple[str, int]] = None,
+        sentinels: Optional[List[Tuple[str, int]]] = None,
+        service_name: str = "mymaster",
+        interactive_connections: int = DEFAULT_INTERACTIVE_CONNECTIONS,
+        background_connections: int = DEFAULT_BACKGROUND_CONNECTIONS,
+        preview_bytes: int = DEFAULT_PREVIEW_BYTES,
+        binary: bool = False,
+        max_decode_bytes: int = DEFAULT_MAX_DECODE_BYTES
     ) -> None:
         """Initialize Redis client.
         
@@ -29,40 +350,624 @@ class RedisClient:
             port: Redis port
             db: Redis database number
             password: Optional Redis password
+            scan_count: Initial COUNT hint passed to each SCAN call
+            page_size: Number of elements fetched per collection page
+            cache_entries: Maximum number of keys with cached values and
+                metadata, 0 disables the cache
+            cache_bytes: Maximum approximate size of cached data
+            cache_ttl: Lifetime of cached entries when keyspace
+                notifications cannot be relied on to invalidate them
+            scan_latency: Server time per SCAN call that keyspace walks
+                adapt COUNT to, None to keep ``scan_count`` fixed
+            scan_rate: Maximum keys per second visited by keyspace walks,
+                None for no limit
+            cluster: Connect to a Redis Cluster through this node; keys
+                are scanned on every shard concurrently and commands are
+                routed by slot
+            read_from_replicas: Scan and read from replicas instead of the
+                primary: one replica per shard in cluster mode, a replica
+                discovered through Sentinel otherwise
+            replica: Host and port of a replica that serves every read
+                while writes go to ``host``
+            sentinels: Sentinel addresses used to discover the primary
+                (and replicas) instead of connecting to ``host``
+            service_name: Name of the Sentinel-monitored primary
+            interactive_connections: Size of the connection pool for reads
+                and writes triggered by the user
+            background_connections: Size of the connection pool for
+                background walks, and the number of background commands
+                in flight per server
+            preview_bytes: Size of the first chunk read from a string, and
+                of every further chunk
+            binary: Keep string values as bytes instead of decoding them,
+                and carry undecodable bytes in key names and collection
+                elements as surrogate escapes so they round-trip unchanged
+            max_decode_bytes: Largest compressed or serialized string that
+                is fetched whole so it can be decoded
         """
-        self.client = redis.Redis(
+        self.db = db
+        self.scan_count = scan_count
+        self.throttle = ScanThrottle(scan_count, target_latency=scan_latency, max_rate=scan_rate)
+        self.page_size = page_size
+        self.preview_bytes = preview_bytes
+        self.binary = binary
+        self.max_decode_bytes = max_decode_bytes
+        self.encoding_errors = "surrogateescape" if binary else "strict"
+        self.cache_ttl = cache_ttl
+        self.cache = ValueCache(cache_entries, cache_bytes, ttl=cache_ttl) if cache_entries > 0 else None
+        self._keyspace_listeners: List[KeyspaceListener] = []
+        self._keyspace_task: Optional[asyncio.Task] = None
+        self.password = password
+        self.cluster = cluster
+        self.read_from_replicas = read_from_replicas
+        # Whether interactive reads may be served by a lagging replica
+        self.replica_reads = read_from_replicas or replica is not None
+        self.background_connections = background_connections
+        # Per-server limits on concurrent background round-trips
+        self._background_slots: Dict[str, asyncio.Semaphore] = {}
+        
+        # Interactive reads, background walks and writes use separate pools
+        # so a long scan never queues ahead of the value the user clicked.
+        # ``reader`` serves interactive reads and ``background`` serves
+        # discovery, analysis and counting; both may point at replicas.
+        # Writes and keyspace subscriptions always use the primary in
+        # ``client``.
+        if cluster:
+            self.client = redis.RedisCluster(
+                host=host,
+                port=port,
+                password=password,
+                read_from_replicas=read_from_replicas,
+                decode_responses=True,
+                encoding_errors=self.encoding_errors
+            )
+            self.reader = self.client
+            self.background = redis.RedisCluster(
+                host=host,
+                port=port,
+                password=password,
+                read_from_replicas=read_from_replicas,
+                decode_responses=True,
+                encoding_errors=self.encoding_errors
+            )
+        elif sentinels:
+            sentinel = Sentinel(sentinels, sentinel_kwargs={"password": password} if password else None)
+            self.client = sentinel.master_for(
+                service_name, db=db, password=password, decode_responses=True,
+                encoding_errors=self.encoding_errors, max_connections=interactive_connections
+            )
+            self.reader = sentinel.slave_for(
+                service_name, db=db, password=password, decode_responses=True,
+                encoding_errors=self.encoding_errors, max_connections=interactive_connections
+            ) if read_from_replicas else self.client
+            connect = sentinel.slave_for if read_from_replicas else sentinel.master_for
+            self.background = connect(
+                service_name, db=db, password=password, decode_responses=True,
+                encoding_errors=self.encoding_errors, max_connections=background_connections
+            )
+        else:
+            self.client = self._connect(host, port, interactive_connections)
+            read_host, read_port = replica or (host, port)
+            self.reader = self._connect(read_host, read_port, interactive_connections) if replica else self.client
+            self.background = self._connect(read_host, read_port, background_connections)
+        # Registered on first use of count_namespaces
+        self._namespace_script = None
+        # Whether the server accepts SCAN TYPE (Redis 6+), None until tried
+        self._scan_type: Optional[bool] = None
+        # Direct connections to each cluster node, for keyspace notifications
+        self._node_clients: List[redis.Redis] = []
+        
+    def _connect(self, host: str, port: int, max_connections: int) -> redis.Redis:
+        """Open a client whose pool waits for a free connection when full."""
+        pool = redis.BlockingConnectionPool(
             host=host,
             port=port,
-            db=db,
-            password=password,
-            decode_responses=True
+            db=self.db,
+            password=self.password,
+            decode_responses=True,
+            encoding_errors=self.encoding_errors,
+            max_connections=max_connections,
+            timeout=None
+        )
+        return redis.Redis(connection_pool=pool)
+        
+    def _background_slot(self, server: str = "") -> asyncio.Semaphore:
+        """Get the semaphore bounding background commands sent to a server."""
+        slot = self._background_slots.get(server)
+        if slot is None:
+            slot = self._background_slots[server] = asyncio.Semaphore(self.background_connections)
+        return slot
+        
+    async def _scan_nodes(self) -> list:
+        """Get the background lane's cluster nodes, one per shard, in a stable order."""
+        await self.background.initialize()
+        if not self.read_from_replicas:
+            return sorted(self.background.get_primaries(), key=lambda node: node.name)
+        shards = {}
+        for nodes in self.background.nodes_manager.slots_cache.values():
+            shards.setdefault(nodes[0].name, nodes[1] if len(nodes) > 1 else nodes[0])
+        return sorted(shards.values(), key=lambda node: node.name)
+        
+    async def _notification_clients(self) -> List[redis.Redis]:
+        """Get one connection per server that publishes keyspace events."""
+        if not self.cluster:
+            return [self.client]
+        if not self._node_clients:
+            self._node_clients = [
+                redis.Redis(
+                    host=node.host, port=node.port, password=self.password,
+                    decode_responses=True, encoding_errors=self.encoding_errors
+                )
+                for node in await self._scan_nodes()
+            ]
+        return self._node_clients
+        
+    async def keyspace_notifications_enabled(self) -> Optional[bool]:
+        """Check whether the server publishes keyspace events for all writes.
+        
+        Returns:
+            True or False from CONFIG GET notify-keyspace-events, or None
+            if the server does not allow CONFIG
+        """
+        try:
+            client = (await self._notification_clients())[0]
+            config = await client.config_get("notify-keyspace-events")
+        except ResponseError:
+            return None
+        flags = config.get("notify-keyspace-events", "")
+        return "K" in flags and ("A" in flags or all(flag in flags for flag in KEYSPACE_FLAGS))
+        
+    async def start_cache_invalidation(self) -> None:
+        """Invalidate cached keys from keyspace notifications.
+        
+        While notifications are known to be enabled, cached entries live
+        until they are evicted or invalidated. Otherwise they expire after
+        ``cache_ttl`` seconds. They also expire when reads go to a replica:
+        notifications come from the primary, so the value re-read right
+        after one may not have replicated yet.
+        """
+        if self.cache is None:
+            return
+        enabled = await self.keyspace_notifications_enabled()
+        if enabled is False:
+            logger.info("Keyspace notifications disabled, cache entries expire by TTL")
+            return
+        self.add_keyspace_listener(self._invalidate_cached)
+        if enabled and not self.replica_reads:
+            self.cache.ttl = None
+            
+    def _invalidate_cached(self, key: str, event: str) -> None:
+        """Keyspace listener dropping cached data for a changed key."""
+        self.cache.invalidate(key)
+        
+    def add_keyspace_listener(self, listener: KeyspaceListener) -> None:
+        """Register a callback for keyspace notifications of this database.
+        
+        All listeners share a single pub/sub subscription, which is started
+        with the first listener.
+        """
+        self._keyspace_listeners.append(listener)
+        if self._keyspace_task is None:
+            self._keyspace_task = asyncio.create_task(self._listen_keyspace())
+            
+    def remove_keyspace_listener(self, listener: KeyspaceListener) -> None:
+        """Unregister a keyspace notification callback."""
+        if listener in self._keyspace_listeners:
+            self._keyspace_listeners.remove(listener)
+            
+    async def _listen_keyspace(self) -> None:
+        """Dispatch ``__keyspace@<db>__`` messages to registered listeners.
+        
+        Notifications are local to each server, so in cluster mode every
+        shard is subscribed to.
+        """
+        tasks = []
+        try:
+            clients = await self._notification_clients()
+            tasks = [asyncio.create_task(self._listen_server(client)) for client in clients]
+            await asyncio.gather(*tasks)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Keyspace subscription failed: {e}", exc_info=True)
+            # Without notifications cached data can no longer be trusted
+            if self.cache is not None:
+                self.cache.clear()
+                self.cache.ttl = self.cache_ttl
+        finally:
+            self._keyspace_task = None
+            for task in tasks:
+                task.cancel()
+                
+    async def _listen_server(self, client: redis.Redis) -> None:
+        """Forward keyspace messages from one server to the listeners."""
+        prefix = f"__keyspace@{self.db}__:"
+        pubsub = client.pubsub()
+        try:
+            await pubsub.psubscribe(prefix + "*")
+            async for message in pubsub.listen():
+                if message["type"] != "pmessage":
+                    continue
+                key = message["channel"][len(prefix):]
+                for listener in list(self._keyspace_listeners):
+                    listener(key, message["data"])
+        finally:
+            await pubsub.reset()
+        
+    async def scan_keys(
+        self,
+        match: str = "*",
+        count: Optional[int] = None,
+        key_type: Optional[str] = None
+    ) -> AsyncIterator[List[str]]:
+        """Incrementally discover keys with SCAN.
+        
+        Calls run on the background lane and are paced by ``throttle``,
+        which also adapts the COUNT hint to the measured latency unless a
+        fixed count is given. Both filters are applied on the server, so
+        keys they exclude never cross the network.
+        
+        Args:
+            match: Glob-style pattern passed as SCAN MATCH
+            count: Fixed COUNT hint per SCAN call, adaptive by default
+            key_type: Only yield keys of this Redis type, using SCAN TYPE or,
+                on servers older than 6.0, a pipelined TYPE per key
+            
+        Yields:
+            Non-empty batches of keys, one per SCAN round-trip
+        """
+        if self.cluster:
+            async for batch in self._scan_shards(match, count, key_type):
+                yield batch
+            return
+        cursor = 0
+        while True:
+            cursor, batch = await self.scan_slice(cursor, match, count, key_type)
+            if batch:
+                yield batch
+            if cursor == 0:
+                break
+        
+    async def scan_slice(
+        self,
+        cursor: int = 0,
+        match: str = "*",
+        count: Optional[int] = None,
+        key_type: Optional[str] = None
+    ) -> Tuple[int, List[str]]:
+        """Run one throttled SCAN call, returning the cursor to the caller.
+        
+        Walks that must survive being stopped keep the cursor and resume
+        from it later. In cluster mode shards are walked one after another,
+        with the shard index packed into the cursor as in count_namespaces.
+        
+        Args:
+            cursor: Cursor to resume from, 0 to start
+            match: Glob-style pattern passed as SCAN MATCH
+            count: Fixed COUNT hint, adaptive by default
+            key_type: Only return keys of this Redis type
+            
+        Returns:
+            The cursor to resume from, 0 once done, and the keys found
+        """
+        batch_count = count or self.throttle.count
+        await self.throttle.wait(batch_count)
+        if self.cluster:
+            nodes = await self._scan_nodes()
+            shard, shard_cursor = divmod(cursor, SHARD_CURSOR_SPAN)
+            node = nodes[shard]
+            async with self._background_slot(node.name):
+                started = time.monotonic()
+                cursors, batch = await self._scan_call(
+                    shard_cursor, match, batch_count, key_type, target_nodes=node
+                )
+                self.throttle.record(time.monotonic() - started, batch_count)
+            if cursors[node.name]:
+                next_cursor = shard * SHARD_CURSOR_SPAN + int(cursors[node.name])
+            elif shard + 1 < len(nodes):
+                next_cursor = (shard + 1) * SHARD_CURSOR_SPAN
+            else:
+                next_cursor = 0
+            return next_cursor, batch
+        async with self._background_slot():
+            started = time.monotonic()
+            next_cursor, batch = await self._scan_call(cursor, match, batch_count, key_type)
+            self.throttle.record(time.monotonic() - started, batch_count)
+        return int(next_cursor), batch
+        
+    async def _scan_call(self, cursor: int, match: str, count: int, key_type: Optional[str], **kwargs) -> Tuple:
+        """Run one SCAN call on the background lane, filtered by type if asked.
+        
+        The first call with a type finds out whether the server supports
+        SCAN TYPE; if it does not, every later batch is filtered with one
+        pipelined TYPE per key instead.
+        """
+        if key_type and self._scan_type is not False:
+            try:
+                result = await self.background.scan(
+                    cursor=cursor, match=match, count=count, _type=key_type, **kwargs
+                )
+                self._scan_type = True
+                return result
+            except ResponseError as e:
+                if self._scan_type:
+                    raise
+                logger.info(f"SCAN TYPE not supported ({e}), filtering with TYPE instead")
+                self._scan_type = False
+        next_cursor, batch = await self.background.scan(cursor=cursor, match=match, count=count, **kwargs)
+        if key_type:
+            batch = await self._keep_type(batch, key_type)
+        return next_cursor, batch
+        
+    async def _keep_type(self, keys: List[str], key_type: str) -> List[str]:
+        """Filter keys by type with one pipelined TYPE each, on the background lane."""
+        if not keys:
+            return []
+        async with self.background.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.type(key)
+            types = await pipe.execute()
+        return [key for key, found in zip(keys, types) if found == key_type]
+        
+    async def _scan_shards(
+        self,
+        match: str,
+        count: Optional[int],
+        key_type: Optional[str]
+    ) -> AsyncIterator[List[str]]:
+        """Scan every cluster shard concurrently, yielding batches as they arrive."""
+        nodes = await self._scan_nodes()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=len(nodes) * 2)
+        
+        async def walk(node) -> None:
+            try:
+                cursor = 0
+                while True:
+                    batch_count = count or self.throttle.count
+                    await self.throttle.wait(batch_count)
+                    async with self._background_slot(node.name):
+                        started = time.monotonic()
+                        cursors, batch = await self._scan_call(
+                            cursor, match, batch_count, key_type, target_nodes=node
+                        )
+                        self.throttle.record(time.monotonic() - started, batch_count)
+                    cursor = cursors[node.name]
+                    if batch:
+                        await queue.put(batch)
+                    if cursor == 0:
+                        break
+            except Exception as e:
+                await queue.put(e)
+            finally:
+                await queue.put(None)
+        
+        tasks = [asyncio.create_task(walk(node)) for node in nodes]
+        try:
+            running = len(tasks)
+            while running:
+                item = await queue.get()
+                if item is None:
+                    running -= 1
+                elif isinstance(item, Exception):
+                    raise item
+                else:
+                    yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+        
+    async def count_namespaces(
+        self,
+        separator: str = ":",
+        depth: int = 1,
+        match: str = "*",
+        cursor: int = 0,
+        count: Optional[int] = None,
+        key_type: Optional[str] = None,
+        under: str = ""
+    ) -> NamespaceSlice:
+        """Count keys per prefix on the server, one bounded slice at a time.
+        
+        Only prefix counts and the names of keys shallower than ``depth``
+        cross the network, so the top of a very large keyspace can be
+        summarized cheaply. Call again with the returned cursor to resume.
+        
+        Args:
+            separator: Key segment separator
+            depth: Number of segments in each returned prefix
+            match: Glob-style pattern passed as SCAN MATCH
+            cursor: SCAN cursor to resume from, 0 to start
+            count: Approximate number of keys visited per call, adapted
+                by ``throttle`` by default
+            key_type: Only count keys of this Redis type
+            under: Only count keys starting with this literal prefix, for
+                when ``match`` cannot express it
+            
+        Returns:
+            The counts found in this slice and the cursor to resume from
+        """
+        budget = count or self.throttle.count
+        args = [budget, separator, depth, match, key_type or "", under]
+        await self.throttle.wait(budget)
+        if self.cluster:
+            # Shards are walked one after another, each to completion.
+            nodes = await self._scan_nodes()
+            shard, shard_cursor = divmod(cursor, SHARD_CURSOR_SPAN)
+            async with self._background_slot(nodes[shard].name):
+                started = time.monotonic()
+                shard_next, flat, keys = await self.background.execute_command(
+                    "EVAL", NAMESPACE_COUNT_SCRIPT, 0, shard_cursor, *args, target_nodes=nodes[shard]
+                )
+            if int(shard_next) != 0:
+                next_cursor = shard * SHARD_CURSOR_SPAN + int(shard_next)
+            elif shard + 1 < len(nodes):
+                next_cursor = (shard + 1) * SHARD_CURSOR_SPAN
+            else:
+                next_cursor = 0
+        else:
+            if self._namespace_script is None:
+                self._namespace_script = self.background.register_script(NAMESPACE_COUNT_SCRIPT)
+            async with self._background_slot():
+                started = time.monotonic()
+                next_cursor, flat, keys = await self._namespace_script(keys=[], args=[cursor, *args])
+        self.throttle.record(time.monotonic() - started, budget)
+        return NamespaceSlice(
+            cursor=int(next_cursor),
+            prefixes={flat[i]: int(flat[i + 1]) for i in range(0, len(flat), 2)},
+            keys=list(keys)
         )
         
-    async def get_keys(self, pattern: str = "*") -> List[str]:
-        """Get Redis keys matching pattern."""
-        return await self.client.keys(pattern)
+    async def get_keys(self, pattern: str = "*", key_type: Optional[str] = None) -> List[str]:
+        """Get Redis keys matching pattern, optionally of one type only."""
+        keys = []
+        async for batch in self.scan_keys(match=pattern, key_type=key_type):
+            keys.extend(batch)
+        return keys
+        
+    async def filter_by_type(self, keys: List[str], key_type: str) -> List[str]:
+        """Keep the keys of one Redis type, with one pipelined TYPE per key.
+        
+        Args:
+            keys: Redis keys
+            key_type: Redis type to keep
+            
+        Returns:
+            The keys of that type, in their original order
+        """
+        async with self._background_slot():
+            return await self._keep_type(keys, key_type)
+        
+    async def get_key_count(self) -> int:
+        """Get the number of keys in the current database (DBSIZE)."""
+        async with self._background_slot():
+            return await self.background.dbsize()
         
     async def get_type(self, key: str) -> str:
         """Get type of Redis key."""
-        return await self.client.type(key)
+        return await self.reader.type(key)
         
     async def get_value(self, key: str) -> Any:
-        """Get value for Redis key."""
+        """Get the complete value for Redis key.
+        
+        Collections are read page by page, so no single command has to
+        return the whole value.
+        """
         key_type = await self.get_type(key)
         
         if key_type == "string":
-            return await self.client.get(key)
-        elif key_type == "hash":
-            return await self.client.hgetall(key)
-        elif key_type == "list":
-            return await self.client.lrange(key, 0, -1)
-        elif key_type == "set":
-            return await self.client.smembers(key)
-        elif key_type == "zset":
-            return await self.client.zrange(key, 0, -1, withscores=True)
+            if self.binary:
+                return await self.reader.execute_command("GET", key, **{NEVER_DECODE: True})
+            return await self.reader.get(key)
+        elif key_type in COLLECTION_TYPES:
+            items = []
+            cursor = 0
+            while True:
+                page = await self.get_page(key, key_type, cursor)
+                items.extend(page.items)
+                cursor = page.cursor
+                if page.done:
+                    break
+            if key_type == "hash":
+                return dict(items)
+            elif key_type == "set":
+                return set(items)
+            return items
         
         return None
         
+    async def get_length(self, key: str, key_type: str) -> int:
+        """Get the number of elements in a collection value.
+        
+        Args:
+            key: Redis key
+            key_type: Redis type of the key
+            
+        Returns:
+            Element count, or 0 for non-collection types
+        """
+        command = LENGTH_COMMANDS.get(key_type)
+        if command is None:
+            return 0
+        return await self.reader.execute_command(command, key)
+        
+    async def get_page(
+        self,
+        key: str,
+        key_type: str,
+        cursor: int = 0,
+        count: Optional[int] = None
+    ) -> ValuePage:
+        """Get one page of a collection value, or one chunk of a string.
+        
+        Lists and sorted sets are read in LRANGE/ZRANGE index windows, which
+        keeps sorted sets in score order; hashes and sets use HSCAN/SSCAN
+        cursors and strings GETRANGE byte offsets. The first page (cursor 0)
+        is fetched in the same round-trip as the element count or length.
+        
+        Args:
+            key: Redis key
+            key_type: Redis type of the key
+            cursor: Cursor returned with the previous page, 0 to start
+            count: Page size, defaults to ``page_size`` elements or
+                ``preview_bytes`` bytes for strings
+            
+        Returns:
+            The page of elements and the cursor for the next one
+        """
+        count = count or (self.preview_bytes if key_type == "string" else self.page_size)
+        async with self.reader.pipeline(transaction=False) as pipe:
+            self._queue_page(pipe, key, key_type, cursor, count)
+            # Every string chunk needs the length to tell whether it is the last
+            if cursor == 0 or key_type == "string":
+                pipe.execute_command(LENGTH_COMMANDS.get(key_type, "STRLEN"), key)
+            results = await pipe.execute()
+        
+        total = results[1] if len(results) > 1 else None
+        return self._parse_page(key_type, cursor, count, results[0], total)
+        
+    def _queue_page(self, pipe, key: str, key_type: str, cursor: int, count: int) -> None:
+        """Queue the command reading one page of a collection on a pipeline."""
+        if key_type == "list":
+            pipe.lrange(key, cursor, cursor + count - 1)
+        elif key_type == "zset":
+            pipe.zrange(key, cursor, cursor + count - 1, withscores=True)
+        elif key_type == "hash":
+            pipe.hscan(key, cursor, count=count)
+        elif key_type == "set":
+            pipe.sscan(key, cursor, count=count)
+        elif key_type == "string":
+            # Raw bytes, since a chunk may end inside a UTF-8 character
+            pipe.execute_command("GETRANGE", key, cursor, cursor + count - 1, **{NEVER_DECODE: True})
+        else:
+            raise ValueError(f"Cannot page a value of type {key_type}")
+            
+    def _parse_page(
+        self,
+        key_type: str,
+        cursor: int,
+        count: int,
+        result: Any,
+        total: Optional[int]
+    ) -> ValuePage:
+        """Build a ValuePage from the reply of a queued page command."""
+        if key_type == "string":
+            # A string whose length is a multiple of count ends on a full chunk
+            final = len(result) < count or (total is not None and cursor + len(result) >= total)
+            if self.binary:
+                items, consumed = [result], len(result)
+            else:
+                text, consumed = _decode_chunk(result, final)
+                items = [text]
+            next_cursor = 0 if final else cursor + consumed
+        elif key_type in ("list", "zset"):
+            items = result
+            next_cursor = cursor + count if len(items) == count else 0
+        else:
+            next_cursor, items = result
+            if key_type == "hash":
+                items = list(items.items())
+        return ValuePage(key_type=key_type, items=items, cursor=next_cursor, total=total)
+        
     async def get_ttl(self, key: str) -> int:
         """Get TTL for Redis key.
         
@@ -72,7 +977,7 @@ class RedisClient:
         Returns:
             TTL in seconds, -1 if no TTL, -2 if key doesn't exist
         """
-        return await self.client.ttl(key)
+        return await self.reader.ttl(key)
         
     async def delete_key(self, key: str) -> bool:
         """Delete Redis key.
@@ -83,6 +988,8 @@ class RedisClient:
         Returns:
             True if key was deleted
         """
+        if self.cache is not None:
+            self.cache.invalidate(key)
         return await self.client.delete(key) > 0
         
     async def set_ttl(self, key: str, ttl: int) -> bool:
@@ -95,60 +1002,373 @@ class RedisClient:
         Returns:
             True if TTL was set
         """
+        if self.cache is not None:
+            self.cache.invalidate(key)
         return await self.client.expire(key, ttl)
         
+    async def unlink_keys(self, keys: List[str]) -> int:
+        """Unlink a batch of keys with pipelined UNLINK calls.
+        
+        UNLINK reclaims memory in a background thread, so large values do
+        not block the server the way DEL does.
+        
+        Args:
+            keys: Redis keys
+            
+        Returns:
+            Number of keys that existed and were removed
+        """
+        if not keys:
+            return 0
+        if self.cache is not None:
+            for key in keys:
+                self.cache.invalidate(key)
+        async with self.client.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.unlink(key)
+            results = await pipe.execute()
+        return sum(results)
+        
+    async def expire_keys(self, keys: List[str], ttl: int) -> int:
+        """Set the same TTL on a batch of keys with pipelined EXPIRE calls.
+        
+        Args:
+            keys: Redis keys
+            ttl: TTL in seconds
+            
+        Returns:
+            Number of keys that existed and had their TTL set
+        """
+        if not keys:
+            return 0
+        if self.cache is not None:
+            for key in keys:
+                self.cache.invalidate(key)
+        async with self.client.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.expire(key, ttl)
+            results = await pipe.execute()
+        return sum(1 for result in results if result)
+        
+    async def dump_keys(self, keys: List[str]) -> List[Tuple[str, int, bytes]]:
+        """Serialize a batch of keys with pipelined PTTL and DUMP calls.
+        
+        Runs on the background lane, so exports can read from a replica.
+        
+        Args:
+            keys: Redis keys
+            
+        Returns:
+            (key, TTL in milliseconds or 0 for none, DUMP payload) for
+            every key that still exists
+        """
+        if not keys:
+            return []
+        async with self._background_slot(), self.background.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.pttl(key)
+                pipe.execute_command("DUMP", key, **{NEVER_DECODE: True})
+            results = await pipe.execute()
+        dumps = []
+        for position, key in enumerate(keys):
+            ttl, payload = results[position * 2:position * 2 + 2]
+            if payload is None or ttl == -2:
+                continue
+            dumps.append((key, max(ttl, 0), payload))
+        return dumps
+        
+    async def restore_keys(self, entries: List[Tuple[Any, int, bytes]], replace: bool = False) -> int:
+        """Recreate a batch of keys from DUMP payloads with pipelined RESTORE calls.
+        
+        Args:
+            entries: (key, TTL in milliseconds or 0 for none, payload)
+            replace: Overwrite keys that already exist instead of skipping them
+            
+        Returns:
+            Number of keys restored
+            
+        Raises:
+            ResponseError: If the server rejects a payload, for example one
+                dumped by a newer Redis version
+        """
+        if not entries:
+            return 0
+        if self.cache is not None and replace:
+            for key, _, _ in entries:
+                self.cache.invalidate(key.decode("utf-8", "surrogateescape") if isinstance(key, bytes) else key)
+        async with self.client.pipeline(transaction=False) as pipe:
+            for key, ttl, payload in entries:
+                pipe.restore(key, ttl, payload, replace=replace)
+            results = await pipe.execute(raise_on_error=False)
+        restored = 0
+        for result in results:
+            if isinstance(result, ResponseError) and str(result).startswith("BUSYKEY"):
+                continue
+            if isinstance(result, Exception):
+                raise result
+            restored += 1
+        return restored
+        
     async def close(self) -> None:
         """Close Redis connection."""
+        if self._keyspace_task is not None:
+            self._keyspace_task.cancel()
+        for client in self._node_clients:
+            await client.close()
+        await self.background.close()
+        if self.reader is not self.client:
+            await self.reader.close()
         await self.client.close()
 
-    async def get_key(self, key: str) -> Optional[str]:
-        """Get value for a key."""
+    async def get_key(self, key: str, key_type: Optional[str] = None) -> Optional[KeyValue]:
+        """Get value for a key.
+        
+        The value, its size and its TTL are read in a single pipelined
+        round-trip. Collections only include their first page and strings
+        their first ``preview_bytes``; use get_page with the returned
+        cursor to read further.
+        
+        Args:
+            key: Redis key
+            key_type: Redis type of the key if already known, saving a TYPE call
+            
+        Returns:
+            The raw value with its metadata, or None if the key does not exist
+        """
+        if self.cache is not None:
+            cached = self.cache.get(key, "value")
+            if cached is not None:
+                value, age = cached
+                return replace(value, ttl=_remaining_ttl(value.ttl, age))
+            # Invalidations arriving during the fetch keep its result out
+            epoch = self.cache.epoch()
+        value = await self._fetch_key(key, key_type)
+        if value is not None and self.cache is not None:
+            self.cache.put(key, "value", value, _estimate_size(value.value), epoch=epoch)
+        return value
+        
+    async def _fetch_key(self, key: str, key_type: Optional[str]) -> Optional[KeyValue]:
+        """Read a key's value, size and TTL from the server."""
         try:
-            key_type = await self.client.type(key)
+            if key_type is None:
+                key_type = await self.reader.type(key)
             logger.debug(f"Key type for {key}: {key_type}")
             
             if key_type == "string":
-                data = await self.client.get(key)
-                logger.debug(f"String data for {key}: {data}")
-                try:
-                    parsed = json.loads(data)
-                    return json.dumps(parsed, indent=2)
-                except:
-                    return data
-            elif key_type == "hash":
-                data = await self.client.hgetall(key)
-                logger.debug(f"Hash data for {key}: {data}")
-                return json.dumps(data, indent=2)
-            elif key_type == "list":
-                data = await self.client.lrange(key, 0, -1)
-                logger.debug(f"List data for {key}: {data}")
-                return json.dumps(data, indent=2)
-            elif key_type == "set":
-                data = await self.client.smembers(key)
-                logger.debug(f"Set data for {key}: {data}")
-                return json.dumps(list(data), indent=2)
-            elif key_type == "zset":
-                data = await self.client.zrange(key, 0, -1, withscores=True)
-                logger.debug(f"ZSet data for {key}: {data}")
-                return json.dumps(dict(data), indent=2)
+                count = self.preview_bytes
+                async with self.reader.pipeline(transaction=False) as pipe:
+                    self._queue_page(pipe, key, key_type, 0, count)
+                    pipe.strlen(key)
+                    pipe.ttl(key)
+                    data, size, ttl = await pipe.execute()
+                if ttl == -2:
+                    return None
+                decoder = sniff(data)
+                if decoder is not None and size <= self.max_decode_bytes:
+                    if len(data) < size:
+                        data = await self.reader.execute_command("GET", key, **{NEVER_DECODE: True})
+                    logger.debug(f"String data for {key}: {size} bytes of {decoder.name}")
+                    return KeyValue(
+                        key=key, key_type=key_type, value=data,
+                        size=size, ttl=ttl, encoding=decoder.name
+                    )
+                page = self._parse_page(key_type, 0, count, data, size)
+                logger.debug(f"String data for {key}: {len(data)} of {size} bytes")
+                return KeyValue(
+                    key=key, key_type=key_type, value=page.items[0],
+                    size=size, ttl=ttl, cursor=page.cursor
+                )
+            elif key_type in COLLECTION_TYPES:
+                count = self.page_size
+                async with self.reader.pipeline(transaction=False) as pipe:
+                    self._queue_page(pipe, key, key_type, 0, count)
+                    pipe.execute_command(LENGTH_COMMANDS[key_type], key)
+                    pipe.ttl(key)
+                    result, size, ttl = await pipe.execute()
+                if not size:
+                    return None
+                page = self._parse_page(key_type, 0, count, result, size)
+                logger.debug(f"First {key_type} page for {key}: {len(page.items)} of {size}")
+                return KeyValue(
+                    key=key, key_type=key_type, value=page.items,
+                    size=size, ttl=ttl, cursor=page.cursor
+                )
             
             return None
         except Exception as e:
             logger.error(f"Error getting key {key}: {e}", exc_info=True)
             return None
         
+    async def get_metadata(self, keys: List[str]) -> Dict[str, KeyMetadata]:
+        """Get metadata for a batch of keys in one round-trip.
+        
+        TYPE, TTL, OBJECT ENCODING and MEMORY USAGE are pipelined for every
+        key. Servers that reject OBJECT or MEMORY (for example managed
+        services that rename them) still return type and TTL.
+        
+        Args:
+            keys: Redis keys
+            
+        Returns:
+            Metadata by key, omitting keys that no longer exist
+        """
+        metadata = {}
+        if self.cache is not None:
+            missing = []
+            for key in keys:
+                cached = self.cache.get(key, "metadata")
+                if cached is None:
+                    missing.append(key)
+                else:
+                    key_metadata, age = cached
+                    metadata[key] = replace(key_metadata, ttl=_remaining_ttl(key_metadata.ttl, age))
+            keys = missing
+            epoch = self.cache.epoch()
+        if not keys:
+            return metadata
+        async with self.reader.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.type(key)
+                pipe.ttl(key)
+                pipe.execute_command("OBJECT", "ENCODING", key)
+                pipe.memory_usage(key)
+            results = await pipe.execute(raise_on_error=False)
+        
+        for position, key in enumerate(keys):
+            key_type, ttl, encoding, memory = results[position * 4:position * 4 + 4]
+            if isinstance(key_type, Exception) or key_type == "none":
+                continue
+            metadata[key] = KeyMetadata(
+                key_type=key_type,
+                ttl=ttl if isinstance(ttl, int) else -1,
+                encoding=None if isinstance(encoding, Exception) else encoding,
+                memory=None if isinstance(memory, Exception) else memory,
+            )
+            if self.cache is not None:
+                self.cache.put(key, "metadata", metadata[key], METADATA_SIZE, epoch=epoch)
+        return metadata
+        
+    async def get_key_sizes(self, keys: List[str]) -> Dict[str, KeySize]:
+        """Get memory usage and length for a batch of keys.
+        
+        Uses two pipelined round-trips on the background lane: TYPE with
+        MEMORY USAGE, then the length command matching each type. Results
+        bypass the value cache.
+        
+        Args:
+            keys: Redis keys
+            
+        Returns:
+            Sizes by key, omitting keys that no longer exist
+        """
+        if not keys:
+            return {}
+        async with self._background_slot(), self.background.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.type(key)
+                pipe.memory_usage(key)
+            results = await pipe.execute(raise_on_error=False)
+        
+        found = []
+        async with self._background_slot(), self.background.pipeline(transaction=False) as pipe:
+            for position, key in enumerate(keys):
+                key_type, memory = results[position * 2:position * 2 + 2]
+                if isinstance(key_type, Exception) or key_type == "none":
+                    continue
+                found.append((key, key_type, None if isinstance(memory, Exception) else memory))
+                if key_type == "string":
+                    pipe.strlen(key)
+                else:
+                    pipe.execute_command(LENGTH_COMMANDS.get(key_type, "EXISTS"), key)
+            lengths = await pipe.execute(raise_on_error=False) if found else []
+        
+        return {
+            key: KeySize(
+                key_type=key_type,
+                memory=memory,
+                length=length if isinstance(length, int) else 0,
+            )
+            for (key, key_type, memory), length in zip(found, lengths)
+        }
+        
+    async def search_values(
+        self,
+        cursors: Dict[str, int],
+        needle: str,
+        ignore_case: bool = True,
+        budget: int = DEFAULT_PAGE_SIZE,
+        window: int = DEFAULT_PREVIEW_BYTES
+    ) -> Dict[str, Tuple[int, str, Optional[str]]]:
+        """Check one bounded slice of each value for a substring, server-side.
+        
+        One pipelined round-trip on the background lane runs a short script
+        per key: GETRANGE windows for strings, LRANGE pages for lists,
+        HSCAN for hashes and SSCAN/ZSCAN with MATCH for sets and sorted
+        sets. Only cursors and excerpts of hits cross the network. Call
+        again with the returned cursors until they reach 0.
+        
+        Args:
+            cursors: Key -> cursor to resume from, 0 to start
+            needle: Text to look for
+            ignore_case: Ignore ASCII case when matching
+            budget: Elements looked at per key and call
+            window: Bytes of a string looked at per call
+            
+        Returns:
+            Key -> (next cursor or 0, type, excerpt of the first hit or None),
+            omitting keys whose check failed
+        """
+        if not cursors:
+            return {}
+        if ignore_case:
+            needle = needle.translate(ASCII_LOWERCASE)
+        args = (needle, f"*{escape_glob(needle)}*")
+        options = (budget, window, int(ignore_case))
+        
+        async def run(command: str, script: str, keys: List[str]) -> List[Any]:
+            async with self._background_slot(), self.background.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.execute_command(
+                        command, script, 1, key, *args, cursors[key], *options, **{NEVER_DECODE: True}
+                    )
+                return await pipe.execute(raise_on_error=False)
+        
+        keys = list(cursors)
+        replies = await run("EVALSHA", VALUE_SEARCH_SHA, keys)
+        # Servers that have not seen the script yet get it in full once
+        missing = [
+            position for position, reply in enumerate(replies)
+            if isinstance(reply, NoScriptError)
+        ]
+        if missing:
+            retried = await run("EVAL", VALUE_SEARCH_SCRIPT, [keys[position] for position in missing])
+            for position, reply in zip(missing, retried):
+                replies[position] = reply
+        results = {}
+        for key, reply in zip(keys, replies):
+            if isinstance(reply, Exception):
+                logger.debug(f"Value search failed for {key}: {reply}")
+                continue
+            cursor, key_type, excerpt = reply
+            results[key] = (
+                int(cursor),
+                key_type.decode(),
+                excerpt.decode("utf-8", "replace") if excerpt else None
+            )
+        return results
+        
     async def get_key_type(self, key: str) -> str:
         """Get the type of a key."""
-        return await self.client.type(key)
+        return await self.reader.type(key)
         
     async def get_all_keys(self) -> Dict[str, List[str]]:
         """Get all keys organized by namespace."""
         keys = {}
-        redis_keys = await self.client.keys("*")
-        for key in redis_keys:
-            key_str = key if isinstance(key, str) else key.decode('utf-8')
-            namespace = key_str.split(':', 1)[0] if ':' in key_str else 'other'
-            if namespace not in keys:
-                keys[namespace] = []
-            keys[namespace].append(key_str)
+        async for batch in self.scan_keys():
+            for key in batch:
+                key_str = key if isinstance(key, str) else key.decode('utf-8')
+                namespace = key_str.split(':', 1)[0] if ':' in key_str else 'other'
+                if namespace not in keys:
+                    keys[namespace] = []
+                keys[namespace].append(key_str)
         return keys 
\ No newline at end of file
@@ -0,0 +1,196 @@
+"""
+Trigram index for searching key names.
+
+This module provides an incrementally maintained index from every
+three-character substring of a key (case-folded) to the keys containing it.
+A query is answered from the shortest posting list among its trigrams,
+so only keys sharing its rarest trigram are checked; when too few keys
+contain the query verbatim, keys sharing most of its trigrams are ranked
+in as fuzzy matches.
+"""
+
+from array import array
+from collections import Counter
+from itertools import filterfalse
+from typing import Dict, Iterable, List, Optional, Set
+import heapq
+
+# Number of results returned by default
+DEFAULT_SEARCH_LIMIT = 50
+
+# Most keys verified against one query, bounding its cost on huge keyspaces
+MAX_CANDIDATES = 50_000
+
+# Removed keys tolerated, as a fraction of all slots, before compacting
+COMPACT_RATIO = 0.25
+
+# Characters after which a match counts as starting a word or segment
+_BOUNDARIES = frozenset(":/._-| ")
+
+def _trigrams(text: str) -> List[str]:
+    """Get the distinct trigrams of case-folded text."""
+    return list({text[i:i + 3] for i in range(len(text) - 2)})
+
+class TrigramIndex:
+    """Substring and fuzzy search over a changing set of keys.
+
+    Keys are numbered and posting lists hold those numbers in compact
+    arrays. Removing a key only clears its slot; once enough slots are
+    empty their numbers are purged from the postings and reused.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        # Key by number, None once removed
+        self._keys: List[Optional[str]] = []
+        self._ids: Dict[str, int] = {}
+        self._postings: Dict[str, array] = {}
+        # Numbers of removed keys still present in postings
+        self._removed: Set[int] = set()
+        # Numbers purged from all postings, free for new keys
+        self._free: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._ids
+
+    def add(self, key: str) -> bool:
+        """Index a key.
+
+        Args:
+            key: Redis key
+
+        Returns:
+            Whether the key was not indexed yet
+        """
+        if key in self._ids:
+            return False
+        if self._free:
+            number = self._free.pop()
+            self._keys[number] = key
+        else:
+            number = len(self._keys)
+            self._keys.append(key)
+        self._ids[key] = number
+        postings = self._postings
+        for trigram in _trigrams(key.lower()):
+            posting = postings.get(trigram)
+            if posting is None:
+                posting = postings[trigram] = array("I")
+            posting.append(number)
+        return True
+
+    def add_many(self, keys: Iterable[str]) -> int:
+        """Index keys, returning how many were not indexed yet."""
+        return sum(self.add(key) for key in keys)
+
+    def remove(self, key: str) -> bool:
+        """Drop a key from the index.
+
+        Args:
+            key: Redis key
+
+        Returns:
+            Whether the key was indexed
+        """
+        number = self._ids.pop(key, None)
+        if number is None:
+            return False
+        self._keys[number] = None
+        self._removed.add(number)
+        if len(self._removed) > 1024 and len(self._removed) > len(self._keys) * COMPACT_RATIO:
+            self._compact()
+        return True
+
+    def clear(self) -> None:
+        """Remove all keys from the index."""
+        self._keys = []
+        self._ids = {}
+        self._postings = {}
+        self._removed = set()
+        self._free = []
+
+    def _compact(self) -> None:
+        """Purge removed keys from the postings so their numbers can be reused."""
+        removed = self._removed
+        for trigram, posting in list(self._postings.items()):
+            kept = array("I", filterfalse(removed.__contains__, posting))
+            if kept:
+                self._postings[trigram] = kept
+            else:
+                del self._postings[trigram]
+        self._free.extend(removed)
+        self._removed = set()
+
+    def search(self, query: str, limit: int = DEFAULT_SEARCH_LIMIT) -> List[str]:
+        """Find the keys best matching a query.
+
+        Keys containing the query, ignoring case, come first: matches at
+        the start of the key or of a segment before others, then shorter
+        keys. If there are fewer than ``limit`` of those, keys sharing at
+        least half of the query's trigrams follow, most shared first.
+
+        Args:
+            query: Text to look for
+            limit: Maximum number of keys returned
+
+        Returns:
+            Matching keys, best first
+        """
+        folded = query.lower()
+        if not folded or limit <= 0:
+            return []
+        trigrams = _trigrams(folded)
+        postings = [self._postings.get(trigram) for trigram in trigrams]
+
+        if not trigrams:
+            candidates: Iterable[int] = range(min(len(self._keys), MAX_CANDIDATES))
+        elif all(posting is not None for posting in postings):
+            candidates = min(postings, key=len)[:MAX_CANDIDATES]
+        else:
+            candidates = ()
+        keys = self._keys
+        matched = [key for key in map(keys.__getitem__, candidates) if key is not None and folded in key.lower()]
+        results = heapq.nsmallest(limit, matched, key=lambda key: (self._rank(key, folded), len(key)))
+
+        if len(results) < limit and len(trigrams) > 1:
+            results += self._fuzzy(trigrams, limit - len(results), set(results))
+        return results
+
+    @staticmethod
+    def _rank(key: str, folded: str) -> int:
+        """Rank a match: 0 at the start of the key or a segment, 1 elsewhere."""
+        position = key.lower().find(folded)
+        return 0 if position == 0 or key[position - 1] in _BOUNDARIES else 1
+
+    def _fuzzy(self, trigrams: List[str], limit: int, exclude: set) -> List[str]:
+        """Rank keys by the number of query trigrams they share.
+
+        Posting lists are counted rarest first until the candidate budget is
+        spent; the most common trigrams carry the least information anyway.
+        """
+        postings = sorted(
+            (posting for posting in map(self._postings.get, trigrams) if posting is not None),
+            key=len
+        )
+        shared: Counter = Counter()
+        budget = MAX_CANDIDATES * 2
+        counted = 0
+        for posting in postings:
+            if len(posting) > budget:
+                break
+            shared.update(posting)
+            budget -= len(posting)
+            counted += 1
+        if counted < 2:
+            return []
+        threshold = (counted + 1) // 2
+        keys = self._keys
+        ranked = []
+        for number, count in shared.items():
+            key = keys[number]
+            if count >= threshold and key is not None and key not in exclude:
+                ranked.append((-count, len(key), key))
+        return [key for *_, key in heapq.nsmallest(limit, ranked)]
@@ -0,0 +1,113 @@
+"""
+Adaptive throttling for background keyspace walks.
+
+This module provides the scheduler RedisClient runs every SCAN-based walk
+through. It measures how long each call takes, shrinks or grows the COUNT
+hint to keep server time per call under a latency target, and spaces calls
+out to respect an optional keys-per-second budget, so the TUI can stay
+attached to a busy primary without raising its tail latency.
+"""
+
+from typing import Optional
+import asyncio
+import time
+
+# Default server time one SCAN call may take before COUNT is reduced
+DEFAULT_TARGET_LATENCY = 0.005
+
+# Smallest COUNT hint the throttle will shrink to
+MIN_SCAN_COUNT = 10
+
+# Longest pause inserted after a single slow call
+MAX_PAUSE = 1.0
+
+# Weight of the newest measurement in the moving average rate
+RATE_SMOOTHING = 0.2
+
+class ScanThrottle:
+    """AIMD controller for the COUNT hint and pacing of SCAN calls.
+
+    COUNT grows by a quarter after fast calls and halves after slow ones.
+    A slow call is also followed by a pause as long as its server time, so
+    walks never keep the server busy more than about half the time while
+    it is struggling. Latency is measured relative to the fastest call seen,
+    which approximates the network round-trip.
+    """
+
+    def __init__(
+        self,
+        count: int,
+        target_latency: Optional[float] = DEFAULT_TARGET_LATENCY,
+        max_rate: Optional[float] = None,
+        max_count: Optional[int] = None
+    ) -> None:
+        """Initialize the throttle.
+
+        Args:
+            count: Initial COUNT hint
+            target_latency: Seconds of server time allowed per call, None
+                to keep COUNT fixed
+            max_rate: Maximum keys visited per second across all walks,
+                None for no limit
+            max_count: Largest COUNT hint, ten times ``count`` by default
+        """
+        self.count = count
+        self.target_latency = target_latency
+        self.max_rate = max_rate
+        self.min_count = min(count, MIN_SCAN_COUNT)
+        self.max_count = max_count or count * 10
+        # Moving average of keys visited per second
+        self.rate = 0.0
+        self._baseline = float("inf")
+        self._next_call = 0.0
+        self._last_record: Optional[float] = None
+
+    async def wait(self, count: Optional[int] = None) -> None:
+        """Sleep until the next call is allowed, reserving its share of the rate.
+
+        Each caller takes the next free slot before sleeping, so concurrent
+        walks queue behind one another instead of all waking at once, and
+        ``max_rate`` holds across all of them.
+
+        Args:
+            count: Keys the call is expected to visit, ``count`` by default
+        """
+        now = time.monotonic()
+        slot = max(now, self._next_call)
+        if self.max_rate:
+            self._next_call = slot + (self.count if count is None else count) / self.max_rate
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    def record(self, elapsed: float, count: int) -> None:
+        """Adapt to a completed call.
+
+        Args:
+            elapsed: Seconds the call took, including the round-trip
+            count: COUNT hint the call was made with
+        """
+        now = time.monotonic()
+        started = now - elapsed
+        self._baseline = min(self._baseline, elapsed)
+        cost = elapsed - self._baseline
+
+        if self.target_latency:
+            if cost > self.target_latency:
+                self.count = max(self.min_count, self.count // 2)
+                self._next_call = max(self._next_call, now + min(cost, MAX_PAUSE))
+            elif cost < self.target_latency / 2:
+                self.count = min(self.max_count, self.count + self.count // 4 + 1)
+        if self.max_rate:
+            self._next_call = max(self._next_call, started + count / self.max_rate)
+
+        interval = elapsed if self._last_record is None else max(elapsed, now - self._last_record)
+        current = count / interval if interval > 0 else 0.0
+        if self._last_record is None or now - self._last_record > 5:
+            self.rate = current
+        else:
+            self.rate += RATE_SMOOTHING * (current - self.rate)
+        self._last_record = now
+
+    def describe(self) -> str:
+        """Summarize the current pace for the status line."""
+        return f"{self.rate:,.0f} keys/s, COUNT {self.count:,}"
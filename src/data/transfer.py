@@ -0,0 +1,279 @@
+"""
+Export and import of keys as DUMP payloads in a local file.
+
+This module streams the keys matching a pattern into a compact file, one
+length-prefixed record per key holding its name, TTL and DUMP payload, and
+restores such a file with pipelined RESTORE batches. Only one batch per
+worker is held in memory at a time, so namespaces far larger than RAM can
+be copied between servers. Files ending in ``.gz`` are gzip-compressed;
+compressed files are recognized on import whatever their name.
+"""
+
+from typing import IO, AsyncIterator, Iterator, List, Optional, Set, Tuple
+import asyncio
+import gzip
+import logging
+import struct
+import time
+
+from .redis_client import RedisClient
+
+logger = logging.getLogger(__name__)
+
+# First bytes of every export file, with the format version
+FILE_MAGIC = b"REDISTUI\x00\x01"
+
+# Key length, TTL in milliseconds (0 for none) and payload length
+RECORD_HEADER = struct.Struct(">IqI")
+
+# First bytes of a gzip stream
+GZIP_MAGIC = b"\x1f\x8b"
+
+# Keys and payload bytes sent in one RESTORE pipeline
+DEFAULT_RESTORE_BATCH = 500
+DEFAULT_RESTORE_BYTES = 8 * 1024 * 1024
+
+# RESTORE pipelines in flight at the same time
+DEFAULT_PARALLELISM = 2
+
+def encode_record(key: bytes, ttl: int, payload: bytes) -> bytes:
+    """Frame one key as a length-prefixed record."""
+    return RECORD_HEADER.pack(len(key), ttl, len(payload)) + key + payload
+
+def read_records(stream: IO[bytes]) -> Iterator[Tuple[bytes, int, bytes]]:
+    """Read the records of an export file, after its magic.
+
+    Raises:
+        EOFError: If the file ends inside a record, as it does when an
+            export was stopped
+    """
+    while True:
+        header = stream.read(RECORD_HEADER.size)
+        if not header:
+            return
+        if len(header) < RECORD_HEADER.size:
+            raise EOFError("Export file ends inside a record header")
+        key_length, ttl, payload_length = RECORD_HEADER.unpack(header)
+        data = stream.read(key_length + payload_length)
+        if len(data) < key_length + payload_length:
+            raise EOFError("Export file ends inside a record")
+        yield data[:key_length], ttl, data[key_length:]
+
+def open_export(path: str) -> IO[bytes]:
+    """Open an export file for reading, compressed or not.
+
+    Raises:
+        ValueError: If the file is not an export file
+    """
+    with open(path, "rb") as probe:
+        compressed = probe.read(len(GZIP_MAGIC)) == GZIP_MAGIC
+    stream = gzip.open(path, "rb") if compressed else open(path, "rb")
+    if stream.read(len(FILE_MAGIC)) != FILE_MAGIC:
+        stream.close()
+        raise ValueError(f"{path} is not a redis-tui export file")
+    return stream
+
+class _Transfer:
+    """Counters and throughput shared by exports and imports."""
+
+    def __init__(self) -> None:
+        self.keys = 0
+        # Record bytes, before compression
+        self.bytes = 0
+        self.elapsed = 0.0
+
+    @property
+    def rate(self) -> float:
+        """Keys transferred per second."""
+        return self.keys / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def byte_rate(self) -> float:
+        """Record bytes transferred per second."""
+        return self.bytes / self.elapsed if self.elapsed else 0.0
+
+    def describe(self) -> str:
+        """Summarize the throughput for the status line."""
+        return f"{self.rate:,.0f} keys/s, {self.byte_rate / (1024 * 1024):,.1f} MB/s"
+
+class NamespaceExport(_Transfer):
+    """Streaming SCAN, PTTL and DUMP of the keys matching a pattern into a file."""
+
+    def __init__(
+        self,
+        client: RedisClient,
+        path: str,
+        match: str = "*",
+        key_type: Optional[str] = None,
+        under: str = "",
+        compress: Optional[bool] = None,
+        count: Optional[int] = None
+    ) -> None:
+        """Initialize the export.
+
+        Args:
+            client: Redis client
+            path: File to write, replaced if it exists
+            match: Glob pattern restricting the walk
+            key_type: Redis type restricting the walk, None for any
+            under: Only export keys starting with this literal prefix, for
+                when ``match`` cannot express it
+            compress: Gzip the file, by default when ``path`` ends in .gz
+            count: Fixed COUNT hint per SCAN call, adaptive by default
+        """
+        super().__init__()
+        self.client = client
+        self.path = path
+        self.match = match
+        self.key_type = key_type
+        self.under = under
+        self.compress = path.endswith(".gz") if compress is None else compress
+        self.count = count
+
+    async def run(self) -> AsyncIterator[int]:
+        """Write the file, one SCAN batch at a time.
+
+        File writes and compression run in a thread. A stopped export
+        leaves a file that imports up to its last complete record.
+
+        Yields:
+            Number of keys exported so far, once per batch
+        """
+        throttle = self.client.throttle
+        errors = self.client.encoding_errors
+        out = gzip.open(self.path, "wb") if self.compress else open(self.path, "wb")
+        started = time.monotonic()
+        try:
+            out.write(FILE_MAGIC)
+            async for batch in self.client.scan_keys(match=self.match, count=self.count, key_type=self.key_type):
+                if self.under:
+                    batch = [key for key in batch if key.startswith(self.under)]
+                if not batch:
+                    continue
+                await throttle.wait(len(batch))
+                sent = time.monotonic()
+                dumps = await self.client.dump_keys(batch)
+                throttle.record(time.monotonic() - sent, len(batch))
+                chunk = b"".join(
+                    encode_record(key.encode("utf-8", errors), ttl, payload) for key, ttl, payload in dumps
+                )
+                await asyncio.to_thread(out.write, chunk)
+                self.keys += len(dumps)
+                self.bytes += len(chunk)
+                self.elapsed = time.monotonic() - started
+                yield self.keys
+        finally:
+            self.elapsed = time.monotonic() - started
+            out.close()
+        logger.debug(f"Exported {self.keys} keys ({self.bytes} bytes) to {self.path}")
+
+class NamespaceImport(_Transfer):
+    """Pipelined RESTORE of an export file, with several batches in flight."""
+
+    def __init__(
+        self,
+        client: RedisClient,
+        path: str,
+        replace: bool = False,
+        parallelism: int = DEFAULT_PARALLELISM,
+        batch_size: int = DEFAULT_RESTORE_BATCH,
+        batch_bytes: int = DEFAULT_RESTORE_BYTES
+    ) -> None:
+        """Initialize the import.
+
+        Args:
+            client: Redis client, restoring into its primary
+            path: Export file to read
+            replace: Overwrite existing keys instead of skipping them
+            parallelism: RESTORE pipelines in flight at the same time
+            batch_size: Most keys sent in one pipeline
+            batch_bytes: Most payload bytes sent in one pipeline
+        """
+        super().__init__()
+        self.client = client
+        self.path = path
+        self.replace = replace
+        self.parallelism = max(1, parallelism)
+        self.batch_size = batch_size
+        self.batch_bytes = batch_bytes
+        self.restored = 0
+        # Whether the file ended inside a record
+        self.truncated = False
+
+    @property
+    def skipped(self) -> int:
+        """Keys not restored because they already existed."""
+        return self.keys - self.restored
+
+    async def run(self) -> AsyncIterator[int]:
+        """Restore the file batch by batch.
+
+        Reading runs in a thread, and up to ``parallelism`` pipelines are
+        sent before waiting for the oldest to finish, so reading the file
+        and restoring overlap.
+
+        Yields:
+            Number of keys restored so far, once per finished batch
+        """
+        stream = await asyncio.to_thread(open_export, self.path)
+        records = read_records(stream)
+        pending: Set[asyncio.Task] = set()
+        started = time.monotonic()
+        try:
+            while True:
+                batch, size = await asyncio.to_thread(self._read_batch, records)
+                if not batch:
+                    break
+                while len(pending) >= self.parallelism:
+                    pending = await self._collect(pending, started)
+                    yield self.restored
+                pending.add(asyncio.create_task(self._restore(batch, size)))
+            while pending:
+                pending = await self._collect(pending, started)
+                yield self.restored
+        finally:
+            self.elapsed = time.monotonic() - started
+            for task in pending:
+                task.cancel()
+            stream.close()
+        logger.debug(f"Imported {self.restored} of {self.keys} keys from {self.path}")
+
+    def _read_batch(
+        self,
+        records: Iterator[Tuple[bytes, int, bytes]]
+    ) -> Tuple[List[Tuple[bytes, int, bytes]], int]:
+        """Read the next batch of records, bounded by count and bytes."""
+        batch = []
+        size = 0
+        if self.truncated:
+            return batch, size
+        try:
+            for record in records:
+                batch.append(record)
+                size += RECORD_HEADER.size + len(record[0]) + len(record[2])
+                if len(batch) >= self.batch_size or size >= self.batch_bytes:
+                    break
+        except (EOFError, OSError) as e:
+            logger.warning(f"Stopping import of {self.path} at a truncated record: {e}")
+            self.truncated = True
+        return batch, size
+
+    async def _restore(self, batch: List[Tuple[bytes, int, bytes]], size: int) -> Tuple[int, int, int]:
+        """Send one RESTORE pipeline, paced by the scan throttle."""
+        throttle = self.client.throttle
+        await throttle.wait(len(batch))
+        sent = time.monotonic()
+        restored = await self.client.restore_keys(batch, replace=self.replace)
+        throttle.record(time.monotonic() - sent, len(batch))
+        return len(batch), restored, size
+
+    async def _collect(self, pending: Set[asyncio.Task], started: float) -> Set[asyncio.Task]:
+        """Wait for at least one pipeline and count what it restored."""
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            keys, restored, size = task.result()
+            self.keys += keys
+            self.restored += restored
+            self.bytes += size
+        self.elapsed = time.monotonic() - started
+        return pending
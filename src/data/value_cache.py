@@ -0,0 +1,125 @@
+"""
+Bounded LRU cache for Redis values and metadata.
+
+This module provides the cache RedisClient uses to avoid re-fetching keys
+while the user moves around the tree. Entries are grouped by Redis key so
+a single keyspace notification drops everything cached for that key.
+Invalidations are stamped with an epoch so a value read before a write
+cannot be stored after the notification for that write.
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+import time
+
+class ValueCache:
+    """LRU cache bounded by entry count and approximate size in bytes."""
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: Optional[float] = None
+    ) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            max_entries: Maximum number of Redis keys with cached data
+            max_bytes: Maximum approximate size of all cached data
+            ttl: Seconds after which entries expire, None to keep them until
+                evicted or invalidated
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        # Redis key -> kind -> (value, size, time stored)
+        self._entries: "OrderedDict[str, Dict[str, Tuple[Any, int, float]]]" = OrderedDict()
+        self._bytes = 0
+        # Bumped by every invalidation
+        self._epoch = 0
+        # Redis key -> epoch of its latest invalidation, for the most
+        # recently invalidated keys; older ones count as invalidated at
+        # ``_epoch_floor``
+        self._invalidated: "OrderedDict[str, int]" = OrderedDict()
+        self._epoch_floor = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate size of all cached data."""
+        return self._bytes
+
+    def get(self, key: str, kind: str) -> Optional[Tuple[Any, float]]:
+        """Get cached data for a key.
+
+        Args:
+            key: Redis key
+            kind: Kind of data, e.g. ``"value"`` or ``"metadata"``
+
+        Returns:
+            The cached data and its age in seconds, or None on a miss
+        """
+        kinds = self._entries.get(key)
+        if kinds is None or kind not in kinds:
+            return None
+        value, size, stored = kinds[kind]
+        age = time.monotonic() - stored
+        if self.ttl is not None and age > self.ttl:
+            del kinds[kind]
+            self._bytes -= size
+            if not kinds:
+                del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value, age
+
+    def epoch(self) -> int:
+        """Get the invalidation epoch to pass to put for data about to be read."""
+        return self._epoch
+
+    def put(self, key: str, kind: str, value: Any, size: int, epoch: Optional[int] = None) -> None:
+        """Cache data for a key, evicting least recently used keys as needed.
+
+        Args:
+            key: Redis key
+            kind: Kind of data, e.g. ``"value"`` or ``"metadata"``
+            value: Data to cache
+            size: Approximate size of the data in bytes
+            epoch: Result of epoch() taken before the data was read; the
+                data is not cached if the key was invalidated since
+        """
+        if self.max_entries <= 0 or size > self.max_bytes:
+            return
+        if epoch is not None and self._invalidated.get(key, self._epoch_floor) > epoch:
+            return
+        kinds = self._entries.setdefault(key, {})
+        previous = kinds.get(kind)
+        if previous is not None:
+            self._bytes -= previous[1]
+        kinds[kind] = (value, size, time.monotonic())
+        self._bytes += size
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= sum(size for _, size, _ in evicted.values())
+
+    def invalidate(self, key: str) -> None:
+        """Drop everything cached for a key."""
+        kinds = self._entries.pop(key, None)
+        if kinds is not None:
+            self._bytes -= sum(size for _, size, _ in kinds.values())
+        self._epoch += 1
+        self._invalidated[key] = self._epoch
+        self._invalidated.move_to_end(key)
+        if len(self._invalidated) > max(1, self.max_entries):
+            _, self._epoch_floor = self._invalidated.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached data."""
+        self._entries.clear()
+        self._bytes = 0
+        self._epoch += 1
+        self._invalidated.clear()
+        self._epoch_floor = self._epoch
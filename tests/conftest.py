@@ -0,0 +1,14 @@
+"""
+Shared fixtures for the test suite.
+"""
+
+import pytest
+from redis_tui.data.redis_client import RedisClient
+
+@pytest.fixture
+async def redis_client():
+    """Create a Redis client for testing."""
+    client = RedisClient(db=15)  # Use separate DB for testing
+    yield client
+    await client.client.flushdb()  # Clean up after tests
+    await client.close()
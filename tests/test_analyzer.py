@@ -0,0 +1,38 @@
+"""
+Tests for the namespace memory analyzer.
+"""
+
+import pytest
+from redis_tui.data.analyzer import MemoryAnalyzer, PrefixStats
+from redis_tui.data.sample_data import SAMPLE_DATA, load_sample_data
+
+@pytest.mark.asyncio
+async def test_analyzer_aggregates_by_prefix(redis_client):
+    """Test that every prefix counts the keys below it."""
+    await load_sample_data(redis_client)
+    analyzer = MemoryAnalyzer(redis_client)
+    batches = [scanned async for scanned in analyzer.run()]
+    assert batches[-1] == len(SAMPLE_DATA)
+    assert analyzer.stats[""].keys == len(SAMPLE_DATA)
+    got_keys = [key for key in SAMPLE_DATA if key.startswith("got:")]
+    assert analyzer.stats["got"].keys == len(got_keys)
+    assert {key for _, key, _ in analyzer.stats["got"].biggest()} <= set(got_keys)
+
+@pytest.mark.asyncio
+async def test_get_key_sizes_lengths(redis_client):
+    """Test that collection lengths and string lengths are reported."""
+    await redis_client.client.rpush("numbers", *range(7))
+    await redis_client.client.set("name", "redis")
+    sizes = await redis_client.get_key_sizes(["numbers", "name", "missing"])
+    assert sizes["numbers"].key_type == "list"
+    assert sizes["numbers"].length == 7
+    assert sizes["name"].length == 5
+    assert "missing" not in sizes
+
+def test_prefix_stats_keeps_biggest():
+    """Test that only the largest keys are remembered."""
+    stats = PrefixStats()
+    for size in range(20):
+        stats.record(f"key:{size}", size, 1, 1.0, top_n=3)
+    assert [key for _, key, _ in stats.biggest()] == ["key:19", "key:18", "key:17"]
+    assert stats.keys == 20
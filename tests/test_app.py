@@ -0,0 +1,122 @@
+"""
+Tests for the application's coordination of selections and live updates.
+"""
+
+import pytest
+from redis_tui.app import RedisTUI
+from redis_tui.data.decoders import INLINE_DECODE_LIMIT
+from redis_tui.data.key_index import PrefixNode
+from redis_tui.data.redis_client import KeyValue
+
+class FakeClient:
+    """Client stand-in returning one value, optionally overtaken by a newer selection."""
+
+    def __init__(self, value, supersede=False):
+        self.value = value
+        self.supersede = supersede
+        self.app = None
+
+    async def get_key(self, key, key_type=None):
+        if self.supersede:
+            self.app._selection += 1
+        return self.value
+
+class SupersedingDecoders:
+    """Decoder stand-in whose decode is overtaken by a newer selection."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def decode(self, data):
+        self.app._selection += 1
+        return data
+
+def make_app(client):
+    """Create an unmounted app whose display must not be touched."""
+    app = RedisTUI(redis_client=client)
+    client.app = app
+
+    def query_one(*args):
+        raise AssertionError("stale selection reached the display")
+    app.query_one = query_one
+    return app
+
+@pytest.mark.asyncio
+async def test_stale_selection_is_dropped_after_fetch():
+    """Test that a key fetched after a newer selection is not shown."""
+    app = make_app(FakeClient(KeyValue(key="old", key_type="hash", value=[], size=0, ttl=-1), supersede=True))
+    node = PrefixNode("old")
+    app._selection = 1
+    await app._show_key("old", node, selection=1, delay=0)
+    assert node.key_type is None
+
+@pytest.mark.asyncio
+async def test_stale_selection_is_dropped_after_decode():
+    """Test that a value decoded after a newer selection is not shown."""
+    text = "x" * (INLINE_DECODE_LIMIT + 1)
+    app = make_app(FakeClient(KeyValue(key="big", key_type="string", value=text, size=len(text), ttl=-1)))
+    app.decoders = SupersedingDecoders(app)
+    node = PrefixNode("big")
+    app._selection = 1
+    await app._show_key("big", node, selection=1, delay=0)
+    assert app._selection == 2
+
+class RecordingTree:
+    """Key tree stand-in recording the live updates applied to it."""
+
+    def __init__(self, keys=()):
+        self.index = set(keys)
+        self.added = []
+        self.removed = []
+        self.invalidated = []
+
+    def add_keys(self, keys):
+        self.added.append(list(keys))
+
+    def remove_keys(self, keys):
+        self.removed.append(list(keys))
+
+    def invalidate_metadata(self, keys):
+        self.invalidated.append(list(keys))
+
+def make_live_app(tree):
+    """Create an unmounted app applying live updates to a recording tree."""
+    app = RedisTUI(redis_client=FakeClient(None))
+    app.query_one = lambda *args: tree
+    for key, event in [
+        ("a", "set"), ("a", "del"), ("b", "set"), ("b", "hset"),
+        ("c", "expired"), ("d", "del"), ("d", "set"),
+    ]:
+        app._on_keyspace_event(key, event)
+    return app
+
+def test_live_updates_coalesce_to_the_last_event_per_key():
+    """Test that a flush applies one add or removal per key, by its latest event."""
+    tree = RecordingTree()
+    app = make_live_app(tree)
+    app._flush_live_updates()
+    assert tree.removed == [["a", "c"]]
+    assert tree.invalidated == [["b", "d"]]
+    assert tree.added == [["b", "d"]]
+
+    app._flush_live_updates()
+    assert len(tree.removed) == len(tree.added) == 1
+
+def test_live_updates_honour_the_key_filter():
+    """Test that only new keys matching the filter are added, typed ones through a worker."""
+    tree = RecordingTree()
+    app = make_live_app(tree)
+    app.match = "b*"
+    app._flush_live_updates()
+    assert tree.invalidated == [["b", "d"]]
+    assert tree.added == [["b"]]
+
+    tree = RecordingTree(keys=["b"])
+    app = make_live_app(tree)
+    app.key_type = "hash"
+    workers = []
+    app._add_typed_keys = lambda tree, keys: keys
+    app.run_worker = lambda work, group: workers.append((work, group))
+    app._flush_live_updates()
+    assert tree.added == []
+    assert workers == [(["d"], "live")]
@@ -0,0 +1,45 @@
+"""
+Tests for bulk deletion and expiry by pattern.
+"""
+
+import pytest
+from redis_tui.data.bulk import BulkOperation
+
+@pytest.mark.asyncio
+async def test_unlink_resumes_after_being_stopped(redis_client):
+    """Test that a stopped deletion continues from its cursor to the end."""
+    await redis_client.client.mset({f"tmp:{i}": i for i in range(500)})
+    await redis_client.client.mset({f"keep:{i}": i for i in range(50)})
+    bulk = BulkOperation(redis_client, "unlink", match="tmp:*", count=50)
+    async for _ in bulk.run():
+        break
+    assert not bulk.finished
+    assert 0 < bulk.applied < 500
+    assert await redis_client.client.dbsize() == 550 - bulk.applied
+
+    async for _ in bulk.run():
+        pass
+    assert bulk.finished
+    assert bulk.applied == bulk.matched == 500
+    assert await redis_client.client.keys("tmp:*") == []
+    assert await redis_client.client.dbsize() == 50
+
+@pytest.mark.asyncio
+async def test_expire_honours_type_and_literal_prefix(redis_client):
+    """Test that only keys of the type below the prefix get the TTL."""
+    await redis_client.client.set("a:*:1", "x")
+    await redis_client.client.hset("a:*:2", "f", "v")
+    await redis_client.client.set("a:b:1", "x")
+    bulk = BulkOperation(redis_client, "expire", key_type="string", under="a:*:", ttl=300)
+    async for _ in bulk.run():
+        pass
+    assert bulk.applied == 1
+    assert 0 < await redis_client.client.ttl("a:*:1") <= 300
+    assert await redis_client.client.ttl("a:*:2") == -1
+    assert await redis_client.client.ttl("a:b:1") == -1
+
+@pytest.mark.asyncio
+async def test_expire_needs_a_ttl(redis_client):
+    """Test that an expiry without a positive TTL is rejected."""
+    with pytest.raises(ValueError):
+        BulkOperation(redis_client, "expire", ttl=0)
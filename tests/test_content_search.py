@@ -0,0 +1,60 @@
+"""
+Tests for the streaming value-content search.
+"""
+
+import pytest
+from redis_tui.data.content_search import ContentSearch
+
+@pytest.mark.asyncio
+async def test_search_finds_text_in_every_type(redis_client):
+    """Test that hits are found in strings, hashes, lists, sets and sorted sets."""
+    await redis_client.client.set("order:str", "x" * 300 + "Order 83412 shipped")
+    await redis_client.client.hset("order:hash", mapping={"id": "1", "note": "order 83412"})
+    await redis_client.client.rpush("order:list", *[f"item {i}" for i in range(250)], "order 83412")
+    await redis_client.client.sadd("order:set", "order 83412")
+    await redis_client.client.zadd("order:zset", {"order 83412": 1})
+    await redis_client.client.set("order:miss", "order 8341")
+    await redis_client.client.set("other:str", "order 83412")
+
+    search = ContentSearch(redis_client, "order 83412", match="order:*", budget=100)
+    hits = {hit.key: hit for hits in [batch async for batch in search.run()] for hit in hits}
+    assert set(hits) == {"order:str", "order:hash", "order:list", "order:set", "order:zset"}
+    assert "Order 83412" in hits["order:str"].excerpt
+    assert hits["order:hash"].excerpt.startswith("note = ")
+    assert hits["order:list"].excerpt.startswith("[250] ")
+    assert search.checked == search.scanned == 6
+
+@pytest.mark.asyncio
+async def test_search_stops_at_max_hits(redis_client):
+    """Test that the walk ends once enough hits have been found."""
+    await redis_client.client.mset({f"k:{i}": "needle" for i in range(5000)})
+    search = ContentSearch(redis_client, "needle", max_hits=5, concurrency=1)
+    async for _ in search.run():
+        pass
+    assert 5 <= search.hits < 5000
+
+@pytest.mark.asyncio
+async def test_keys_returned_twice_by_scan_are_reported_once(redis_client, monkeypatch):
+    """Test that a hit on a key SCAN repeats is not reported again."""
+    await redis_client.client.set("dup:1", "needle")
+    await redis_client.client.set("dup:2", "other")
+
+    async def scan_keys(match="*", count=None, key_type=None):
+        yield ["dup:1", "dup:2"]
+        yield ["dup:2", "dup:1"]
+    monkeypatch.setattr(redis_client, "scan_keys", scan_keys)
+
+    search = ContentSearch(redis_client, "needle")
+    hits = [hit.key for batch in [hits async for hits in search.run()] for hit in batch]
+    assert hits == ["dup:1"]
+    assert search.hits == 1
+
+@pytest.mark.asyncio
+async def test_ignoring_case_folds_ascii_letters_only(redis_client):
+    """Test that a non-ASCII needle matches the same letters, as the server folds A-Z only."""
+    await redis_client.client.set("note:1", "Kein Ärger hier")
+    await redis_client.client.set("note:2", "kein ärger hier")
+
+    search = ContentSearch(redis_client, "KEIN Ärger", match="note:*")
+    hits = [hit.key for batch in [hits async for hits in search.run()] for hit in batch]
+    assert hits == ["note:1"]
@@ -4,7 +4,11 @@ Tests for the data display component.
 
 import pytest
 from textual.app import App, ComposeResult
+from redis_tui.components import collection_view
+from redis_tui.components.collection_view import CollectionView
 from redis_tui.components.data_display import DataDisplay
+from redis_tui.components.hex_view import HexView
+from redis_tui.data.redis_client import KeyValue, ValuePage
 
 class DisplayTestApp(App):
     """Test application for DataDisplay widget."""
@@ -118,4 +122,119 @@ async def test_toggle_view():
         # Toggle back to formatted view
         display.toggle_view()
         assert not display.show_raw
-        assert "name: John Doe" in display.render() 
\ No newline at end of file
+        assert "name: John Doe" in display.render() 
+
+@pytest.mark.asyncio
+async def test_collection_rows_load_on_scroll():
+    """Test that collection rows are fetched page by page while scrolling."""
+    items = [(f"field{i}", f"value{i}") for i in range(1000)]
+    requested = []
+    
+    async def fetch_page(cursor):
+        requested.append(cursor)
+        next_cursor = cursor + 100 if cursor + 100 < len(items) else 0
+        return ValuePage("hash", items[cursor:cursor + 100], next_cursor)
+    
+    async with DisplayTestApp().run_test() as pilot:
+        display = pilot.app.query_one(DataDisplay)
+        value = KeyValue("big:hash", "hash", items[:100], size=1000, ttl=-1, cursor=100)
+        display.update_content(value, fetch_page)
+        await pilot.pause()
+        rows = pilot.app.query_one(CollectionView)
+        assert rows.display
+        assert rows.virtual_size.height == 1000
+        assert rows.row_count < 1000
+        
+        rows.scroll_to(0, 900, animate=False)
+        for _ in range(20):
+            await pilot.pause()
+        assert rows.row_count == 1000
+        assert requested == list(range(100, 1000, 100))
+
+@pytest.mark.asyncio
+async def test_long_list_jumps_to_the_scrolled_rows():
+    """Test that a far scroll in a list fetches the rows there instead of every page before."""
+    total = 1_000_000
+    requested = []
+    
+    async def fetch_page(cursor):
+        requested.append(cursor)
+        next_cursor = cursor + 100 if cursor + 100 < total else 0
+        return ValuePage("list", [f"item{i}" for i in range(cursor, min(cursor + 100, total))], next_cursor)
+    
+    async with DisplayTestApp().run_test() as pilot:
+        display = pilot.app.query_one(DataDisplay)
+        value = KeyValue("big:list", "list", [f"item{i}" for i in range(100)], size=total, ttl=-1, cursor=100)
+        display.update_content(value, fetch_page)
+        await pilot.pause()
+        rows = pilot.app.query_one(CollectionView)
+        
+        rows.scroll_to(0, total, animate=False)
+        for _ in range(20):
+            await pilot.pause()
+        assert len(requested) <= 3
+        assert rows.row_count <= collection_view.MAX_LOADED_ROWS
+        last = "".join(segment.text for segment in rows.render_line(rows.size.height - 1))
+        assert "item999999" in last
+
+@pytest.mark.asyncio
+async def test_hash_rows_stay_bounded_and_reload_from_checkpoints(monkeypatch):
+    """Test that a hash walk drops rows it scrolled past and refetches them from a saved cursor."""
+    monkeypatch.setattr(collection_view, "MAX_LOADED_ROWS", 300)
+    items = [(f"field{i}", f"value{i}") for i in range(1000)]
+    requested = []
+    
+    async def fetch_page(cursor):
+        requested.append(cursor)
+        next_cursor = cursor + 100 if cursor + 100 < len(items) else 0
+        return ValuePage("hash", items[cursor:cursor + 100], next_cursor)
+    
+    async with DisplayTestApp().run_test() as pilot:
+        display = pilot.app.query_one(DataDisplay)
+        value = KeyValue("big:hash", "hash", items[:100], size=1000, ttl=-1, cursor=100)
+        display.update_content(value, fetch_page)
+        await pilot.pause()
+        rows = pilot.app.query_one(CollectionView)
+        
+        rows.scroll_to(0, 900, animate=False)
+        for _ in range(20):
+            await pilot.pause()
+        assert requested == list(range(100, 1000, 100))
+        assert rows.row_count <= 300
+        assert rows.first_row + rows.row_count == 1000
+        
+        requested.clear()
+        rows.scroll_to(0, 150, animate=False)
+        for _ in range(20):
+            await pilot.pause()
+        assert requested[0] == 100
+        assert rows.first_row == 100
+        line = "".join(segment.text for segment in rows.render_line(0))
+        assert "value150" in line
+
+@pytest.mark.asyncio
+async def test_binary_string_shows_hex_rows():
+    """Test that byte values are shown in the hex view and loaded lazily."""
+    data = bytes(range(256)) * 64
+    requested = []
+    
+    async def fetch_page(cursor):
+        requested.append(cursor)
+        next_cursor = cursor + 4096 if cursor + 4096 < len(data) else 0
+        return ValuePage("string", [data[cursor:cursor + 4096]], next_cursor)
+    
+    async with DisplayTestApp().run_test() as pilot:
+        display = pilot.app.query_one(DataDisplay)
+        value = KeyValue("blob", "string", data[:4096], size=len(data), ttl=-1, cursor=4096)
+        display.update_content(value, fetch_page)
+        await pilot.pause()
+        hex_view = pilot.app.query_one(HexView)
+        assert hex_view.display
+        assert hex_view.virtual_size.height == len(data) // 16
+        line = "".join(segment.text for segment in hex_view.render_line(1))
+        assert line.startswith("00000010  10 11 12")
+        
+        hex_view.scroll_to(0, len(data) // 16 - 1, animate=False)
+        for _ in range(20):
+            await pilot.pause()
+        assert hex_view.loaded == len(data)
@@ -0,0 +1,77 @@
+"""
+Tests for value decoders.
+"""
+
+import asyncio
+import gzip
+import json
+import pickle
+import time
+import pytest
+from redis_tui.data.decoders import Decoder, DecoderPool, decode_value, register_decoder, sniff
+
+# Leading bytes of values the stalling test decoder claims
+STALL_MAGIC = b"STALL!"
+
+def _stall(data, limit):
+    """Decode nothing for a long time, like a runaway payload."""
+    time.sleep(60)
+    return data
+
+# Registered here and, through plugins=[__name__], in the pool's workers
+register_decoder(Decoder("test-stall", lambda head: head.startswith(STALL_MAGIC), _stall))
+
+class Exploding:
+    """Object whose unpickling would raise."""
+
+    def __reduce__(self):
+        return (exec, ("raise RuntimeError('unpickled')",))
+
+def test_gzip_json_is_peeled_and_pretty_printed():
+    """Test that nested encodings are removed and JSON is formatted."""
+    data = gzip.compress(json.dumps({"user": {"id": 7}}).encode())
+    decoded = decode_value(data)
+    assert decoded.encodings == ["gzip"]
+    assert decoded.is_json
+    assert decoded.value == json.dumps({"user": {"id": 7}}, indent=2)
+
+def test_gzip_output_is_capped():
+    """Test that decompression stops at the output limit."""
+    decoded = decode_value(gzip.compress(b"x" * 10000), max_output=100)
+    assert decoded.truncated
+    assert decoded.value == "x" * 100
+
+def test_pickle_is_disassembled_not_loaded():
+    """Test that pickles are listed as opcodes without being executed."""
+    decoded = decode_value(pickle.dumps(Exploding(), protocol=4))
+    assert decoded.encodings == ["pickle"]
+    assert "exec" in decoded.value
+    assert "STOP" in decoded.value
+
+def test_unknown_binary_stays_bytes():
+    """Test that data no decoder recognizes is returned unchanged."""
+    data = b"\x00\x01\xfe\xff"
+    assert sniff(data) is None
+    decoded = decode_value(data)
+    assert decoded.value == data
+    assert decoded.encodings == []
+
+@pytest.mark.asyncio
+async def test_cancelled_decode_terminates_its_worker():
+    """Test that a superseded decode stops its worker and the pool keeps working."""
+    pool = DecoderPool(plugins=[__name__])
+    try:
+        assert (await pool.decode(b"\xfe\xffwarm")).value == b"\xfe\xffwarm"
+        workers = list(pool._pool._pool)
+        task = asyncio.create_task(pool.decode(STALL_MAGIC))
+        await asyncio.sleep(0.5)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        for worker in workers:
+            worker.join(5)
+            assert not worker.is_alive()
+        decoded = await asyncio.wait_for(pool.decode(b"\xfe\xffnext"), 30)
+        assert decoded.value == b"\xfe\xffnext"
+    finally:
+        pool.close()
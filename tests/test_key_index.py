@@ -0,0 +1,73 @@
+"""
+Tests for the key prefix index.
+"""
+
+from redis_tui.data.key_index import KeyIndex
+
+def test_add_counts_every_level():
+    """Test that adding keys updates counts along the prefix path."""
+    index = KeyIndex()
+    index.add("user:1000:profile")
+    index.add("user:1000:settings")
+    index.add("user:1001")
+    assert len(index) == 3
+    assert index.node(["user"]).count == 3
+    assert index.node(["user", "1000"]).count == 2
+    assert index.add("user:1001") is None
+    assert len(index) == 3
+
+def test_key_and_prefix_share_a_node():
+    """Test a key that is also the prefix of other keys."""
+    index = KeyIndex()
+    index.add("got:houses:stark")
+    index.add("got:houses:stark:members")
+    node = index.node(["got", "houses", "stark"])
+    assert node.key == "got:houses:stark"
+    assert "members" in node.children
+    assert node.count == 2
+
+def test_remove_prunes_empty_nodes():
+    """Test that removing keys prunes prefixes left without keys."""
+    index = KeyIndex()
+    index.add("a:b:c")
+    index.add("a:d")
+    node = index.remove("a:b:c")
+    assert node is not None and node.count == 0
+    assert index.node(["a", "b"]) is None
+    assert index.node(["a"]).count == 1
+    assert index.remove("a:b:c") is None
+    assert "a:d" in index
+
+def test_keys_and_prefix():
+    """Test iterating keys below a prefix."""
+    index = KeyIndex()
+    index.add_many(["x:1", "x:2", "y", "x:sub:3"])
+    x = index.node(["x"])
+    assert index.prefix(index.node(["x", "sub"])) == "x:sub"
+    assert sorted(index.keys(x)) == ["x:1", "x:2", "x:sub:3"]
+    assert sorted(index.keys()) == ["x:1", "x:2", "x:sub:3", "y"]
+
+def test_sweep_finds_keys_not_seen_again():
+    """Test mark-and-sweep diffing between two scans."""
+    index = KeyIndex()
+    index.add_many(["a:1", "a:2", "b"])
+    index.begin_sweep()
+    added = index.add_many(["a:1", "b", "c"])
+    assert [node.key for node in added] == ["c"]
+    assert index.stale_keys() == ["a:2"]
+
+def test_summary_counts_settle_as_contents_load():
+    """Test that summarized counts are replaced by loaded contents."""
+    index = KeyIndex()
+    users = index.add_summary("user", 3)
+    assert len(index) == 3
+    assert users.is_folder and not users.children
+    
+    index.add_many(["user:1", "user:2"])
+    index.settle(users, 2)
+    assert len(index) == 3
+    assert users.pending == 1
+    
+    index.settle(users)
+    assert len(index) == 2
+    assert users.pending == 0
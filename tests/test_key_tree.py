@@ -2,8 +2,10 @@
 Tests for the key tree component.
 """
 
+import asyncio
 import pytest
 from textual.app import App, ComposeResult
+from redis_tui.components import key_tree
 from redis_tui.components.key_tree import KeyTree
 
 class TreeTestApp(App):
@@ -105,4 +107,114 @@ async def test_key_selection():
         
         # Simulate selection
         tree.post_message(tree.NodeSelected(tree, leaf_node))
-        assert message_received 
\ No newline at end of file
+        assert message_received
+
+
+@pytest.mark.asyncio
+async def test_children_built_on_expand():
+    """Test that child nodes are only created when a folder is expanded."""
+    async with TreeTestApp().run_test() as pilot:
+        tree = pilot.app.query_one(KeyTree)
+        tree.add_keys(["category:electronics:laptops", "category:books:fiction"])
+        category_node = tree.root.children[0]
+        assert str(category_node.label) == "category"
+        assert not category_node.children
+        
+        category_node.expand()
+        await pilot.pause()
+        assert [str(node.label) for node in category_node.children] == ["books", "electronics"]
+
+@pytest.mark.asyncio
+async def test_large_fanout_is_paged():
+    """Test that large fan-outs only build one page of children."""
+    async with TreeTestApp().run_test() as pilot:
+        tree = pilot.app.query_one(KeyTree)
+        tree.page_size = 10
+        tree.add_keys(f"item:{i:03}" for i in range(25))
+        item_node = tree.root.children[0]
+        item_node.expand()
+        await pilot.pause()
+        assert len(item_node.children) == 11  # One page plus the "show next" node
+        
+        tree.post_message(tree.NodeSelected(item_node.children[-1]))
+        await pilot.pause()
+        assert len(item_node.children) == 21
+
+@pytest.mark.asyncio
+async def test_paged_folder_keeps_order_across_remove_and_insert():
+    """Test that a removal refills the page so later keys stay behind "show next"."""
+    async with TreeTestApp().run_test() as pilot:
+        tree = pilot.app.query_one(KeyTree)
+        tree.page_size = 5
+        tree.add_keys(f"i:{name}" for name in "abcdefgh")
+        folder = tree.root.children[0]
+        folder.expand()
+        await pilot.pause()
+        
+        tree.remove_keys(["i:b"])
+        tree.add_keys(["i:z"])
+        await pilot.pause()
+        assert [node.data.name for node in folder.children[:-1]] == list("acdef")
+        
+        tree.post_message(tree.NodeSelected(folder.children[-1]))
+        await pilot.pause()
+        assert [node.data.name for node in folder.children] == list("acdefghz")
+
+@pytest.mark.asyncio
+async def test_leaf_carries_full_key():
+    """Test that selecting a leaf reports its exact key, at any depth."""
+    selected = []
+    
+    class SelectionApp(TreeTestApp):
+        def on_key_tree_key_selected(self, message: KeyTree.KeySelected) -> None:
+            selected.append(message.key)
+    
+    async with SelectionApp().run_test() as pilot:
+        tree = pilot.app.query_one(KeyTree)
+        tree.add_keys(["standalone", "a:b:c:d"])
+        tree.post_message(tree.NodeSelected(tree.root.children[1]))
+        await pilot.pause()
+        
+        node = tree.root.children[0]
+        for _ in range(3):
+            node.expand()
+            await pilot.pause()
+            node = node.children[0]
+        tree.post_message(tree.NodeSelected(node))
+        await pilot.pause()
+        assert selected == ["standalone", "a:b:c:d"]
+
+@pytest.mark.asyncio
+async def test_sort_by_key_count_keeps_expansion():
+    """Test that re-sorting reorders children and keeps folders expanded."""
+    async with TreeTestApp().run_test() as pilot:
+        tree = pilot.app.query_one(KeyTree)
+        tree.add_keys(["a:1", "b:1", "b:2", "b:3:x", "b:3:y"])
+        b_node = tree.root.children[1]
+        b_node.expand()
+        await pilot.pause()
+        
+        tree.set_sort("keys")
+        await pilot.pause()
+        assert [str(node.label) for node in tree.root.children] == ["b", "a"]
+        b_node = tree.root.children[0]
+        assert b_node.is_expanded
+        assert [str(node.label) for node in b_node.children] == ["3", "1", "2"]
+
+@pytest.mark.asyncio
+async def test_search_index_builds_between_event_loop_turns(monkeypatch):
+    """Test that known keys are indexed for search a batch at a time."""
+    monkeypatch.setattr(key_tree, "SEARCH_BATCH_SIZE", 10)
+    async with TreeTestApp().run_test() as pilot:
+        tree = pilot.app.query_one(KeyTree)
+        tree.add_keys(f"user:{i}:name" for i in range(200))
+        index = tree.enable_search()
+        sizes = set()
+        for _ in range(1000):
+            sizes.add(len(index))
+            if len(index) == 200:
+                break
+            await asyncio.sleep(0)
+        assert len(index) == 200
+        assert any(0 < size < 200 for size in sizes)
+        assert index.search("user:17:")[0] == "user:17:name"
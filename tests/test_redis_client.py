@@ -2,17 +2,15 @@
 Tests for Redis client operations.
 """
 
+import asyncio
+from collections import Counter
+from types import SimpleNamespace
 import pytest
-from redis_tui.data.redis_client import RedisClient
+from redis.exceptions import ResponseError
+from redis_tui.data import redis_client as redis_client_module
+from redis_tui.data.redis_client import SHARD_CURSOR_SPAN, RedisClient
 from redis_tui.data.sample_data import SAMPLE_DATA, load_sample_data
-
-@pytest.fixture
-async def redis_client():
-    """Create a Redis client for testing."""
-    client = RedisClient(db=15)  # Use separate DB for testing
-    yield client
-    await client.client.flushdb()  # Clean up after tests
-    await client.close()
+from redis_tui.data.value_cache import ValueCache
 
 @pytest.mark.asyncio
 async def test_load_sample_data(redis_client):
@@ -78,4 +76,423 @@ async def test_set_ttl(redis_client):
     await load_sample_data(redis_client)
     assert await redis_client.set_ttl("user:1000", 3600)
     ttl = await redis_client.get_ttl("user:1000")
-    assert 0 < ttl <= 3600 
\ No newline at end of file
+    assert 0 < ttl <= 3600
+
+
+@pytest.mark.asyncio
+async def test_scan_keys_batches(redis_client):
+    """Test incremental key discovery with SCAN."""
+    await load_sample_data(redis_client)
+    batches = [batch async for batch in redis_client.scan_keys(count=2)]
+    assert all(batches)
+    keys = {key for batch in batches for key in batch}
+    assert keys == set(SAMPLE_DATA)
+
+@pytest.mark.asyncio
+async def test_get_page_list_windows(redis_client):
+    """Test paging through a list in LRANGE windows."""
+    await redis_client.client.rpush("paged:list", *[f"item{i}" for i in range(25)])
+    page = await redis_client.get_page("paged:list", "list", count=10)
+    assert page.total == 25
+    assert page.items == [f"item{i}" for i in range(10)]
+    
+    items = list(page.items)
+    while not page.done:
+        page = await redis_client.get_page("paged:list", "list", page.cursor, count=10)
+        assert page.total is None
+        items.extend(page.items)
+    assert items == [f"item{i}" for i in range(25)]
+
+@pytest.mark.asyncio
+async def test_get_page_hash_cursor(redis_client):
+    """Test paging through a hash with HSCAN."""
+    fields = {f"field{i}": str(i) for i in range(300)}
+    await redis_client.client.hset("paged:hash", mapping=fields)
+    page = await redis_client.get_page("paged:hash", "hash", count=50)
+    assert page.total == 300
+    
+    items = list(page.items)
+    while not page.done:
+        page = await redis_client.get_page("paged:hash", "hash", page.cursor, count=50)
+        items.extend(page.items)
+    assert dict(items) == fields
+
+@pytest.mark.asyncio
+async def test_get_key_returns_typed_value(redis_client):
+    """Test that get_key returns raw data with type, size and TTL."""
+    await redis_client.client.set("typed:string", '{"a": 1}', ex=600)
+    value = await redis_client.get_key("typed:string")
+    assert value.key_type == "string"
+    assert value.value == '{"a": 1}'
+    assert value.size == 8
+    assert 0 < value.ttl <= 600
+    
+    await redis_client.client.rpush("typed:list", "x", "y", "z")
+    value = await redis_client.get_key("typed:list", key_type="list")
+    assert value.value == ["x", "y", "z"]
+    assert value.size == 3
+    assert value.ttl == -1
+    assert value.cursor == 0
+    
+    assert await redis_client.get_key("typed:missing") is None
+
+@pytest.mark.asyncio
+async def test_get_metadata_batch(redis_client):
+    """Test pipelined metadata for a batch of keys."""
+    await redis_client.client.set("meta:string", "value", ex=600)
+    await redis_client.client.rpush("meta:list", "a", "b")
+    metadata = await redis_client.get_metadata(["meta:string", "meta:list", "meta:missing"])
+    assert set(metadata) == {"meta:string", "meta:list"}
+    assert metadata["meta:string"].key_type == "string"
+    assert 0 < metadata["meta:string"].ttl <= 600
+    assert metadata["meta:list"].key_type == "list"
+    assert metadata["meta:list"].ttl == -1
+
+@pytest.mark.asyncio
+async def test_get_key_served_from_cache(redis_client):
+    """Test that revisiting a key is served from the cache until invalidated."""
+    redis_client.cache = ValueCache(max_entries=10)
+    await redis_client.client.set("cached:key", "first")
+    assert (await redis_client.get_key("cached:key")).value == "first"
+    
+    await redis_client.client.set("cached:key", "second")
+    assert (await redis_client.get_key("cached:key")).value == "first"
+    
+    redis_client.cache.invalidate("cached:key")
+    assert (await redis_client.get_key("cached:key")).value == "second"
+
+@pytest.mark.asyncio
+async def test_invalidation_during_fetch_keeps_result_out_of_cache(redis_client, monkeypatch):
+    """Test that a value read before a notified write is not cached."""
+    redis_client.cache = ValueCache(max_entries=10)
+    await redis_client.client.set("racing:key", "first")
+    await redis_client.client.hset("racing:hash", "f", "v")
+    fetch_key = redis_client._fetch_key
+    
+    async def fetch_then_notify(key, key_type):
+        value = await fetch_key(key, key_type)
+        redis_client.cache.invalidate(key)
+        return value
+    monkeypatch.setattr(redis_client, "_fetch_key", fetch_then_notify)
+    assert (await redis_client.get_key("racing:key")).value == "first"
+    monkeypatch.undo()
+    
+    await redis_client.client.set("racing:key", "second")
+    assert (await redis_client.get_key("racing:key")).value == "second"
+    
+    reader = redis_client.reader
+    
+    class NotifyingPipeline:
+        def __init__(self, pipe):
+            self.pipe = pipe
+        async def __aenter__(self):
+            await self.pipe.__aenter__()
+            return self
+        async def __aexit__(self, *args):
+            return await self.pipe.__aexit__(*args)
+        def __getattr__(self, name):
+            return getattr(self.pipe, name)
+        async def execute(self, **kwargs):
+            results = await self.pipe.execute(**kwargs)
+            redis_client.cache.invalidate("racing:hash")
+            return results
+    monkeypatch.setattr(
+        redis_client, "reader",
+        SimpleNamespace(pipeline=lambda **kwargs: NotifyingPipeline(reader.pipeline(**kwargs)))
+    )
+    assert (await redis_client.get_metadata(["racing:hash"]))["racing:hash"].key_type == "hash"
+    assert redis_client.cache.get("racing:hash", "metadata") is None
+
+@pytest.mark.asyncio
+async def test_cache_keeps_ttl_when_reading_from_replica(monkeypatch):
+    """Test that notifications only make cached entries permanent when reads hit the primary."""
+    async def enabled(self):
+        return True
+    monkeypatch.setattr(RedisClient, "keyspace_notifications_enabled", enabled)
+    
+    primary = RedisClient(db=15, cache_entries=10, cache_ttl=2.0)
+    replica = RedisClient(db=15, cache_entries=10, cache_ttl=2.0, replica=("localhost", 6380))
+    try:
+        await primary.start_cache_invalidation()
+        await replica.start_cache_invalidation()
+        assert primary.cache.ttl is None
+        assert replica.cache.ttl == 2.0
+    finally:
+        await primary.close()
+        await replica.close()
+
+def pool_address(client):
+    """Host and port a client's connections go to."""
+    kwargs = client.connection_pool.connection_kwargs
+    return kwargs["host"], kwargs["port"]
+
+@pytest.mark.asyncio
+async def test_replica_serves_reads_and_walks():
+    """Test that a replica gets interactive reads and background walks, and the primary writes."""
+    client = RedisClient(host="primary", port=6379, replica=("replica", 6380))
+    try:
+        assert pool_address(client.client) == ("primary", 6379)
+        assert pool_address(client.reader) == ("replica", 6380)
+        assert pool_address(client.background) == ("replica", 6380)
+        assert client.reader is not client.background
+    finally:
+        await client.close()
+    
+    client = RedisClient(host="primary", port=6379)
+    try:
+        assert client.reader is client.client
+        assert pool_address(client.background) == ("primary", 6379)
+        assert client.background is not client.client
+    finally:
+        await client.close()
+
+class FakeSentinel:
+    """Sentinel stand-in recording which role each client was asked for."""
+    
+    def __init__(self, sentinels, sentinel_kwargs=None):
+        self.sentinels = sentinels
+        
+    def master_for(self, service_name, **kwargs):
+        return FakeServerClient("master", service_name, kwargs)
+        
+    def slave_for(self, service_name, **kwargs):
+        return FakeServerClient("replica", service_name, kwargs)
+
+class FakeServerClient:
+    """Client handed out by FakeSentinel."""
+    
+    def __init__(self, role, service_name, kwargs):
+        self.role = role
+        self.service_name = service_name
+        self.max_connections = kwargs["max_connections"]
+        
+    async def close(self):
+        pass
+
+@pytest.mark.asyncio
+async def test_sentinel_routes_reads_to_replicas_when_asked(monkeypatch):
+    """Test that Sentinel replicas serve reads and walks only with read_from_replicas."""
+    monkeypatch.setattr(redis_client_module, "Sentinel", FakeSentinel)
+    sentinels = [("sentinel", 26379)]
+    
+    client = RedisClient(sentinels=sentinels, service_name="cache", read_from_replicas=True)
+    assert (client.client.role, client.reader.role, client.background.role) == ("master", "replica", "replica")
+    assert client.client.service_name == "cache"
+    assert client.background.max_connections == client.background_connections
+    assert client.replica_reads
+    await client.close()
+    
+    client = RedisClient(sentinels=sentinels, service_name="cache")
+    assert client.reader is client.client
+    assert client.background.role == "master"
+    assert client.background is not client.client
+    assert not client.replica_reads
+    await client.close()
+
+@pytest.mark.asyncio
+async def test_count_namespaces_resumes_cursor(redis_client):
+    """Test that namespace counts are summed across resumed slices."""
+    for i in range(30):
+        await redis_client.client.set(f"user:{i % 3}:{i}", "x")
+    await redis_client.client.set("standalone", "x")
+    
+    prefixes = {}
+    keys = []
+    cursor = 0
+    while True:
+        counts = await redis_client.count_namespaces(cursor=cursor, count=5)
+        for prefix, count in counts.prefixes.items():
+            prefixes[prefix] = prefixes.get(prefix, 0) + count
+        keys.extend(counts.keys)
+        cursor = counts.cursor
+        if counts.done:
+            break
+    assert prefixes == {"user": 30}
+    assert keys == ["standalone"]
+    
+    counts = await redis_client.count_namespaces(depth=2, match="user:1:*", count=100)
+    assert counts.done
+    assert counts.prefixes == {"user:1": 10}
+
+@pytest.mark.asyncio
+async def test_count_namespaces_bounds_sparse_match(redis_client):
+    """Test that a MATCH hitting few keys still walks one bounded slice per call."""
+    await redis_client.client.mset({f"bulk:{i}": "x" for i in range(5000)})
+    await redis_client.client.set("rare:1:a", "x")
+    
+    slices = 0
+    prefixes = {}
+    cursor = 0
+    while True:
+        counts = await redis_client.count_namespaces(depth=2, match="rare:*", cursor=cursor, count=100)
+        slices += 1
+        prefixes.update(counts.prefixes)
+        cursor = counts.cursor
+        if counts.done:
+            break
+    assert slices > 10
+    assert prefixes == {"rare:1": 1}
+
+@pytest.mark.asyncio
+async def test_interactive_reads_bypass_busy_background_lane(redis_client):
+    """Test that value reads do not wait behind background commands."""
+    await redis_client.client.set("clicked", "value")
+    slot = redis_client._background_slot()
+    for _ in range(redis_client.background_connections):
+        await slot.acquire()
+    value = await asyncio.wait_for(redis_client.get_key("clicked"), timeout=1)
+    assert value.value == "value"
+    
+    scan = asyncio.ensure_future(redis_client.get_keys())
+    await asyncio.sleep(0.05)
+    assert not scan.done()
+    slot.release()
+    assert await asyncio.wait_for(scan, timeout=1) == ["clicked"]
+
+@pytest.mark.asyncio
+async def test_large_string_is_read_in_chunks(redis_client):
+    """Test that long strings load a preview first and resume by byte offset."""
+    redis_client.preview_bytes = 10
+    text = "ab€" * 7  # Multi-byte characters straddle the chunk boundaries
+    await redis_client.client.set("blob", text)
+    value = await redis_client.get_key("blob")
+    assert value.size == len(text.encode())
+    assert value.cursor
+    assert text.startswith(value.value)
+    
+    loaded = value.value
+    cursor = value.cursor
+    while cursor:
+        page = await redis_client.get_page("blob", "string", cursor)
+        loaded += page.items[0]
+        cursor = page.cursor
+    assert loaded == text
+
+@pytest.mark.asyncio
+async def test_string_ending_on_a_chunk_boundary_is_complete(redis_client):
+    """Test that a length that is a multiple of the chunk size ends the walk."""
+    redis_client.preview_bytes = 8
+    await redis_client.client.set("exact", "x" * 8)
+    await redis_client.client.set("double", "y" * 16)
+    value = await redis_client.get_key("exact")
+    assert value.value == "x" * 8
+    assert value.cursor == 0
+    
+    value = await redis_client.get_key("double")
+    assert value.cursor == 8
+    page = await redis_client.get_page("double", "string", value.cursor)
+    assert page.items == ["y" * 8]
+    assert page.cursor == 0
+
+@pytest.mark.asyncio
+async def test_binary_mode_keeps_string_bytes(redis_client):
+    """Test that binary mode returns string values undecoded."""
+    redis_client.binary = True
+    await redis_client.client.set("packed", b"\x93\xff\x00abc")
+    value = await redis_client.get_key("packed")
+    assert value.value == b"\x93\xff\x00abc"
+    assert value.size == 6
+
+@pytest.mark.asyncio
+async def test_scan_filters_by_type_with_and_without_scan_type(redis_client):
+    """Test that type filtering works with SCAN TYPE and the TYPE fallback."""
+    await redis_client.client.hset("user:1", "name", "Ada")
+    await redis_client.client.hset("user:2", "name", "Alan")
+    await redis_client.client.set("user:3", "Grace")
+    await redis_client.client.rpush("queue:1", "job")
+    assert sorted(await redis_client.get_keys(key_type="hash")) == ["user:1", "user:2"]
+    
+    redis_client._scan_type = False
+    assert sorted(await redis_client.get_keys(key_type="hash")) == ["user:1", "user:2"]
+    assert await redis_client.get_keys("user:*", key_type="list") == []
+
+class FakeCluster:
+    """Cluster stand-in whose shards answer SCAN and EVAL from fixed pages."""
+    
+    def __init__(self, shards, failing=None):
+        # Shard name -> (cursor, keys) pages in walk order
+        self.shards = shards
+        self.nodes = [SimpleNamespace(name=name) for name in sorted(shards)]
+        self.failing = failing
+        # (shard name, shard cursor) of every call
+        self.calls = []
+        
+    async def initialize(self):
+        pass
+        
+    def get_primaries(self):
+        return list(self.nodes)
+        
+    def _page(self, cursor, node):
+        self.calls.append((node.name, cursor))
+        if node.name == self.failing:
+            raise ResponseError("shard unavailable")
+        pages = self.shards[node.name]
+        index = [start for start, _ in pages].index(cursor)
+        next_cursor = pages[index + 1][0] if index + 1 < len(pages) else 0
+        return next_cursor, pages[index][1]
+        
+    async def scan(self, cursor, match, count, target_nodes):
+        next_cursor, keys = self._page(cursor, target_nodes)
+        return {target_nodes.name: next_cursor}, keys
+        
+    async def execute_command(self, *args, target_nodes):
+        next_cursor, keys = self._page(args[3], target_nodes)
+        counts = Counter(key.split(":")[0] for key in keys)
+        return next_cursor, [item for prefix, count in counts.items() for item in (prefix, count)], []
+
+# Shard cursors include the largest a server can return
+CLUSTER_SHARDS = {
+    "node-a": [(0, ["a:1"]), (2**64 - 1, ["a:2"]), (7, ["a:3"])],
+    "node-b": [(0, ["b:1"])],
+}
+
+CLUSTER_CALLS = [("node-a", 0), ("node-a", 2**64 - 1), ("node-a", 7), ("node-b", 0)]
+
+@pytest.mark.asyncio
+async def test_cluster_scan_slice_packs_shard_cursors(redis_client, monkeypatch):
+    """Test that scan_slice resumes each shard from the cursor packed with its index."""
+    cluster = FakeCluster(CLUSTER_SHARDS)
+    monkeypatch.setattr(redis_client, "cluster", True)
+    monkeypatch.setattr(redis_client, "background", cluster)
+    
+    keys = []
+    cursors = []
+    cursor = 0
+    while True:
+        cursor, batch = await redis_client.scan_slice(cursor, count=10)
+        keys.extend(batch)
+        cursors.append(divmod(cursor, SHARD_CURSOR_SPAN))
+        if cursor == 0:
+            break
+    assert keys == ["a:1", "a:2", "a:3", "b:1"]
+    assert cursors == [(0, 2**64 - 1), (0, 7), (1, 0), (0, 0)]
+    assert cluster.calls == CLUSTER_CALLS
+
+@pytest.mark.asyncio
+async def test_cluster_count_namespaces_packs_shard_cursors(redis_client, monkeypatch):
+    """Test that namespace counts walk every shard in turn through packed cursors."""
+    cluster = FakeCluster(CLUSTER_SHARDS)
+    monkeypatch.setattr(redis_client, "cluster", True)
+    monkeypatch.setattr(redis_client, "background", cluster)
+    
+    prefixes = Counter()
+    cursor = 0
+    while True:
+        counts = await redis_client.count_namespaces(cursor=cursor, count=10)
+        prefixes.update(counts.prefixes)
+        cursor = counts.cursor
+        if counts.done:
+            break
+    assert prefixes == {"a": 3, "b": 1}
+    assert cluster.calls == CLUSTER_CALLS
+
+@pytest.mark.asyncio
+async def test_cluster_scan_raises_shard_errors(redis_client, monkeypatch):
+    """Test that a failing shard ends a concurrent cluster scan with its error."""
+    cluster = FakeCluster(CLUSTER_SHARDS, failing="node-b")
+    monkeypatch.setattr(redis_client, "cluster", True)
+    monkeypatch.setattr(redis_client, "background", cluster)
+    
+    with pytest.raises(ResponseError, match="shard unavailable"):
+        await asyncio.wait_for(redis_client.get_keys(), timeout=5)
@@ -0,0 +1,30 @@
+"""
+Tests for the trigram key search index.
+"""
+
+from redis_tui.data.search_index import TrigramIndex
+
+def test_substring_matches_rank_segment_starts_first():
+    """Test that matches at a segment start beat shorter mid-word matches."""
+    index = TrigramIndex()
+    index.add_many(["user:1", "session:user:42", "superuser", "order:9"])
+    assert index.search("USER") == ["user:1", "session:user:42", "superuser"]
+
+def test_fuzzy_matches_follow_exact_ones():
+    """Test that keys sharing most trigrams are found despite a typo."""
+    index = TrigramIndex()
+    index.add_many(["session:abc", "profile:abc", "config"])
+    assert index.search("sesion:abc") == ["session:abc"]
+
+def test_removed_keys_are_not_returned_and_slots_are_reused():
+    """Test that removals apply immediately and survive compaction."""
+    index = TrigramIndex()
+    index.add_many(f"old:{i}" for i in range(2000))
+    for i in range(1500):
+        index.remove(f"old:{i}")
+    index.add("new:1")
+    assert len(index) == 501
+    results = index.search("old:1", limit=1000)
+    assert results and all(int(key.split(":")[1]) >= 1500 for key in results)
+    assert index.search("new") == ["new:1"]
+    assert len(index._keys) == 2000
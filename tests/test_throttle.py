@@ -0,0 +1,51 @@
+"""
+Tests for adaptive SCAN throttling.
+"""
+
+import asyncio
+import time
+import pytest
+from redis_tui.data.throttle import ScanThrottle
+
+def test_count_grows_while_calls_are_fast():
+    """Test that COUNT increases up to its limit when latency is low."""
+    throttle = ScanThrottle(100, target_latency=0.01, max_count=200)
+    for _ in range(10):
+        throttle.record(0.001, throttle.count)
+    assert throttle.count == 200
+
+def test_slow_call_halves_count_and_pauses():
+    """Test that a call over the latency target backs off."""
+    throttle = ScanThrottle(100, target_latency=0.01)
+    throttle.record(0.001, 100)
+    throttle.record(0.051, 100)
+    assert throttle.count == 63
+    assert throttle._next_call > time.monotonic()
+
+def test_rate_limit_spaces_calls():
+    """Test that the keys-per-second budget delays the next call."""
+    throttle = ScanThrottle(100, target_latency=None, max_rate=50)
+    throttle.record(0.0, 100)
+    assert throttle.count == 100
+    assert throttle._next_call - time.monotonic() > 1.5
+
+@pytest.mark.asyncio
+async def test_rate_limit_holds_across_concurrent_walkers():
+    """Test that walkers sharing a throttle split its rate instead of multiplying it."""
+    throttle = ScanThrottle(100, target_latency=None, max_rate=1000)
+    visited = 0
+
+    async def walk() -> None:
+        nonlocal visited
+        while True:
+            await throttle.wait(100)
+            started = time.monotonic()
+            visited += 100
+            throttle.record(time.monotonic() - started, 100)
+
+    walkers = [asyncio.create_task(walk()) for _ in range(8)]
+    await asyncio.sleep(1.0)
+    for walker in walkers:
+        walker.cancel()
+    await asyncio.gather(*walkers, return_exceptions=True)
+    assert visited <= 1200
@@ -0,0 +1,49 @@
+"""
+Tests for DUMP/RESTORE export and import files.
+"""
+
+import pytest
+from redis_tui.data.transfer import NamespaceExport, NamespaceImport
+
+@pytest.mark.asyncio
+async def test_export_and_import_round_trip(redis_client, tmp_path):
+    """Test that a compressed export restores values and TTLs, keeping existing keys."""
+    await redis_client.client.mset({f"ns:{i}": "v" * i for i in range(300)})
+    await redis_client.client.hset("ns:hash", mapping={"a": "1"})
+    await redis_client.client.expire("ns:hash", 1000)
+    await redis_client.client.set("other", "x")
+    path = str(tmp_path / "ns.rtd.gz")
+
+    export = NamespaceExport(redis_client, path, match="ns:*", count=50)
+    async for _ in export.run():
+        pass
+    assert export.keys == 301
+
+    await redis_client.client.flushdb()
+    await redis_client.client.set("ns:1", "kept")
+    restore = NamespaceImport(redis_client, path, batch_size=40, parallelism=3)
+    async for _ in restore.run():
+        pass
+    assert (restore.keys, restore.restored, restore.skipped) == (301, 300, 1)
+    assert await redis_client.client.dbsize() == 301
+    assert await redis_client.client.get("ns:1") == "kept"
+    assert await redis_client.client.get("ns:7") == "vvvvvvv"
+    assert 0 < await redis_client.client.ttl("ns:hash") <= 1000
+    assert await redis_client.client.ttl("ns:7") == -1
+
+@pytest.mark.asyncio
+async def test_import_stops_at_a_truncated_record(redis_client, tmp_path):
+    """Test that the complete records of a cut-off file are still restored."""
+    await redis_client.client.mset({f"ns:{i}": i for i in range(10)})
+    path = tmp_path / "ns.rtd"
+    export = NamespaceExport(redis_client, str(path))
+    async for _ in export.run():
+        pass
+    path.write_bytes(path.read_bytes()[:-3])
+
+    await redis_client.client.flushdb()
+    restore = NamespaceImport(redis_client, str(path))
+    async for _ in restore.run():
+        pass
+    assert restore.truncated
+    assert restore.restored == await redis_client.client.dbsize() == 9
@@ -0,0 +1,75 @@
+"""
+Tests for the value cache.
+"""
+
+import time
+from redis_tui.data.value_cache import ValueCache
+
+def test_get_and_put():
+    """Test caching several kinds of data per key."""
+    cache = ValueCache(max_entries=10)
+    cache.put("user:1", "value", "data", 10)
+    cache.put("user:1", "metadata", {"type": "string"}, 5)
+    value, age = cache.get("user:1", "value")
+    assert value == "data"
+    assert age >= 0
+    assert cache.get("user:1", "metadata")[0] == {"type": "string"}
+    assert cache.get("user:2", "value") is None
+    assert cache.nbytes == 15
+
+def test_evicts_least_recently_used_by_count():
+    """Test eviction when the entry limit is reached."""
+    cache = ValueCache(max_entries=2)
+    cache.put("a", "value", 1, 1)
+    cache.put("b", "value", 2, 1)
+    cache.get("a", "value")
+    cache.put("c", "value", 3, 1)
+    assert cache.get("b", "value") is None
+    assert cache.get("a", "value") is not None
+    assert len(cache) == 2
+
+def test_evicts_by_size():
+    """Test eviction when the byte limit is reached."""
+    cache = ValueCache(max_entries=10, max_bytes=100)
+    cache.put("a", "value", "x", 60)
+    cache.put("b", "value", "y", 60)
+    assert cache.get("a", "value") is None
+    assert cache.nbytes == 60
+    cache.put("huge", "value", "z", 1000)
+    assert cache.get("huge", "value") is None
+
+def test_invalidate_drops_all_kinds():
+    """Test that invalidating a key drops every kind cached for it."""
+    cache = ValueCache()
+    cache.put("a", "value", 1, 10)
+    cache.put("a", "metadata", 2, 10)
+    cache.invalidate("a")
+    assert cache.get("a", "value") is None
+    assert cache.get("a", "metadata") is None
+    assert cache.nbytes == 0
+
+def test_ttl_expiry():
+    """Test the TTL fallback used without keyspace notifications."""
+    cache = ValueCache(ttl=0.01)
+    cache.put("a", "value", 1, 10)
+    time.sleep(0.02)
+    assert cache.get("a", "value") is None
+    assert cache.nbytes == 0
+
+def test_put_skips_data_read_before_an_invalidation():
+    """Test that data read before an invalidation of its key is not cached."""
+    cache = ValueCache(max_entries=2)
+    epoch = cache.epoch()
+    cache.invalidate("a")
+    cache.put("a", "value", "stale", 10, epoch=epoch)
+    cache.put("b", "value", "fresh", 10, epoch=epoch)
+    assert cache.get("a", "value") is None
+    assert cache.get("b", "value")[0] == "fresh"
+    
+    cache.invalidate("b")
+    cache.invalidate("c")
+    cache.invalidate("d")
+    cache.put("a", "value", "stale", 10, epoch=epoch)
+    assert cache.get("a", "value") is None
+    cache.put("a", "value", "fresh", 10, epoch=cache.epoch())
+    assert cache.get("a", "value")[0] == "fresh"